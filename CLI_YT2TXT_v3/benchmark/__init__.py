@@ -0,0 +1,11 @@
+"""
+Benchmark Package
+
+Offline benchmark harness for the transcript pipeline. Local stand-ins
+replace YouTube, Google Translate and Ollama so the whole of
+process_transcript can be timed without network access.
+
+Run from the project directory:
+
+    python -m benchmark --sizes 200 1000 5000
+"""
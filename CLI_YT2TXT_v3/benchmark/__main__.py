@@ -0,0 +1,230 @@
+"""
+Benchmark Runner
+
+Times process_transcript end to end against the local stand-ins for a
+range of transcript sizes and reports per-stage latency and throughput.
+Also checks that the CLI starts within its time budget without importing
+the heavy service libraries.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from benchmark.stand_ins import FakeTranscriptApi, FakeTranslator, FakeOllamaServer
+from modules.pipeline import Pipeline
+
+# Libraries main.py must only import when a stage needs them
+HEAVY_MODULES = ('ollama', 'httpx', 'langdetect', 'deep_translator',
+                 'youtube_transcript_api', 'requests')
+
+class RecordingPipeline(Pipeline):
+    """Pipeline that remembers the last instance so its stage timings can be read."""
+    
+    last = None
+    
+    def run(self, targets=None):
+        RecordingPipeline.last = self
+        return super().run(targets)
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog="python -m benchmark",
+                                     description="Offline benchmark of the transcript pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 1000, 5000],
+                        help="Transcript sizes in segments (default: 200 1000 5000)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Runs per size; medians are reported (default: 3)")
+    parser.add_argument('--lang', default='de',
+                        help="Target language; anything but 'en' exercises translation (default: de)")
+    parser.add_argument('--summary', default='brief', choices=['brief', 'detailed', 'bullet'])
+    parser.add_argument('--stream', action='store_true', help="Stream the summary")
+    parser.add_argument('--outputs', nargs='+', metavar='ARTIFACT',
+                        help="Artifacts to produce, as in main.py (default: all)")
+    parser.add_argument('--caption-tracks', action='store_true',
+                        help="Use the stand-in's auto-translated caption tracks instead of "
+                             "the translator for the transcript")
+    parser.add_argument('--cache', action='store_true',
+                        help="Keep the transcript cache and translation memo on (warm runs)")
+    parser.add_argument('--translate-latency', type=float, default=0.02,
+                        help="Seconds per fake translator request (default: 0.02)")
+    parser.add_argument('--throttle-rps', type=float,
+                        help="Fake translator answers 429 above this request rate")
+    parser.add_argument('--context-length', type=int, default=4096,
+                        help="num_ctx reported by the fake Ollama (default: 4096)")
+    parser.add_argument('--tokens-per-second', type=float, default=400.0,
+                        help="Fake Ollama generation speed (default: 400)")
+    parser.add_argument('--load-time', type=float, default=0.5,
+                        help="Fake Ollama model load time on first use (default: 0.5)")
+    parser.add_argument('--startup-budget', type=float, default=0.5,
+                        help="Maximum seconds for 'main.py --help' (default: 0.5)")
+    parser.add_argument('--skip-startup', action='store_true', help="Skip the startup check")
+    parser.add_argument('--json', metavar='FILE', help="Also write the results as JSON")
+    return parser.parse_args(argv)
+
+def install_stand_ins(ollama_host):
+    """Route the pipeline's external services to the local stand-ins."""
+    import deep_translator
+    import youtube_transcript_api
+    
+    youtube_transcript_api.YouTubeTranscriptApi = FakeTranscriptApi
+    deep_translator.GoogleTranslator = FakeTranslator
+    os.environ['OLLAMA_HOST'] = ollama_host
+    os.environ['NO_PROXY'] = '127.0.0.1,localhost'
+
+def measure_startup(budget, runs=5):
+    """
+    Time 'main.py --help' and check which libraries importing main pulls in.
+    
+    Args:
+        budget (float): Maximum allowed seconds for 'main.py --help'
+        runs (int): Number of timed runs; the fastest is reported
+    
+    Returns:
+        dict: help_seconds, interpreter_seconds, heavy_imports and ok
+    """
+    def fastest(command):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(command, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=False)
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+    
+    interpreter = fastest([sys.executable, '-c', 'pass'])
+    help_seconds = fastest([sys.executable, 'main.py', '--help'])
+    probe = ("import sys, main; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', probe], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, check=False).stdout.strip()
+    heavy = [name for name in output.split(',') if name]
+    return {'help_seconds': help_seconds, 'interpreter_seconds': interpreter,
+            'heavy_imports': heavy, 'budget': budget,
+            'ok': help_seconds <= budget and not heavy}
+
+def run_size(main, size, args, model):
+    """
+    Process one synthetic video of the given size several times.
+    
+    Returns:
+        dict: Median stage timings and totals for the size
+    """
+    url = f"https://youtu.be/{FakeTranscriptApi.video_id(size)}"
+    chars = len(' '.join(s['text'] for s in FakeTranscriptApi.get_transcript(
+        FakeTranscriptApi.video_id(size))))
+    runs = []
+    
+    for _ in range(args.repeat):
+        FakeTranslator.configure(args.translate_latency, args.throttle_rps)
+        started = time.perf_counter()
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            success, _ = main.process_transcript(url, args.lang, args.summary, model,
+                                                 use_cache=args.cache, stream=args.stream,
+                                                 outputs=args.outputs,
+                                                 caption_tracks=args.caption_tracks)
+        total = time.perf_counter() - started
+        runs.append({'success': success, 'total': total,
+                     'stages': dict(RecordingPipeline.last.timings),
+                     'translator_calls': FakeTranslator.calls,
+                     'throttled': FakeTranslator.throttled})
+    
+    stages = {}
+    for run in runs:
+        for stage, seconds in run['stages'].items():
+            stages.setdefault(stage, []).append(seconds)
+    total = statistics.median(run['total'] for run in runs)
+    return {
+        'segments': size,
+        'chars': chars,
+        'failures': sum(1 for run in runs if not run['success']),
+        'total_seconds': total,
+        'chars_per_second': chars / total if total else None,
+        'stages': {stage: statistics.median(times) for stage, times in stages.items()},
+        'translator_calls': statistics.median(run['translator_calls'] for run in runs),
+        'throttled': statistics.median(run['throttled'] for run in runs)
+    }
+
+def print_report(results, startup):
+    """Print the per-stage latency table and the startup check."""
+    stages = []
+    for result in results:
+        stages.extend(stage for stage in result['stages'] if stage not in stages)
+    
+    width = max([len(stage) for stage in stages] + [22])
+    header = f"{'stage (median ms)':<{width}}" + ''.join(f"{r['segments']:>12}" for r in results)
+    print("\n" + header)
+    print("-" * len(header))
+    for stage in stages:
+        cells = ''.join(f"{r['stages'][stage] * 1000:>12.1f}" if stage in r['stages'] else f"{'-':>12}"
+                        for r in results)
+        print(f"{stage:<{width}}{cells}")
+    print("-" * len(header))
+    rows = [
+        ('total (ms)', lambda r: f"{r['total_seconds'] * 1000:.1f}"),
+        ('transcript chars', lambda r: f"{r['chars']}"),
+        ('throughput (chars/s)', lambda r: f"{r['chars_per_second']:.0f}"),
+        ('translator requests', lambda r: f"{r['translator_calls']:.0f}"),
+        ('throttled (429)', lambda r: f"{r['throttled']:.0f}"),
+        ('failed runs', lambda r: f"{r['failures']}")
+    ]
+    for label, cell in rows:
+        print(f"{label:<{width}}" + ''.join(f"{cell(r):>12}" for r in results))
+    
+    if startup:
+        status = "OK" if startup['ok'] else "OVER BUDGET"
+        print(f"\nStartup: main.py --help {startup['help_seconds'] * 1000:.0f} ms "
+              f"(interpreter {startup['interpreter_seconds'] * 1000:.0f} ms, "
+              f"budget {startup['budget'] * 1000:.0f} ms) {status}")
+        if startup['heavy_imports']:
+            print(f"         importing main loaded: {', '.join(startup['heavy_imports'])}")
+
+def main(argv=None):
+    """Run the benchmark."""
+    args = parse_args(argv)
+    startup = None if args.skip_startup else measure_startup(args.startup_budget)
+    
+    server = FakeOllamaServer(context_length=args.context_length,
+                              tokens_per_second=args.tokens_per_second,
+                              load_time=args.load_time)
+    install_stand_ins(server.start())
+    model = server.models[0]
+    
+    import main as app
+    app.Pipeline = RecordingPipeline
+    
+    workdir = tempfile.mkdtemp(prefix='yt2txt_bench_')
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    results = []
+    try:
+        for size in args.sizes:
+            print(f"⏱️  {size} segments x {args.repeat}...", flush=True)
+            results.append(run_size(app, size, args, model))
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+        server.stop()
+    
+    print_report(results, startup)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results, 'startup': startup}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    failed = any(r['failures'] for r in results) or (startup and not startup['ok'])
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
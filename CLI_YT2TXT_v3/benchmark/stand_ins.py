@@ -0,0 +1,365 @@
+"""
+Stand-ins Module
+
+Local replacements for the external services used by the pipeline:
+a YouTubeTranscriptApi serving synthetic transcripts and caption tracks
+(an automatic English track that "YouTube" can translate, plus optional
+manual tracks), a GoogleTranslator
+with configurable latency and throttling, and a small HTTP server that
+speaks enough of the Ollama API (tags, show, chat, generate) for the
+ollama client.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "the a and of to in is that it for on with as this was be by are from at "
+    "video people time data model system energy city water market power music "
+    "story world change result process design project research history value "
+    "important different simple large small new first last good great early "
+    "explain show build measure compare improve learn follow start finish"
+).split()
+
+class FakeTranscriptApi:
+    """YouTubeTranscriptApi stand-in serving deterministic synthetic transcripts."""
+    
+    # Video IDs look like 'bench001000' and encode the number of segments
+    ID_PREFIX = 'bench'
+    # Languages the automatic English track can be translated into
+    TRANSLATION_LANGUAGES = ('de', 'fr', 'es', 'it', 'pt', 'pl', 'ru', 'ja', 'ko', 'zh-Hans')
+    # Languages every video has a manually created track in
+    manual_languages = ()
+    
+    @classmethod
+    def video_id(cls, segments):
+        """
+        Build the video ID of a synthetic transcript.
+        
+        Args:
+            segments (int): Number of transcript segments
+        
+        Returns:
+            str: 11 character video ID
+        """
+        return f"{cls.ID_PREFIX}{segments:06d}"
+    
+    @classmethod
+    def get_transcript(cls, video_id, languages=('en',)):
+        """
+        Generate the transcript of a synthetic video.
+        
+        Args:
+            video_id (str): ID built by video_id()
+            languages (iterable): Ignored; transcripts are always English
+        
+        Returns:
+            list: Segment dicts with text, start and duration
+        """
+        count = int(video_id[len(cls.ID_PREFIX):])
+        rng = random.Random(video_id)
+        segments = []
+        start = 0.0
+        for _ in range(count):
+            words = rng.choices(WORDS, k=rng.randint(6, 14))
+            text = ' '.join(words).capitalize() + '.'
+            duration = round(len(words) * 0.4, 2)
+            segments.append({'text': text, 'start': start, 'duration': duration})
+            start = round(start + duration + rng.choice((0.0, 0.1, 0.8)), 2)
+        return segments
+    
+    @classmethod
+    def list_transcripts(cls, video_id):
+        """
+        List the caption tracks of a synthetic video.
+        
+        Args:
+            video_id (str): ID built by video_id()
+        
+        Returns:
+            list: FakeTrack objects, manual tracks first
+        """
+        tracks = [FakeTrack(video_id, code, False) for code in cls.manual_languages]
+        tracks.append(FakeTrack(video_id, 'en', True, cls.TRANSLATION_LANGUAGES))
+        return tracks
+
+class FakeTrack:
+    """Caption track of a synthetic video, shaped like youtube_transcript_api's Transcript."""
+    
+    def __init__(self, video_id, language_code, is_generated, translation_codes=(), source=None):
+        """
+        Initialize the track.
+        
+        Args:
+            video_id (str): ID built by FakeTranscriptApi.video_id()
+            language_code (str): Track language
+            is_generated (bool): Whether the track is automatic
+            translation_codes (iterable): Languages YouTube can translate the track into
+            source (FakeTrack): Track this one was translated from, or None
+        """
+        self.video_id = video_id
+        self.language_code = language_code
+        self.language = language_code
+        self.is_generated = is_generated
+        self.translation_languages = [{'language': code, 'language_code': code}
+                                      for code in translation_codes]
+        self.is_translatable = bool(translation_codes)
+        self.source = source
+    
+    def translate(self, language_code):
+        """Return the track as translated by YouTube."""
+        return FakeTrack(self.video_id, language_code, True, source=self)
+    
+    def fetch(self):
+        """Return the segments, tagged with the track language unless it is the original."""
+        segments = FakeTranscriptApi.get_transcript(self.video_id)
+        if self.language_code == 'en' and self.source is None:
+            return segments
+        # Not in brackets, which the transcript normalizer strips as non-speech tags
+        return [dict(segment, text=f"{self.language_code}: {segment['text']}")
+                for segment in segments]
+
+class FakeTranslator:
+    """GoogleTranslator stand-in with configurable latency and throttling."""
+    
+    latency = 0.02
+    max_requests_per_second = None
+    calls = 0
+    throttled = 0
+    _recent = deque()
+    _lock = threading.Lock()
+    
+    def __init__(self, source='auto', target='en', **kwargs):
+        """
+        Initialize the translator.
+        
+        Args:
+            source (str): Source language code
+            target (str): Target language code
+        """
+        self.source = source
+        self.target = target
+    
+    @classmethod
+    def configure(cls, latency=0.02, max_requests_per_second=None):
+        """
+        Set the simulated service behaviour and reset the counters.
+        
+        Args:
+            latency (float): Seconds per translate() call
+            max_requests_per_second (float): Requests above this rate (across all
+                                             instances) fail with TooManyRequests,
+                                             or None to never throttle
+        """
+        with cls._lock:
+            cls.latency = latency
+            cls.max_requests_per_second = max_requests_per_second
+            cls.calls = 0
+            cls.throttled = 0
+            cls._recent.clear()
+    
+    def translate(self, text):
+        """
+        Return the text unchanged after the configured latency.
+        
+        Args:
+            text (str): Text to translate
+        
+        Returns:
+            str: The same text
+        """
+        from deep_translator.exceptions import TooManyRequests
+        
+        cls = type(self)
+        with cls._lock:
+            cls.calls += 1
+            now = time.monotonic()
+            while cls._recent and now - cls._recent[0] > 1.0:
+                cls._recent.popleft()
+            if cls.max_requests_per_second and len(cls._recent) >= cls.max_requests_per_second:
+                cls.throttled += 1
+                raise TooManyRequests()
+            cls._recent.append(now)
+        
+        time.sleep(cls.latency)
+        return text
+
+class FakeOllamaServer:
+    """Local HTTP server answering the Ollama endpoints the ollama client uses."""
+    
+    def __init__(self, models=('bench:latest',), context_length=4096, response_tokens=60,
+                 tokens_per_second=400.0, prompt_tokens_per_second=4000.0, load_time=0.5):
+        """
+        Initialize the server (call start() to listen).
+        
+        Args:
+            models (iterable): Model names reported by /api/tags
+            context_length (int): Trained context length reported by /api/show
+            response_tokens (int): Tokens generated per chat response
+            tokens_per_second (float): Simulated generation speed
+            prompt_tokens_per_second (float): Simulated prompt evaluation speed
+            load_time (float): Seconds added to the first request of each model
+        """
+        self.models = list(models)
+        self.context_length = context_length
+        self.response_tokens = response_tokens
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.load_time = load_time
+        self.requests = 0
+        # Model loads, counting reloads caused by a changed num_ctx
+        self.loads = 0
+        self._loaded = {}
+        self._lock = threading.Lock()
+        self._server = None
+    
+    @property
+    def host(self):
+        """Base URL of the running server, suitable for OLLAMA_HOST."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        """
+        Start serving on a free local port in a background thread.
+        
+        Returns:
+            str: Base URL of the server
+        """
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.host
+    
+    def stop(self):
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+    
+    def _load_delay(self, model, num_ctx):
+        """Return the simulated load time (first request, or a changed num_ctx like Ollama)."""
+        with self._lock:
+            self.requests += 1
+            num_ctx = num_ctx or self._loaded.get(model) or 2048
+            if self._loaded.get(model) == num_ctx:
+                return 0.0
+            self._loaded[model] = num_ctx
+            self.loads += 1
+        return self.load_time
+    
+    def _handler_class(self):
+        """Build the request handler bound to this server's settings."""
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _send_json(self, payload, status=200):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _read_json(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length) or b'{}')
+            
+            def do_GET(self):
+                if self.path != '/api/tags':
+                    self._send_json({'error': 'not found'}, 404)
+                    return
+                self._send_json({'models': [server._model_entry(name) for name in server.models]})
+            
+            def do_POST(self):
+                request = self._read_json()
+                model = request.get('model') or request.get('name')
+                if model not in server.models:
+                    self._send_json({'error': f"model '{model}' not found"}, 404)
+                    return
+                
+                if self.path == '/api/show':
+                    self._send_json({
+                        'modelfile': '',
+                        'parameters': 'stop "<|end|>"',
+                        'template': '{{ .Prompt }}',
+                        'details': server._model_entry(model)['details'],
+                        'model_info': {'bench.context_length': server.context_length}
+                    })
+                elif self.path == '/api/chat':
+                    prompt = ' '.join(m.get('content', '') for m in request.get('messages', []))
+                    self._generate(model, prompt, request.get('stream', True), chat=True,
+                                   options=request.get('options') or {})
+                elif self.path == '/api/generate':
+                    self._generate(model, request.get('prompt', ''), request.get('stream', True),
+                                   chat=False, options=request.get('options') or {})
+                else:
+                    self._send_json({'error': 'not found'}, 404)
+            
+            def _generate(self, model, prompt, stream, chat, options):
+                num_ctx = options.get('num_ctx')
+                load_time = server._load_delay(model, num_ctx)
+                # Like Ollama, keep only the prompt tokens that fit the context
+                prompt_tokens = min(max(len(prompt) // 4, 1), num_ctx or 2048)
+                prompt_time = prompt_tokens / server.prompt_tokens_per_second
+                tokens = server.response_tokens if prompt else 0
+                if options.get('num_predict'):
+                    tokens = min(tokens, options['num_predict'])
+                time.sleep(load_time + prompt_time)
+                
+                words = prompt.split()[-tokens:] if tokens else []
+                pieces = [word + ' ' for word in words] + ['.'] * (tokens - len(words))
+                started = time.perf_counter()
+                
+                def message(content):
+                    if chat:
+                        return {'message': {'role': 'assistant', 'content': content}}
+                    return {'response': content}
+                
+                if stream:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/x-ndjson')
+                    self.end_headers()
+                    for piece in pieces:
+                        time.sleep(1.0 / server.tokens_per_second)
+                        line = dict(message(piece), model=model, done=False)
+                        self.wfile.write((json.dumps(line) + '\n').encode('utf-8'))
+                        self.wfile.flush()
+                else:
+                    time.sleep(tokens / server.tokens_per_second)
+                
+                eval_ns = int((time.perf_counter() - started) * 1e9)
+                done_reason = 'length' if tokens == options.get('num_predict') else 'stop'
+                final = dict(message('' if stream else ''.join(pieces)), model=model, done=True,
+                             done_reason=done_reason,
+                             load_duration=int(load_time * 1e9),
+                             prompt_eval_count=prompt_tokens,
+                             prompt_eval_duration=int(prompt_time * 1e9),
+                             eval_count=tokens, eval_duration=eval_ns,
+                             total_duration=int((load_time + prompt_time) * 1e9) + eval_ns)
+                if stream:
+                    self.wfile.write((json.dumps(final) + '\n').encode('utf-8'))
+                else:
+                    self._send_json(final)
+        
+        return Handler
+    
+    def _model_entry(self, name):
+        """Build the /api/tags entry of a model."""
+        return {
+            'name': name,
+            'model': name,
+            'digest': hashlib.sha256(name.encode('utf-8')).hexdigest(),
+            'size': 1 << 30,
+            'details': {'family': 'bench', 'parameter_size': '1B', 'quantization_level': 'Q4_0'}
+        }
@@ -6,15 +6,30 @@ This application downloads YouTube transcripts, detects language,
 translates content, and generates summaries using local LLM models.
 """
 
+import argparse
+import json
 import os
 import sys
 import re
 from datetime import datetime
 from modules.transcript_downloader import TranscriptDownloader
+from modules.transcript_cache import TranscriptCache
+from modules.transcript_normalizer import TranscriptNormalizer
 from modules.language_detector import LanguageDetector
 from modules.translator import Translator
+from modules.translation_backends import (BACKENDS, GoogleBackend, LibreTranslateBackend,
+                                          LocalBackend, OllamaBackend)
+from modules.translation_memo import TranslationMemo
 from modules.llm_processor import LLMProcessor
+from modules.summary_cache import SummaryCache
 from modules.file_utils import FileUtils
+from modules.storage import OutputStorage
+from modules.search_index import SearchIndex
+from modules.batch_processor import BatchProcessor
+from modules.pipeline import Pipeline, PipelineError, StageError
+from modules.job_state import JobState
+from modules.tracing import Tracer
+from modules.metrics_export import PrometheusTextfile
 
 # Supported languages for translation
 SUPPORTED_LANGUAGES = {
@@ -101,13 +116,15 @@ def generate_filename_base(url, model_name):
     
     Args:
         url (str): YouTube URL
-        model_name (str): Ollama model name
+        model_name (str): Ollama model name, or None when the run uses no model
         
     Returns:
         str: Base filename without extension
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     video_id = extract_video_id_from_url(url)
+    if not model_name:
+        return f"{timestamp}_{video_id}"
     sanitized_model = sanitize_filename(model_name)
     
     return f"{timestamp}_{video_id}_{sanitized_model}"
@@ -129,6 +146,16 @@ def get_youtube_url():
         else:
             print("❌ Please enter a valid YouTube URL.")
 
+def parse_languages(value):
+    """Split language codes given as a list and/or comma/space separated strings."""
+    values = [value] if isinstance(value, str) else (value or [])
+    langs = []
+    for item in values:
+        for lang in re.split(r'[\s,]+', item.strip().lower()):
+            if lang and lang not in langs:
+                langs.append(lang)
+    return langs
+
 def get_target_language():
     """Get target language selection from user."""
     print("\n🌍 STEP 2: Target Language Selection")
@@ -146,11 +173,12 @@ def get_target_language():
             print(left)
     
     while True:
-        target_lang = input("\nSelect target language code: ").strip().lower()
-        if target_lang in SUPPORTED_LANGUAGES:
-            print(f"✅ Selected: {SUPPORTED_LANGUAGES[target_lang]}")
-            return target_lang
-        print("❌ Please select a valid language code from the list above.")
+        answer = input("\nSelect target language code(s), e.g. 'de' or 'de, fr': ").strip().lower()
+        target_langs = parse_languages(answer)
+        if target_langs and all(lang in SUPPORTED_LANGUAGES for lang in target_langs):
+            print(f"✅ Selected: {', '.join(SUPPORTED_LANGUAGES[lang] for lang in target_langs)}")
+            return target_langs
+        print("❌ Please select valid language codes from the list above.")
 
 def get_summary_type():
     """Get summary type selection from user."""
@@ -200,161 +228,777 @@ def get_llm_model(llm_processor):
             choice = int(input(f"\nSelect model (1-{len(models)}): "))
             if 1 <= choice <= len(models):
                 selected_model = models[choice - 1]
-                print(f"✅ Selected: {selected_model}")
+                # Load the model while the remaining steps run
+                llm_processor.preload(selected_model)
+                info = llm_processor.get_model_info(selected_model)
+                facts = [info['parameter_size'], info['quantization_level'],
+                         f"context {info['context_length']}"]
+                print(f"✅ Selected: {selected_model} ({', '.join(f for f in facts if f)})")
+                print("🔥 Loading model in the background...")
                 return selected_model
             print(f"❌ Please enter a number between 1 and {len(models)}.")
         except ValueError:
             print("❌ Please enter a valid number.")
 
-def process_transcript(url, target_lang, summary_type, selected_model):
-    """Process the transcript through all steps."""
-    # Initialize components
-    downloader = TranscriptDownloader()
+def print_llm_metrics(metrics):
+    """Print timing figures of the last summary generation."""
+    parts = []
+    if metrics.get('model_load_time') is not None:
+        parts.append(f"model load {metrics['model_load_time']:.1f}s "
+                     f"(waited {metrics.get('load_wait', 0.0):.1f}s)")
+    if metrics.get('time_to_first_token') is not None:
+        parts.append(f"first token {metrics['time_to_first_token']:.1f}s")
+    if metrics.get('tokens_per_second'):
+        parts.append(f"{metrics['tokens_per_second']:.1f} tokens/s")
+    if metrics.get('total_time') is not None:
+        parts.append(f"total {metrics['total_time']:.1f}s")
+    if metrics.get('num_ctx'):
+        prompt = f"prompt ~{metrics['estimated_prompt_tokens']}"
+        if metrics.get('prompt_tokens'):
+            prompt += f"/{metrics['prompt_tokens']}"
+        parts.append(f"num_ctx {metrics['num_ctx']} ({prompt} tokens)")
+    if parts:
+        print(f"   ⏱️  {', '.join(parts)}")
+
+def export_trace(tracer, filename_base, success, output_dir='output'):
+    """Write the job's trace file and add its spans to the Prometheus textfile."""
+    tracer.write_trace(os.path.join(output_dir, 'traces', f"{filename_base}.json"))
+    PrometheusTextfile(os.path.join(output_dir, 'metrics', 'yt2txt.prom')).record(tracer, success)
+
+def process_transcript(url, target_lang, summary_type, selected_model,
+                       use_cache=True, offline=False, stream=False, subtitles=None,
+                       output_format='text', llm_processor=None, normalize=True, fillers=None,
+                       translation_backend=None, outputs=None, direct_summary=False,
+                       caption_tracks=True):
+    """
+    Process the transcript through all steps.
+    
+    target_lang may be a single language code or a list of codes. Download,
+    detection and summarization run once; the transcript and summary are then
+    translated into every target concurrently, sharing one translator and so
+    its rate limiter and memo.
+    
+    outputs selects artifacts from OutputStorage.ARTIFACTS (all by default);
+    stages that only feed artifacts which were not selected do not run, so a
+    summary-only run never sends the full transcript to the translator.
+    
+    With direct_summary the model writes the translated summaries itself, so
+    they no longer wait for the original summary and a translator round trip;
+    a summary that fails the language check is translated as before.
+    
+    With caption_tracks the transcript translation uses YouTube's own caption
+    track in the target language when the video has one (manual first, then
+    auto-translated by YouTube); the translator is the fallback.
+    """
+    target_langs = [target_lang] if isinstance(target_lang, str) else list(target_lang)
+    multiple = len(target_langs) > 1
+    outputs = set(outputs or OutputStorage.ARTIFACTS)
+    
+    def kind_for(kind, lang):
+        # Several targets get one artifact per language, e.g. translated_summary_de
+        return f"{kind}_{lang}" if multiple else kind
+    
+    def stage_for(name, lang):
+        return f"{name}:{lang}" if multiple else name
+    
+    # Initialize components (the LLM processor may already be preloading the model)
+    downloader = TranscriptDownloader(TranscriptCache() if use_cache else None, offline=offline)
     detector = LanguageDetector()
-    translator = Translator()
-    llm_processor = LLMProcessor()
+    translator = Translator(TranslationMemo() if use_cache else None, backend=translation_backend)
+    # Part of every translation stage's checkpoint inputs, so switching --translator (or the
+    # Ollama translation model) translates again instead of restoring another backend's output
+    backend_id = (translator.backend.name, translator.backend.memo_key)
+    if not llm_processor and outputs & {'original_summary', 'translated_summary'}:
+        llm_processor = LLMProcessor(cache=SummaryCache() if use_cache else None)
     file_utils = FileUtils()
-    
-    # Ensure output directory exists
-    os.makedirs('output', exist_ok=True)
+    storage = OutputStorage(output_format, 'output')
+    normalizer = TranscriptNormalizer(fillers) if normalize else None
     
     # Generate filename base
     filename_base = generate_filename_base(url, selected_model)
     
+    # Checkpoint of this video/options combination, resumed if an earlier run was interrupted
+    video_id = extract_video_id_from_url(url)
+    job = JobState(f"{video_id}:{','.join(target_langs)}:{summary_type}:{selected_model}")
+    # One span per stage (and per translated chunk), exported when the job ends
+    tracer = Tracer(video_id, url=url, model=selected_model, summary_type=summary_type,
+                    target_lang=','.join(target_langs))
+    
     print("\n" + "=" * 60)
     print("                    PROCESSING")
     print("=" * 60)
+    if job.resumed:
+        print("↩️  Resuming interrupted job from checkpoint")
+    skipped = [kind for kind in OutputStorage.ARTIFACTS if kind not in outputs]
+    if skipped:
+        print(f"⏭️  Not requested: {', '.join(kind.replace('_', ' ') for kind in skipped)}")
     
     # Step 1: Download transcript
-    print("\n📥 STEP 1: Downloading transcript...")
-    transcript = downloader.download_transcript(url)
-    if not transcript:
-        print("❌ Failed to download transcript.")
-        print("   Possible reasons:")
-        print("   • Video has no available transcript")
-        print("   • Video is private or restricted")
-        print("   • Invalid URL")
-        return False, None
+    def download(results):
+        print("\n📥 STEP 1: Downloading transcript...")
+        segments = downloader.download_segments(url, span=tracer.current())
+        if segments is None or not segments.text.strip():
+            raise StageError("Failed to download transcript.\n"
+                             "   Possible reasons:\n"
+                             "   • Video has no available transcript\n"
+                             "   • Video is private or restricted\n"
+                             "   • Invalid URL")
+        print(f"✅ Transcript downloaded successfully ({len(segments.text)} characters, "
+              f"{len(segments)} segments)")
+        return segments
+    
+    # Strip caption noise before anything is paid for per character or token
+    # (filler words depend on the language, so this follows detection)
+    def normalize_segments(results):
+        segments = results['download']
+        if not normalizer:
+            return segments
+        normalized = normalizer.normalize(segments, results['detect'], span=tracer.current())
+        if not normalized.text.strip():
+            raise StageError("Transcript is empty after normalization (try --no-normalize)")
+        removed = len(segments.text) - len(normalized.text)
+        print(f"🧹 Normalized transcript: removed {removed} characters "
+              f"({removed / len(segments.text):.0%})")
+        return normalized
+    
+    def transcript_text(results):
+        return results['normalize'].text.strip()
     
-    print(f"✅ Transcript downloaded successfully ({len(transcript)} characters)")
+    # Keep segment timings (and optional subtitles) with the run's output
+    def save_segments(results):
+        storage.save_segments(filename_base, results['normalize'], subtitles)
     
-    # Step 2: Detect language
-    print("\n🔍 STEP 2: Detecting language...")
-    detected_lang = detector.detect_language(transcript)
-    if detected_lang == 'unknown':
-        print("⚠️  Could not detect language, assuming English")
-        detected_lang = 'en'
-    else:
+    # Step 2: Detect language (the detector ignores caption tags itself)
+    def detect(results):
+        print("\n🔍 STEP 2: Detecting language...")
+        detected_lang = detector.detect_language(results['download'].text)
+        tracer.current().set(language=detected_lang)
+        if detected_lang == 'unknown':
+            print("⚠️  Could not detect language, assuming English")
+            return 'en'
         lang_name = SUPPORTED_LANGUAGES.get(detected_lang, detected_lang)
         print(f"✅ Detected language: {lang_name} ({detected_lang})")
-    
-    # Generate filenames with dynamic naming
-    original_transcript_file = f'output/{filename_base}_original_transcript.txt'
-    translated_transcript_file = f'output/{filename_base}_translated_transcript.txt'
-    original_summary_file = f'output/{filename_base}_original_summary.txt'
-    translated_summary_file = f'output/{filename_base}_translated_summary.txt'
+        return detected_lang
     
     # Step 3: Save original transcript
-    print("\n💾 STEP 3: Saving original transcript...")
-    file_utils.save_transcript(transcript, original_transcript_file)
-    
-    # Step 4: Translate transcript if needed
-    print(f"\n🌐 STEP 4: Translation to {SUPPORTED_LANGUAGES[target_lang]}...")
-    if detected_lang != target_lang:
-        print("   Translating transcript...")
-        translated_transcript = translator.translate_text(transcript, target_lang)
-        file_utils.save_transcript(translated_transcript, translated_transcript_file)
-        print("✅ Translation completed")
-    else:
-        print("✅ Target language matches detected language, no translation needed")
-        translated_transcript = transcript
-        file_utils.save_transcript(transcript, translated_transcript_file)
-    
-    # Step 5: Generate summary
-    print(f"\n🤖 STEP 5: Generating {summary_type} summary with {selected_model}...")
-    summary = llm_processor.generate_summary(transcript, summary_type, selected_model)
-    if not summary:
-        print("❌ Failed to generate summary")
+    def save_original(results):
+        print("\n💾 STEP 3: Saving original transcript...")
+        tracer.current().count_text(results['transcript'])
+        storage.save(filename_base, 'original_transcript', results['transcript'])
+    
+    # Split the transcript once; every target language reuses the chunks
+    def chunk(results):
+        chunks = translator.split_text(results['transcript'], segments=results['normalize'])
+        tracer.current().set(chunks=len(chunks))
+        return chunks
+    
+    # List the video's caption tracks, only if some target language needs translating
+    def list_tracks(results):
+        if all(lang == results['detect'] for lang in target_langs):
+            return []
+        return downloader.list_tracks(url, span=tracer.current())
+    
+    # Step 4: Translate transcript if needed (one stage per target language)
+    def translate_transcript(target_lang):
+        def stage(results):
+            transcript, detected_lang = results['transcript'], results['detect']
+            span = tracer.current()
+            span.set(target_lang=target_lang)
+            kind = kind_for('translated_transcript', target_lang)
+            print(f"\n🌐 STEP 4: Translation to {SUPPORTED_LANGUAGES[target_lang]}...")
+            if detected_lang == target_lang:
+                print("✅ Target language matches detected language, no translation needed")
+                storage.save(filename_base, kind, transcript)
+                return transcript
+            
+            # YouTube's own captions in the target language beat machine translation
+            if caption_tracks:
+                track = caption_track(target_lang, results['tracks'], span)
+                if track:
+                    storage.save(filename_base, kind, track)
+                    print(f"✅ Translation to {SUPPORTED_LANGUAGES[target_lang]} completed")
+                    return track
+            
+            print("   Translating transcript...")
+            translated_transcript, restored = job.run_stage(
+                stage_for('translate_transcript', target_lang),
+                (transcript, detected_lang, target_lang, backend_id),
+                lambda: translator.translate_text(transcript, target_lang,
+                                                  source_language=detected_lang, checkpoint=job,
+                                                  span=span, chunks=results['chunk'])
+            )
+            if restored:
+                span.add('cache_hits')
+                print("   ↩️  Restored from checkpoint")
+            storage.save(filename_base, kind, translated_transcript)
+            if translator.memo:
+                stats = translator.memo.stats()
+                print(f"   Translation memo: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+            print(f"✅ Translation to {SUPPORTED_LANGUAGES[target_lang]} completed")
+            return translated_transcript
+        return stage
+    
+    def caption_track(target_lang, tracks, span):
+        """Download and normalize the video's caption track in a language, or return None."""
+        segments, track_kind = downloader.download_track(url, target_lang, tracks, span=span)
+        if segments is not None and normalizer:
+            with span.child('normalize') as normalize_span:
+                segments = normalizer.normalize(segments, target_lang, span=normalize_span)
+        if segments is None or not segments.text.strip():
+            return None
+        
+        label = "the manual" if track_kind == 'manual' else "YouTube's auto-translated"
+        print(f"📺 Using {label} {SUPPORTED_LANGUAGES[target_lang]} caption track")
+        return segments.text.strip()
+    
+    # Step 5: Generate summary (after normalization, which follows language detection;
+    # does not wait for translation)
+    def summarize(results):
+        transcript, segments = results['transcript'], results['normalize']
+        span = tracer.current()
+        span.count_text(transcript)
+        print(f"\n🤖 STEP 5: Generating {summary_type} summary with {selected_model}...")
+        
+        def generate():
+            if not stream:
+                return llm_processor.generate_summary(transcript, summary_type, selected_model,
+                                                      segments=segments)
+            
+            # Print tokens as they arrive and grow the summary file with them
+            # (bundled formats only print; the summary is stored with the bundle)
+            summary_stream = None
+            if not storage.bundled and 'original_summary' in outputs:
+                summary_file = storage.path_for(filename_base, 'original_summary')
+                summary_stream = file_utils.open_stream(summary_file)
+            
+            def on_token(piece):
+                print(piece, end='', flush=True)
+                if summary_stream:
+                    summary_stream.write(piece)
+                    summary_stream.flush()
+            
+            summary = None
+            try:
+                print()
+                summary = llm_processor.generate_summary(transcript, summary_type, selected_model,
+                                                         on_token=on_token, segments=segments)
+                print()
+            finally:
+                if summary_stream:
+                    summary_stream.close()
+                    # Only a complete summary is registered; a partial one is removed
+                    if summary:
+                        storage.add_file(filename_base, 'original_summary', summary_file)
+                    else:
+                        try:
+                            os.remove(summary_file)
+                        except OSError:
+                            pass
+            return summary
+        
+        summary, restored = job.run_stage('summarize', (transcript, summary_type, selected_model),
+                                          generate)
+        if not summary:
+            raise StageError("Failed to generate summary")
+        
+        span.count_text(summary, prefix='output_')
+        report_generation(span, restored)
+        
+        if 'original_summary' in outputs and (restored or not stream or storage.bundled):
+            storage.save(filename_base, 'original_summary', summary)
+        print("✅ Summary generated successfully")
+        return summary
+    
+    def report_generation(span, restored):
+        """Report where a summary came from, with the model's figures when it was generated."""
+        if restored:
+            span.add('cache_hits')
+            print("   ↩️  Restored from checkpoint")
+        elif llm_processor.last_metrics.get('shared'):
+            span.add('cache_hits')
+            print("   ⚡ Shared with the identical summary generated alongside")
+        elif llm_processor.last_metrics.get('cached'):
+            span.add('cache_hits')
+            print("   ⚡ Served from the summary cache")
+        else:
+            metrics = llm_processor.last_metrics
+            span.set(**{key: metrics.get(key) for key in
+                        ('sections', 'tokens', 'tokens_per_second', 'time_to_first_token',
+                         'model_load_time', 'load_wait')})
+            print_llm_metrics(metrics)
+            file_utils.append_record(dict(metrics, url=url, timestamp=datetime.now().isoformat()),
+                                     'output/llm_metrics.jsonl')
+    
+    # Step 6: Translate summary as soon as it exists (one stage per target language)
+    def translate_summary(target_lang):
+        def stage(results):
+            summary, detected_lang = results['summarize'], results['detect']
+            span = tracer.current()
+            span.set(target_lang=target_lang)
+            kind = kind_for('translated_summary', target_lang)
+            print(f"\n🌐 STEP 6: Summary translation...")
+            if detected_lang == target_lang:
+                print("✅ Summary already in target language")
+                storage.save(filename_base, kind, summary)
+                return summary
+            
+            print(f"   Translating summary to {SUPPORTED_LANGUAGES[target_lang]}...")
+            translated_summary, _ = job.run_stage(
+                stage_for('translate_summary', target_lang),
+                (summary, detected_lang, target_lang, backend_id),
+                lambda: translator.translate_text(summary, target_lang,
+                                                  source_language=detected_lang, checkpoint=job,
+                                                  span=span)
+            )
+            storage.save(filename_base, kind, translated_summary)
+            print(f"✅ Summary translation to {SUPPORTED_LANGUAGES[target_lang]} completed")
+            return translated_summary
+        return stage
+    
+    # Step 6 with --direct-summary: the model summarizes straight into each target language
+    def summarize_into(target_lang):
+        def stage(results):
+            transcript, segments = results['transcript'], results['normalize']
+            detected_lang = results['detect']
+            span = tracer.current()
+            span.set(target_lang=target_lang)
+            kind = kind_for('translated_summary', target_lang)
+            language = SUPPORTED_LANGUAGES[target_lang]
+            same_language = detected_lang == target_lang
+            print(f"\n🤖 STEP 6: Generating {summary_type} summary in {language}...")
+            
+            # In the transcript's own language this is the original summary (and its cache entry)
+            summary, restored = job.run_stage(
+                stage_for('direct_summary', target_lang),
+                (transcript, summary_type, selected_model, target_lang),
+                lambda: llm_processor.generate_summary(transcript, summary_type, selected_model,
+                                                       segments=segments,
+                                                       language=None if same_language else language)
+            )
+            if not summary:
+                raise StageError(f"Failed to generate the {language} summary")
+            span.count_text(summary, prefix='output_')
+            report_generation(span, restored)
+            
+            # Models do not always follow the language instruction; translate what slipped through
+            summary_lang = detector.detect_language(summary)
+            span.set(summary_language=summary_lang)
+            if not same_language and summary_lang.split('-')[0] != target_lang:
+                print(f"⚠️  Summary came back in '{summary_lang}', translating it to {language}")
+                span.add('language_fallbacks')
+                untranslated = summary
+                summary, _ = job.run_stage(
+                    stage_for('translate_summary', target_lang),
+                    (untranslated, target_lang, backend_id),
+                    lambda: translator.translate_text(untranslated, target_lang, checkpoint=job,
+                                                      span=span)
+                )
+            
+            storage.save(filename_base, kind, summary)
+            print(f"✅ Summary in {language} completed")
+            return summary
+        return stage
+    
+    # Room for every translation stage to run alongside download and summarization
+    pipeline = Pipeline(max_workers=max(4, 2 + 2 * len(target_langs)), tracer=tracer)
+    pipeline.add_stage('download', download)
+    # Load the language profiles while the transcript is downloading
+    pipeline.add_stage('warm_detector', lambda results: detector.warm_up())
+    pipeline.add_stage('detect', detect, depends_on=['download', 'warm_detector'])
+    pipeline.add_stage('normalize', normalize_segments, depends_on=['download', 'detect'])
+    pipeline.add_stage('transcript', transcript_text, depends_on=['normalize'])
+    pipeline.add_stage('save_original', save_original, depends_on=['transcript'])
+    pipeline.add_stage('save_segments', save_segments, depends_on=['normalize'])
+    pipeline.add_stage('chunk', chunk, depends_on=['transcript'])
+    if caption_tracks:
+        pipeline.add_stage('tracks', list_tracks, depends_on=['detect'])
+    pipeline.add_stage('summarize', summarize, depends_on=['transcript'])
+    for lang in target_langs:
+        pipeline.add_stage(stage_for('translate_transcript', lang), translate_transcript(lang),
+                           depends_on=['detect', 'chunk'] + (['tracks'] if caption_tracks else []))
+        if direct_summary:
+            pipeline.add_stage(stage_for('direct_summary', lang), summarize_into(lang),
+                               depends_on=['transcript', 'detect'])
+        else:
+            pipeline.add_stage(stage_for('translate_summary', lang), translate_summary(lang),
+                               depends_on=['summarize', 'detect'])
+    summary_stage = 'direct_summary' if direct_summary else 'translate_summary'
+    
+    # Run only what the requested artifacts need (detection also fills the metadata)
+    targets = ['detect', 'save_segments']
+    if 'original_transcript' in outputs:
+        targets.append('save_original')
+    if 'original_summary' in outputs:
+        targets.append('summarize')
+    for lang in target_langs:
+        if 'translated_transcript' in outputs:
+            targets.append(stage_for('translate_transcript', lang))
+        if 'translated_summary' in outputs:
+            targets.append(stage_for(summary_stage, lang))
+    
+    try:
+        results = pipeline.run(targets)
+    except PipelineError as e:
+        if isinstance(e.error, StageError):
+            print(f"\n❌ {e.error}")
+        else:
+            print(f"\n❌ {str(e)}")
+        if job.resumed:
+            print("   Progress is checkpointed; run the same job again to resume.")
+        export_trace(tracer, filename_base, success=False)
         return False, None
     
-    file_utils.save_transcript(summary, original_summary_file)
-    print("✅ Summary generated successfully")
-    
-    # Step 6: Translate summary if needed
-    print(f"\n🌐 STEP 6: Summary translation...")
-    if detected_lang != target_lang:
-        print(f"   Translating summary to {SUPPORTED_LANGUAGES[target_lang]}...")
-        translated_summary = translator.translate_text(summary, target_lang)
-        file_utils.save_transcript(translated_summary, translated_summary_file)
-        print("✅ Summary translation completed")
-    else:
-        print("✅ Summary already in target language")
-        translated_summary = summary
-        file_utils.save_transcript(summary, translated_summary_file)
+    job.finish()
+    export_trace(tracer, filename_base, success=True)
+    detected_lang = results['detect']
+    summary = results.get('summarize')
     
     # Display results
     print("\n" + "=" * 60)
     print("                     RESULTS")
     print("=" * 60)
     
-    print(f"\n📄 ORIGINAL SUMMARY ({SUPPORTED_LANGUAGES.get(detected_lang, detected_lang).upper()}):")
-    print("-" * 50)
-    print(summary)
-    
-    if detected_lang != target_lang:
-        print(f"\n📄 TRANSLATED SUMMARY ({SUPPORTED_LANGUAGES[target_lang].upper()}):")
+    if summary is not None:
+        print(f"\n📄 ORIGINAL SUMMARY ({SUPPORTED_LANGUAGES.get(detected_lang, detected_lang).upper()}):")
         print("-" * 50)
-        print(translated_summary)
+        print(summary)
+    
+    for lang in target_langs:
+        if lang != detected_lang and stage_for(summary_stage, lang) in results:
+            print(f"\n📄 TRANSLATED SUMMARY ({SUPPORTED_LANGUAGES[lang].upper()}):")
+            print("-" * 50)
+            print(results[stage_for(summary_stage, lang)])
     
     # Return file information
-    files_created = {
-        'original_transcript': original_transcript_file,
-        'translated_transcript': translated_transcript_file,
-        'original_summary': original_summary_file,
-        'translated_summary': translated_summary_file
-    }
+    files_created = storage.finish(filename_base, {
+        'video_id': video_id,
+        'url': url,
+        'model': selected_model,
+        'summary_type': summary_type,
+        'source_lang': detected_lang,
+        'target_lang': ','.join(target_langs),
+        'stage_timings': pipeline.timings
+    })
     
     return True, files_created
 
+def parse_keep_alive(value):
+    """Convert a --keep-alive value: plain numbers are seconds, anything else a duration."""
+    if re.fullmatch(r'-?\d+(\.\d+)?', value.strip()):
+        return float(value)
+    return value.strip()
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    
+    Values from a JSON --config file act as defaults that explicit
+    command line flags override. Config keys use the option names with
+    underscores, e.g. {"lang": ["de", "fr"], "no_cache": true, "llm_workers": 2}.
+    """
+    parser = argparse.ArgumentParser(description="YouTube Transcript Processor",
+                                     epilog="Run 'main.py search QUERY' to search processed videos.")
+    parser.add_argument('--config', metavar='FILE',
+                        help="JSON file with default values for any of these options")
+    parser.add_argument('--headless', action='store_true',
+                        help="Never prompt; all settings must come from flags or --config")
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help="Skip the confirmation prompt")
+    parser.add_argument('--url', help="YouTube video URL")
+    parser.add_argument('--batch', metavar='SOURCE',
+                        help="Batch mode: file of URLs, playlist URL or channel URL")
+    parser.add_argument('--lang', nargs='+', metavar='LANG',
+                        help="Target language code(s); several are translated concurrently, "
+                             "e.g. --lang de fr es")
+    parser.add_argument('--summary', choices=sorted(SUMMARY_TYPES.values()),
+                        help="Summary type")
+    parser.add_argument('--model', help="Ollama model name")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Bypass the local transcript cache, translation memo and summary cache")
+    parser.add_argument('--no-summary-cache', action='store_true',
+                        help="Always generate the summary, even if an identical one is cached")
+    parser.add_argument('--offline', action='store_true',
+                        help="Use cached transcripts only, never contact YouTube")
+    parser.add_argument('--no-normalize', action='store_true',
+                        help="Keep caption noise ([Music], fillers, repeated lines) in the transcript")
+    parser.add_argument('--fillers', type=json.loads, metavar='JSON',
+                        help="Extra filler words per language to strip, "
+                             "e.g. '{\"en\": [\"you know\"]}'")
+    parser.add_argument('--translator', choices=BACKENDS, default='google',
+                        help="Translation service: google (default), a libretranslate-compatible "
+                             "server, the ollama model, or local (offline stand-in, no translation)")
+    parser.add_argument('--translator-url', default='http://localhost:5000',
+                        help="Base URL of the LibreTranslate server (default: %(default)s)")
+    parser.add_argument('--translator-model',
+                        help="Ollama model used by --translator ollama (default: the summary model)")
+    parser.add_argument('--outputs', nargs='+', choices=OutputStorage.ARTIFACTS, metavar='ARTIFACT',
+                        help="Artifacts to produce (default: all): "
+                             f"{', '.join(OutputStorage.ARTIFACTS)}; unrequested translations "
+                             "are skipped")
+    parser.add_argument('--direct-summary', action='store_true',
+                        help="Have the model write the summary in the target language instead "
+                             "of translating it; falls back to the translator when the result "
+                             "fails the language check")
+    parser.add_argument('--no-caption-tracks', action='store_true',
+                        help="Always machine-translate the transcript instead of using YouTube's "
+                             "caption tracks in the target language")
+    parser.add_argument('--subtitles', choices=['srt', 'vtt'],
+                        help="Also export the timed transcript as subtitles")
+    parser.add_argument('--output-format', choices=OutputStorage.FORMATS, default='text',
+                        help="text: one file per artifact (default); zip/jsonl: one bundle per video")
+    parser.add_argument('--keep-alive', type=parse_keep_alive, default=LLMProcessor.DEFAULT_KEEP_ALIVE,
+                        help="How long Ollama keeps the model loaded after each request, "
+                             "e.g. 30m, 2h or -1 for indefinitely (default: 30m)")
+    parser.add_argument('--max-context', type=int, default=LLMProcessor.MAX_CONTEXT_LENGTH,
+                        help="Largest num_ctx requested from Ollama; each request is sized "
+                             "to its prompt up to this (default: %(default)s)")
+    parser.add_argument('--stream', action='store_true',
+                        help="Print the summary as it is generated")
+    parser.add_argument('--fetch-workers', type=int, default=4,
+                        help="Concurrent YouTube downloads in batch mode (default: 4)")
+    parser.add_argument('--translate-workers', type=int, default=2,
+                        help="Concurrent translator jobs in batch mode (default: 2)")
+    parser.add_argument('--llm-workers', type=int, default=1,
+                        help="Concurrent Ollama jobs in batch mode (default: 1)")
+
+    known, _ = parser.parse_known_args(argv)
+    if known.config:
+        try:
+            with open(known.config, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read config {known.config}: {str(e)}")
+        valid = {action.dest for action in parser._actions}
+        unknown = sorted(set(config) - valid)
+        if unknown:
+            parser.error(f"unknown config key(s): {', '.join(unknown)}")
+        parser.set_defaults(**config)
+    
+    args = parser.parse_args(argv)
+    args.lang = parse_languages(args.lang)
+    unsupported = [lang for lang in args.lang if lang not in SUPPORTED_LANGUAGES]
+    if unsupported:
+        parser.error(f"unsupported language(s): {', '.join(unsupported)} "
+                     f"(choose from {', '.join(sorted(SUPPORTED_LANGUAGES))})")
+    if args.summary and args.summary not in SUMMARY_TYPES.values():
+        parser.error(f"unsupported summary type: {args.summary}")
+    if args.headless:
+        required = ['lang']
+        if needs_summary(args):
+            required.append('summary')
+        if needs_llm(args):
+            required.append('model')
+        missing = [name for name in required if not getattr(args, name)]
+        if not (args.url or args.batch):
+            missing.insert(0, 'url or batch')
+        if missing:
+            parser.error(f"--headless requires: {', '.join(missing)}")
+    return args
+
+def create_llm_processor(args):
+    """Create the session's LLM processor from the command line options."""
+    use_summary_cache = not (args.no_cache or args.no_summary_cache)
+    return LLMProcessor(keep_alive=args.keep_alive,
+                        cache=SummaryCache() if use_summary_cache else None,
+                        max_context=args.max_context)
+
+def needs_summary(args):
+    """Whether the run produces any summary."""
+    outputs = args.outputs or OutputStorage.ARTIFACTS
+    return any(kind.endswith('_summary') for kind in outputs)
+
+def needs_llm(args):
+    """Whether the run uses the Ollama model, for summaries or as the translator."""
+    return args.translator == 'ollama' or needs_summary(args)
+
+def create_translation_backend(args, llm_processor, model_name):
+    """Create the translation backend selected with --translator."""
+    if args.translator == 'libretranslate':
+        return LibreTranslateBackend(args.translator_url)
+    if args.translator == 'ollama':
+        return OllamaBackend(llm_processor, args.translator_model or model_name)
+    if args.translator == 'local':
+        return LocalBackend()
+    return GoogleBackend()
+
+def run_batch(args):
+    """Run batch mode for a file of URLs, a playlist or a channel."""
+    target_langs = args.lang or get_target_language()
+    summary_type = args.summary or (get_summary_type() if needs_summary(args) else None)
+    # Transcript-only runs never contact Ollama
+    llm_processor, selected_model = None, args.model
+    if needs_llm(args):
+        llm_processor = create_llm_processor(args)
+        selected_model = selected_model or get_llm_model(llm_processor)
+        if not selected_model:
+            print("\n❌ Cannot proceed without an available LLM model.")
+            sys.exit(1)
+        # Load the model while playlists are expanded and the first transcripts download
+        llm_processor.preload(selected_model)
+    
+    processor = BatchProcessor(
+        target_langs, summary_type, selected_model,
+        fetch_workers=args.fetch_workers,
+        translate_workers=args.translate_workers,
+        llm_workers=args.llm_workers,
+        filename_base=generate_filename_base,
+        use_cache=not args.no_cache,
+        offline=args.offline,
+        output_format=args.output_format,
+        llm_processor=llm_processor,
+        normalize=not args.no_normalize,
+        fillers=args.fillers,
+        translation_backend=create_translation_backend(args, llm_processor, selected_model),
+        outputs=args.outputs,
+        direct_summary=args.direct_summary,
+        language_names=SUPPORTED_LANGUAGES,
+        caption_tracks=not args.no_caption_tracks
+    )
+    
+    print("\n📋 Collecting videos...")
+    urls = processor.load_urls(args.batch)
+    if not urls:
+        print("❌ No videos found in batch source.")
+        sys.exit(1)
+    print(f"✅ Found {len(urls)} video(s)")
+    
+    print("\n" + "=" * 60)
+    print("                 BATCH PROCESSING")
+    print("=" * 60)
+    
+    done = 0
+    for result in processor.run(urls):
+        done += 1
+        if result['success']:
+            print(f"✅ [{done}/{len(urls)}] {result['url']}")
+            for filepath in result['files'].values():
+                print(f"   • {os.path.basename(filepath)}")
+        else:
+            print(f"❌ [{done}/{len(urls)}] {result['url']} ({result['stage']}: {result['error']})")
+    
+    succeeded = len(urls) - len(processor.failures)
+    print(f"\n🎉 Batch finished: {succeeded} succeeded, {len(processor.failures)} failed")
+    if processor.failures:
+        report = processor.write_failure_report()
+        print(f"📄 Failure report: {report}")
+        sys.exit(1)
+
+def parse_search_args(argv):
+    """Parse the arguments of the 'search' subcommand."""
+    parser = argparse.ArgumentParser(prog="main.py search",
+                                     description="Search processed transcripts and summaries")
+    parser.add_argument('query', nargs='+',
+                        help="Words to search for (all must match), or an FTS5 query")
+    parser.add_argument('--limit', type=int, default=10,
+                        help="Maximum number of results (default: 10)")
+    parser.add_argument('--kind', action='append',
+                        choices=['original_transcript', 'translated_transcript',
+                                 'original_summary', 'translated_summary'],
+                        help="Only search this kind of document (repeatable)")
+    parser.add_argument('--index', default='output/search.db',
+                        help="Search index path (default: output/search.db)")
+    return parser.parse_args(argv)
+
+def format_timestamp(seconds):
+    """Format seconds as H:MM:SS or M:SS."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+def run_search(argv):
+    """Query the full-text index of processed videos."""
+    args = parse_search_args(argv)
+    query = ' '.join(args.query)
+    if not os.path.exists(args.index):
+        print(f"❌ No search index at {args.index}; process some videos first.")
+        sys.exit(1)
+    
+    try:
+        results = SearchIndex(args.index).search(query, limit=args.limit, kinds=args.kind)
+    except Exception as e:
+        print(f"❌ Search failed: {str(e)}")
+        sys.exit(1)
+    
+    print(f"🔎 {len(results)} result(s) for: {query}")
+    for number, result in enumerate(results, 1):
+        video = result['video_id'] or result['name']
+        print(f"\n{number}. {video} - {result['kind']} (score {result['score']:.2f})")
+        print(f"   {result['snippet']}")
+        for start, snippet in result['timestamps']:
+            link = f"  https://youtu.be/{result['video_id']}?t={int(start)}" if result['video_id'] else ''
+            print(f"   ⏱  {format_timestamp(start)}  {snippet}{link}")
+
 def main():
     """Main application workflow."""
+    if sys.argv[1:2] == ['search']:
+        run_search(sys.argv[2:])
+        return
+    
     try:
+        args = parse_args()
+        
         # Print banner
-        print_banner()
+        if not args.headless:
+            print_banner()
         
-        # Initialize LLM processor early to check availability
-        llm_processor = LLMProcessor()
+        if args.batch:
+            run_batch(args)
+            return
         
-        # Get user input
-        url = get_youtube_url()
-        target_lang = get_target_language()
-        summary_type = get_summary_type()
-        selected_model = get_llm_model(llm_processor)
+        # Start loading a model given on the command line before any prompts
+        # (transcript-only runs never contact Ollama)
+        llm_processor = create_llm_processor(args) if needs_llm(args) else None
+        if args.model and llm_processor:
+            llm_processor.preload(args.model)
         
-        if not selected_model:
-            print("\n❌ Cannot proceed without an available LLM model.")
-            sys.exit(1)
+        # Get user input for anything not given on the command line
+        url = args.url or get_youtube_url()
+        target_langs = args.lang or get_target_language()
+        summary_type = args.summary or (get_summary_type() if needs_summary(args) else None)
+        selected_model = args.model
+        if llm_processor:
+            selected_model = selected_model or get_llm_model(llm_processor)
+            if not selected_model:
+                print("\n❌ Cannot proceed without an available LLM model.")
+                sys.exit(1)
         
         # Confirm settings
         print("\n" + "=" * 60)
         print("                CONFIGURATION")
         print("=" * 60)
         print(f"📹 Video URL: {url}")
-        print(f"🌍 Target Language: {SUPPORTED_LANGUAGES[target_lang]}")
-        print(f"📝 Summary Type: {summary_type}")
-        print(f"🤖 LLM Model: {selected_model}")
+        print(f"🌍 Target Language(s): {', '.join(SUPPORTED_LANGUAGES[lang] for lang in target_langs)}")
+        if summary_type:
+            print(f"📝 Summary Type: {summary_type}")
+        if selected_model:
+            print(f"🤖 LLM Model: {selected_model}")
+        print(f"🔤 Translator: {args.translator}")
         
         # Show filename preview
         filename_base = generate_filename_base(url, selected_model)
         print(f"📁 Files will be named: {filename_base}_[type].txt")
         
-        confirm = input("\nProceed with processing? (y/n): ").strip().lower()
-        if confirm not in ['y', 'yes']:
-            print("❌ Processing cancelled by user.")
-            return
+        if not (args.headless or args.yes):
+            confirm = input("\nProceed with processing? (y/n): ").strip().lower()
+            if confirm not in ['y', 'yes']:
+                print("❌ Processing cancelled by user.")
+                return
         
         # Process transcript
-        success, files_created = process_transcript(url, target_lang, summary_type, selected_model)
+        success, files_created = process_transcript(url, target_langs, summary_type, selected_model,
+                                                    use_cache=not args.no_cache,
+                                                    offline=args.offline,
+                                                    stream=args.stream,
+                                                    subtitles=args.subtitles,
+                                                    output_format=args.output_format,
+                                                    llm_processor=llm_processor,
+                                                    normalize=not args.no_normalize,
+                                                    fillers=args.fillers,
+                                                    translation_backend=create_translation_backend(
+                                                        args, llm_processor, selected_model),
+                                                    outputs=args.outputs,
+                                                    direct_summary=args.direct_summary,
+                                                    caption_tracks=not args.no_caption_tracks)
         
         if success and files_created:
             print("\n" + "=" * 60)
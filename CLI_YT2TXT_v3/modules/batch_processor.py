@@ -0,0 +1,484 @@
+"""
+Batch Processor Module
+
+Runs many YouTube videos through the download, detection, translation and
+summarization steps as a staged pipeline. Each stage has its own worker
+pool so that YouTube, the translator and Ollama are each limited
+independently, and finished videos are reported as soon as they complete.
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from modules.transcript_downloader import TranscriptDownloader
+from modules.transcript_cache import TranscriptCache
+from modules.transcript_normalizer import TranscriptNormalizer
+from modules.language_detector import LanguageDetector
+from modules.translator import Translator
+from modules.translation_memo import TranslationMemo
+from modules.llm_processor import LLMProcessor
+from modules.summary_cache import SummaryCache
+from modules.file_utils import FileUtils
+from modules.storage import OutputStorage
+from modules.tracing import Tracer
+from modules.metrics_export import PrometheusTextfile
+
+class BatchProcessor:
+    """Processes a list of YouTube videos through a concurrent staged pipeline."""
+    
+    # Patterns used to recognise playlist and channel URLs
+    PLAYLIST_PATTERN = r'[?&]list=([\w-]+)'
+    CHANNEL_PATTERN = r'youtube\.com/(?:@[\w.-]+|channel/[\w-]+|c/[\w.-]+|user/[\w.-]+)'
+    VIDEO_ID_PATTERN = r'"videoId":"([\w-]{11})"'
+    
+    def __init__(self, target_lang, summary_type, model_name,
+                 fetch_workers=4, translate_workers=2, llm_workers=1,
+                 output_dir='output', filename_base=None, use_cache=True, offline=False,
+                 output_format='text', llm_processor=None, normalize=True, fillers=None,
+                 translation_backend=None, outputs=None, direct_summary=False,
+                 language_names=None, caption_tracks=True):
+        """
+        Initialize the batch processor.
+        
+        Args:
+            target_lang (str): Target language code, or a list of codes to translate
+                               every video into concurrently
+            summary_type (str): Type of summary ('brief', 'detailed', 'bullet')
+            model_name (str): Name of the Ollama model to use
+            fetch_workers (int): Concurrent YouTube transcript downloads
+            translate_workers (int): Concurrent translator jobs
+            llm_workers (int): Concurrent Ollama summarization jobs
+            output_dir (str): Directory where output files are written
+            filename_base (callable): Function (url, model_name) -> base filename
+            use_cache (bool): Use the on-disk transcript cache, translation memo and summary cache
+            offline (bool): Serve transcripts from the cache only
+            output_format (str): 'text', 'zip' or 'jsonl' (see OutputStorage)
+            llm_processor (LLMProcessor): Processor to use (e.g. one already preloading
+                                          the model), or None to create one
+            normalize (bool): Strip caption noise before detection, translation and summarization
+            fillers (dict): Extra filler words per language (see TranscriptNormalizer)
+            translation_backend (TranslationBackend): Translation service, or None for Google
+            outputs (iterable): Artifacts to produce (see OutputStorage.ARTIFACTS), or None
+                                for all; stages feeding only other artifacts are skipped
+            direct_summary (bool): Have the model write each translated summary itself,
+                                   translating only those that fail the language check
+            language_names (dict): Language code -> name used in direct summary prompts
+            caption_tracks (bool): Use YouTube's caption track in a target language, when
+                                   the video has one, instead of machine translation
+        """
+        self.target_langs = [target_lang] if isinstance(target_lang, str) else list(target_lang)
+        self.target_lang = ','.join(self.target_langs)
+        self.outputs = set(outputs or OutputStorage.ARTIFACTS)
+        self.direct_summary = direct_summary
+        self.language_names = language_names or {}
+        self.caption_tracks = caption_tracks
+        self.summary_type = summary_type
+        self.model_name = model_name
+        self.output_dir = output_dir
+        self.filename_base = filename_base or self._default_filename_base
+        
+        self.downloader = TranscriptDownloader(TranscriptCache() if use_cache else None,
+                                               offline=offline)
+        self.normalizer = TranscriptNormalizer(fillers) if normalize else None
+        self.detector = LanguageDetector()
+        self.translator = Translator(TranslationMemo() if use_cache else None,
+                                     backend=translation_backend)
+        # Only summaries need the model (an Ollama translator brings its own processor)
+        self.summarizes = bool(self.outputs & {'original_summary', 'translated_summary'})
+        self.llm_processor = llm_processor
+        if not llm_processor and self.summarizes:
+            self.llm_processor = LLMProcessor(cache=SummaryCache() if use_cache else None)
+        self.file_utils = FileUtils()
+        self.storage = OutputStorage(output_format, output_dir)
+        self.metrics = PrometheusTextfile(os.path.join(output_dir, 'metrics', 'yt2txt.prom'))
+        
+        # One pool per stage, so each external service has its own limit
+        self.fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers,
+                                             thread_name_prefix='fetch')
+        self.translate_pool = ThreadPoolExecutor(max_workers=translate_workers,
+                                                 thread_name_prefix='translate')
+        self.llm_pool = ThreadPoolExecutor(max_workers=llm_workers,
+                                           thread_name_prefix='ollama')
+        
+        self.failures = []
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+    
+    def load_urls(self, source):
+        """
+        Expand a batch source into a list of video URLs.
+        
+        The source may be a text file (one URL per line, '#' starts a
+        comment), a playlist URL, a channel URL or a single video URL.
+        Playlists and channels listed inside a file are expanded as well.
+        
+        Args:
+            source (str): File path or YouTube URL
+        
+        Returns:
+            list: Unique video URLs in their original order
+        """
+        if os.path.isfile(source):
+            entries = []
+            with open(source, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if line:
+                        entries.append(line)
+        else:
+            entries = [source]
+        
+        urls = []
+        seen = set()
+        for entry in entries:
+            for url in self._expand_url(entry):
+                if url not in seen:
+                    seen.add(url)
+                    urls.append(url)
+        return urls
+    
+    def _expand_url(self, url):
+        """
+        Expand a playlist or channel URL into video URLs.
+        
+        Only the first page returned by YouTube is read, which covers the
+        most recent videos of a channel and the first ~100 playlist entries.
+        
+        Args:
+            url (str): YouTube URL
+        
+        Returns:
+            list: Video URLs
+        """
+        playlist = re.search(self.PLAYLIST_PATTERN, url)
+        if playlist and 'watch?' not in url:
+            page_url = f"https://www.youtube.com/playlist?list={playlist.group(1)}"
+        elif re.search(self.CHANNEL_PATTERN, url):
+            page_url = url.split('?', 1)[0].rstrip('/')
+            if not page_url.endswith('/videos'):
+                page_url += '/videos'
+        else:
+            return [url]
+        
+        import requests
+        
+        try:
+            response = requests.get(page_url, timeout=30,
+                                    headers={'Accept-Language': 'en-US,en;q=0.9'})
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error expanding {url}: {str(e)}")
+            return []
+        
+        video_ids = dict.fromkeys(re.findall(self.VIDEO_ID_PATTERN, response.text))
+        return [f"https://www.youtube.com/watch?v={video_id}" for video_id in video_ids]
+    
+    def run(self, urls):
+        """
+        Run every URL through the pipeline.
+        
+        Results are yielded in completion order, not input order.
+        
+        Args:
+            urls (list): Video URLs to process
+        
+        Yields:
+            dict: Result with 'url', 'success', 'files' and, on failure,
+                  'stage' and 'error'
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.detector.warm_up()
+        if self.summarizes:
+            self.llm_processor.preload(self.model_name)
+        
+        for url in urls:
+            job = {'url': url, 'files': {}, 'name': self.filename_base(url, self.model_name),
+                   'tracer': Tracer(self.downloader.extract_video_id(url), url=url,
+                                    model=self.model_name, summary_type=self.summary_type,
+                                    target_lang=self.target_lang)}
+            self._submit(self.fetch_pool, self._fetch_stage, job, 'download')
+        
+        try:
+            for _ in range(len(urls)):
+                yield self._results.get()
+        finally:
+            for pool in (self.fetch_pool, self.translate_pool, self.llm_pool):
+                pool.shutdown(wait=True)
+            self.translator.backend.close()
+    
+    def _submit(self, pool, stage, job, stage_name):
+        """Submit a stage for a job and route exceptions to the failure list."""
+        def run_stage():
+            try:
+                with job['tracer'].span(stage_name):
+                    stage(job)
+            except Exception as e:
+                self._fail(job, stage_name, str(e))
+            self._export_trace(job)
+        
+        pool.submit(run_stage)
+    
+    def _fail(self, job, stage_name, error):
+        """Record a failed job and publish its result (once per job)."""
+        failure = {'url': job['url'], 'stage': stage_name, 'error': error}
+        with self._lock:
+            if job.get('done'):
+                return
+            job['done'] = job['failed'] = True
+            self.failures.append(failure)
+        self._results.put(dict(failure, success=False, files=job['files']))
+    
+    def _finish_branch(self, job):
+        """Publish the job once every transcript and summary translation branch is done."""
+        with self._lock:
+            job['branches'] -= 1
+            if job['branches'] or job.get('done'):
+                return
+        
+        # Only the last branch gets here; the job is done once its output is stored
+        try:
+            files = self.storage.finish(job['name'], {
+                'video_id': self.downloader.extract_video_id(job['url']),
+                'url': job['url'],
+                'model': self.model_name,
+                'summary_type': self.summary_type,
+                'source_lang': job['detected_lang'],
+                'target_lang': self.target_lang
+            })
+        except Exception as e:
+            self._fail(job, 'finish', str(e))
+            return
+        
+        with self._lock:
+            job['done'] = True
+            job['files'] = files
+        self._results.put({'url': job['url'], 'success': True, 'files': files})
+    
+    def _export_trace(self, job):
+        """Write the trace and metrics of a published job (once, after its span closed)."""
+        with self._lock:
+            if not job.get('done') or job.get('exported'):
+                return
+            job['exported'] = True
+        tracer = job['tracer']
+        tracer.write_trace(os.path.join(self.output_dir, 'traces', f"{job['name']}.json"))
+        self.metrics.record(tracer, not job.get('failed'))
+    
+    def _fetch_stage(self, job):
+        """Download, detect language, normalize and save the original transcript."""
+        span = job['tracer'].current()
+        segments = self.downloader.download_segments(job['url'], span=span)
+        if not segments or not segments.text.strip():
+            self._fail(job, 'download', 'No transcript available')
+            return
+        
+        # The detector ignores caption tags itself; filler words depend on the language
+        detected_lang = self.detector.detect_language(segments.text)
+        if detected_lang == 'unknown':
+            detected_lang = 'en'
+        span.set(language=detected_lang)
+        
+        if self.normalizer:
+            with span.child('normalize') as normalize_span:
+                segments = self.normalizer.normalize(segments, detected_lang, span=normalize_span)
+        transcript = segments.text.strip()
+        if not transcript:
+            self._fail(job, 'normalize', 'Transcript is empty after normalization')
+            return
+        
+        # One branch per requested translation; a summary that is not translated is one branch
+        translate_transcript = 'translated_transcript' in self.outputs
+        direct_summaries = self.direct_summary and 'translated_summary' in self.outputs
+        if direct_summaries:
+            summary_branches = len(self.target_langs) + int('original_summary' in self.outputs)
+        elif 'translated_summary' in self.outputs:
+            summary_branches = len(self.target_langs)
+        else:
+            summary_branches = int('original_summary' in self.outputs)
+        branches = summary_branches + (len(self.target_langs) if translate_transcript else 0)
+        job.update(transcript=transcript, segments=segments, detected_lang=detected_lang,
+                   branches=max(1, branches))
+        if 'original_transcript' in self.outputs:
+            self._save(job, 'original_transcript', transcript)
+        if not branches:
+            self._finish_branch(job)
+            return
+        
+        # Transcript translation and summarization are independent, run them side by side
+        if translate_transcript:
+            job['chunks'] = self.translator.split_text(transcript, segments=segments)
+            if self.caption_tracks:
+                job['tracks'] = self.downloader.list_tracks(job['url'], span=span)
+            for lang in self.target_langs:
+                self._submit(self.translate_pool,
+                             lambda job, lang=lang: self._translate_stage(job, lang),
+                             job, self._stage_name('translate', lang))
+        if direct_summaries:
+            for lang in self.target_langs:
+                self._submit(self.llm_pool,
+                             lambda job, lang=lang: self._direct_summary_stage(job, lang),
+                             job, self._stage_name('direct_summary', lang))
+            if 'original_summary' in self.outputs:
+                self._submit(self.llm_pool, self._summarize_stage, job, 'summarize')
+        elif summary_branches:
+            self._submit(self.llm_pool, self._summarize_stage, job, 'summarize')
+    
+    def _stage_name(self, name, lang):
+        """Name a per-language stage; a single target keeps the plain name."""
+        return f"{name}:{lang}" if len(self.target_langs) > 1 else name
+    
+    def _kind(self, kind, lang):
+        """Name a per-language artifact; a single target keeps the plain kind."""
+        return f"{kind}_{lang}" if len(self.target_langs) > 1 else kind
+    
+    def _translate_stage(self, job, lang):
+        """Translate the transcript into one target language."""
+        transcript = job['transcript']
+        if job['detected_lang'] != lang:
+            # YouTube's own captions in the target language beat machine translation
+            track = self._caption_track(job, lang) if self.caption_tracks else None
+            transcript = track or self.translator.translate_text(
+                transcript, lang, source_language=job['detected_lang'],
+                span=job['tracer'].current(), chunks=job['chunks'])
+        
+        self._save(job, self._kind('translated_transcript', lang), transcript)
+        
+        self._finish_branch(job)
+    
+    def _caption_track(self, job, lang):
+        """Download and normalize the video's caption track in a language, or return None."""
+        span = job['tracer'].current()
+        segments, _ = self.downloader.download_track(job['url'], lang, job.get('tracks'), span=span)
+        if segments is not None and self.normalizer:
+            with span.child('normalize') as normalize_span:
+                segments = self.normalizer.normalize(segments, lang, span=normalize_span)
+        if segments is None or not segments.text.strip():
+            return None
+        return segments.text.strip()
+    
+    def _summarize_stage(self, job):
+        """Generate the summary with Ollama."""
+        summary = self._generate_summary(job, 'summarize')
+        if not summary:
+            return
+        
+        job['summary'] = summary
+        if 'original_summary' in self.outputs:
+            self._save(job, 'original_summary', summary)
+        
+        if 'translated_summary' not in self.outputs or self.direct_summary:
+            self._finish_branch(job)
+            return
+        for lang in self.target_langs:
+            self._submit(self.translate_pool,
+                         lambda job, lang=lang: self._translate_summary_stage(job, lang),
+                         job, self._stage_name('translate_summary', lang))
+    
+    def _direct_summary_stage(self, job, lang):
+        """Have the model summarize straight into one target language."""
+        language = self.language_names.get(lang, lang)
+        summary = self._generate_summary(job, self._stage_name('direct_summary', lang),
+                                         None if job['detected_lang'] == lang else language)
+        if not summary:
+            return
+        
+        # Models do not always follow the language instruction; translate what slipped through
+        span = job['tracer'].current()
+        summary_lang = self.detector.detect_language(summary)
+        span.set(summary_language=summary_lang)
+        if job['detected_lang'] != lang and summary_lang.split('-')[0] != lang:
+            span.add('language_fallbacks')
+            summary = self.translator.translate_text(summary, lang, span=span)
+        
+        self._save(job, self._kind('translated_summary', lang), summary)
+        
+        self._finish_branch(job)
+    
+    def _generate_summary(self, job, stage_name, language=None):
+        """
+        Generate a summary with Ollama and record the model's figures.
+        
+        Args:
+            job (dict): Job being processed
+            stage_name (str): Stage reported if generation fails
+            language (str): Language name to write the summary in, or None
+        
+        Returns:
+            str: Summary, or None after failing the job
+        """
+        span = job['tracer'].current()
+        span.count_text(job['transcript'])
+        summary = self.llm_processor.generate_summary(job['transcript'], self.summary_type,
+                                                      self.model_name, segments=job['segments'],
+                                                      language=language)
+        if not summary:
+            self._fail(job, stage_name, 'Failed to generate summary')
+            return None
+        
+        span.count_text(summary, prefix='output_')
+        metrics = dict(self.llm_processor.last_metrics, url=job['url'],
+                       timestamp=datetime.now().isoformat())
+        span.set(**{key: metrics.get(key) for key in
+                    ('sections', 'tokens', 'tokens_per_second', 'time_to_first_token',
+                     'model_load_time', 'load_wait')})
+        self.file_utils.append_record(metrics, os.path.join(self.output_dir, 'llm_metrics.jsonl'))
+        return summary
+    
+    def _translate_summary_stage(self, job, lang):
+        """Translate the summary into one target language."""
+        summary = job['summary']
+        if job['detected_lang'] != lang:
+            summary = self.translator.translate_text(summary, lang,
+                                                     source_language=job['detected_lang'],
+                                                     span=job['tracer'].current())
+        
+        self._save(job, self._kind('translated_summary', lang), summary)
+        
+        self._finish_branch(job)
+    
+    def _save(self, job, kind, content):
+        """Store one artifact of a job, tracking loose files for the failure report."""
+        filepath = self.storage.save(job['name'], kind, content)
+        if filepath:
+            job['files'][kind] = filepath
+    
+    def write_failure_report(self, filepath=None):
+        """
+        Write the per-video failure report as JSON.
+        
+        Args:
+            filepath (str): Report path, defaults to a timestamped file in the output directory
+        
+        Returns:
+            str: Path of the written report
+        """
+        if not filepath:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepath = os.path.join(self.output_dir, f"{timestamp}_batch_failures.json")
+        
+        report = {
+            'generated_on': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'target_lang': self.target_lang,
+            'summary_type': self.summary_type,
+            'model': self.model_name,
+            'failed': len(self.failures),
+            'failures': self.failures
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return filepath
+    
+    @staticmethod
+    def _default_filename_base(url, model_name):
+        """Fallback base filename when none is supplied by the caller."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        video_id = TranscriptDownloader().extract_video_id(url) or 'video'
+        if not model_name:
+            return f"{timestamp}_{video_id}"
+        model = re.sub(r'[<>:"/\\|?*%\[\]]', '_', model_name)
+        return f"{timestamp}_{video_id}_{model}"
@@ -4,9 +4,73 @@ File Utilities Module
 Handles file I/O operations for saving transcripts and summaries.
 """
 
+import gzip
+import json
 import os
+import threading
 from datetime import datetime
 
+class AtomicWriter:
+    """
+    Streaming text writer that only replaces the target file when closed.
+    
+    Content is written to a temporary file next to the target and renamed
+    over it on a successful close, so readers never see a partial file.
+    If the writer is used as a context manager and the block raises, the
+    temporary file is discarded and the target is left untouched.
+    """
+    
+    def __init__(self, filepath, compress=False):
+        """
+        Open the temporary file.
+        
+        Args:
+            filepath (str): Final path of the file
+            compress (bool): Write gzip-compressed text
+        """
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        
+        self.filepath = filepath
+        self.tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if compress:
+            self._file = gzip.open(self.tmp_path, 'wt', encoding='utf-8')
+        else:
+            self._file = open(self.tmp_path, 'w', encoding='utf-8')
+    
+    def write(self, text):
+        """Write text to the temporary file."""
+        return self._file.write(text)
+    
+    def flush(self):
+        """Flush buffered text to the temporary file."""
+        self._file.flush()
+    
+    def close(self):
+        """Finish writing and atomically move the file into place."""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.replace(self.tmp_path, self.filepath)
+    
+    def discard(self):
+        """Abandon the write and remove the temporary file."""
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
+
 class FileUtils:
     """Utility class for file operations."""
     
@@ -28,13 +92,9 @@ class FileUtils:
             if directory and not os.path.exists(directory):
                 os.makedirs(directory)
             
-            # Add timestamp header
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            header = f"Generated on: {timestamp}\n{'='*50}\n\n"
-            
-            # Write content to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(header + content)
+            # Write header and content, replacing the file only once complete
+            with self.open_writer(filepath) as f:
+                f.write(content)
             
             filename = os.path.basename(filepath)
             print(f"   Saved: {filename}")
@@ -42,6 +102,62 @@ class FileUtils:
         except Exception as e:
             print(f"Error saving file {filepath}: {str(e)}")
     
+    def open_writer(self, filepath, header=True, compress=False):
+        """
+        Open an atomic streaming writer, optionally starting with the timestamp header.
+        
+        Args:
+            filepath (str): Full path where to save the file
+            header (bool): Write the timestamp header first
+            compress (bool): Write gzip-compressed text
+        
+        Returns:
+            AtomicWriter: Writer that moves the file into place when closed
+        """
+        writer = AtomicWriter(filepath, compress=compress)
+        if header:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            writer.write(f"Generated on: {timestamp}\n{'='*50}\n\n")
+        return writer
+    
+    def open_stream(self, filepath):
+        """
+        Open a file for incremental writing, starting with the timestamp header.
+        
+        Args:
+            filepath (str): Full path where to save the file
+        
+        Returns:
+            file: Text file object; the caller writes to it and closes it
+        """
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        stream = open(filepath, 'w', encoding='utf-8')
+        stream.write(f"Generated on: {timestamp}\n{'='*50}\n\n")
+        stream.flush()
+        return stream
+    
+    def append_record(self, record, filepath):
+        """
+        Append a record as one JSON line.
+        
+        Args:
+            record (dict): Data to append
+            filepath (str): JSON Lines file
+        """
+        try:
+            directory = os.path.dirname(filepath)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            
+            with open(filepath, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except Exception as e:
+            print(f"Error saving file {filepath}: {str(e)}")
+    
     def read_file(self, filepath):
         """
         Read content from a file.
@@ -0,0 +1,139 @@
+"""
+Job State Module
+
+Checkpoint file for one processing job (one video with one set of
+options). It records the output of every completed stage together with
+a hash of that stage's inputs, and every translated chunk, so an
+interrupted job resumes where it stopped instead of starting over.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+class JobState:
+    """Persistent record of completed stages and translated chunks for a job."""
+    
+    def __init__(self, job_id, job_dir='cache/jobs'):
+        """
+        Initialize the job state, loading an existing checkpoint if present.
+        
+        Args:
+            job_id (str): Identifier of the job (video ID plus processing options)
+            job_dir (str): Directory holding job state files
+        """
+        key = hashlib.sha256(job_id.encode('utf-8')).hexdigest()[:16]
+        safe_id = job_id.split(':', 1)[0]
+        self.path = os.path.join(job_dir, f"{safe_id}_{key}.json")
+        self._lock = threading.Lock()
+        self.state = {'job_id': job_id, 'stages': {}, 'chunks': {}}
+        
+        os.makedirs(job_dir, exist_ok=True)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                loaded = json.load(f)
+            if loaded.get('job_id') == job_id:
+                self.state = loaded
+        except (OSError, ValueError):
+            pass
+    
+    @staticmethod
+    def hash_inputs(*inputs):
+        """
+        Hash the inputs of a stage.
+        
+        Args:
+            *inputs: Strings (or values convertible to str) the stage depends on
+        
+        Returns:
+            str: Hex digest of the inputs
+        """
+        digest = hashlib.sha256()
+        for value in inputs:
+            digest.update(str(value).encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+    
+    @property
+    def resumed(self):
+        """Whether this job has checkpointed progress from an earlier run."""
+        return bool(self.state['stages'] or self.state['chunks'])
+    
+    def run_stage(self, name, inputs, func):
+        """
+        Return the checkpointed output of a stage, or run it and checkpoint the result.
+        
+        Args:
+            name (str): Stage name
+            inputs (tuple): Values the stage output depends on
+            func (callable): Function computing the output (must return JSON-serializable data)
+        
+        Returns:
+            tuple: (output, restored) where restored is True if it came from the checkpoint;
+                   a None output is returned but not checkpointed
+        """
+        input_hash = self.hash_inputs(*inputs)
+        with self._lock:
+            entry = self.state['stages'].get(name)
+        if entry and entry['input_hash'] == input_hash:
+            return entry['output'], True
+        
+        output = func()
+        if output is None:
+            return None, False
+        with self._lock:
+            self.state['stages'][name] = {'input_hash': input_hash, 'output': output}
+            self._save()
+        return output, False
+    
+    def get(self, text, source_lang, target_lang, backend=None):
+        """
+        Look up a checkpointed chunk translation (same interface as TranslationMemo).
+        
+        Args:
+            text (str): Source chunk
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            backend (str): Memo key of the translation backend, None for Google
+        
+        Returns:
+            str: Translation or None if the chunk was not translated yet
+        """
+        key = self.hash_inputs(text, source_lang, target_lang, *([backend] if backend else []))
+        with self._lock:
+            return self.state['chunks'].get(key)
+    
+    def put(self, text, source_lang, target_lang, translation, backend=None):
+        """
+        Checkpoint a translated chunk.
+        
+        Args:
+            text (str): Source chunk
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            translation (str): Translated chunk
+            backend (str): Memo key of the translation backend, None for Google
+        """
+        key = self.hash_inputs(text, source_lang, target_lang, *([backend] if backend else []))
+        with self._lock:
+            self.state['chunks'][key] = translation
+            self._save()
+    
+    def _save(self):
+        """Write the state atomically (caller holds the lock)."""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving job state: {str(e)}")
+    
+    def finish(self):
+        """Remove the checkpoint once the job has completed."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
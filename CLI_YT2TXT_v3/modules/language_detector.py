@@ -4,27 +4,70 @@ Language Detector Module
 Detects the language of text using langdetect library.
 """
 
-from langdetect import detect, DetectorFactory
-from langdetect.lang_detect_exception import LangDetectException
+import re
+import threading
+
+# langdetect profiles are loaded once per process and shared by all detectors
+_factory_lock = threading.Lock()
+_factory = None
+
+def _get_factory():
+    """
+    Get the process-wide langdetect detector factory, loading profiles on first use.
+    
+    Returns:
+        DetectorFactory: Factory with all language profiles loaded
+    """
+    global _factory
+    if _factory is None:
+        with _factory_lock:
+            if _factory is None:
+                from langdetect.detector_factory import DetectorFactory, PROFILES_DIRECTORY
+                
+                factory = DetectorFactory()
+                factory.load_profile(PROFILES_DIRECTORY)
+                # Set seed for consistent results
+                factory.set_seed(0)
+                _factory = factory
+    return _factory
 
 class LanguageDetector:
     """Detects language of text content."""
     
-    def __init__(self):
-        """Initialize language detector with consistent results."""
-        # Set seed for consistent results
-        DetectorFactory.seed = 0
+    # Bracketed caption tags such as [Music] or (Applause) carry no language signal
+    TAG_PATTERN = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+    
+    def __init__(self, windows=5, window_chars=500):
+        """
+        Initialize language detector with consistent results.
+        
+        Args:
+            windows (int): Number of spread-out samples classified per text
+            window_chars (int): Characters per sample
+        """
+        self.windows = windows
+        self.window_chars = window_chars
+    
+    def warm_up(self):
+        """Load the language profiles now instead of on the first detection."""
+        _get_factory()
     
     def detect_language(self, text):
         """
         Detect the language of given text.
         
+        Several windows spread across the text are classified and combined
+        by voting, weighted by each window's probability and length, so an
+        intro or sponsor read in another language does not decide the result.
+        
         Args:
             text (str): Text to analyze
             
         Returns:
             str: Language code (e.g., 'en', 'es', 'fr') or 'unknown'
         """
+        from langdetect.lang_detect_exception import LangDetectException
+        
         try:
             if not text or len(text.strip()) < 10:
                 return 'unknown'
@@ -32,18 +75,64 @@ class LanguageDetector:
             # Clean text for better detection
             cleaned_text = self._clean_text(text)
             
-            # Detect language
-            detected_lang = detect(cleaned_text)
+            votes = {}
+            for window in self._sample_windows(cleaned_text):
+                try:
+                    probabilities = self._classify(window)
+                except LangDetectException:
+                    continue
+                for candidate in probabilities:
+                    votes[candidate.lang] = votes.get(candidate.lang, 0.0) + candidate.prob * len(window)
             
-            return detected_lang
+            if not votes:
+                return 'unknown'
             
-        except LangDetectException as e:
-            print(f"Language detection error: {str(e)}")
-            return 'unknown'
+            return max(votes, key=votes.get)
+        
         except Exception as e:
             print(f"Unexpected error in language detection: {str(e)}")
             return 'unknown'
     
+    def _classify(self, text):
+        """
+        Get language probabilities for a single sample.
+        
+        Args:
+            text (str): Sample text
+        
+        Returns:
+            list: langdetect Language objects with lang and prob
+        """
+        detector = _get_factory().create()
+        detector.append(text)
+        return detector.get_probabilities()
+    
+    def _sample_windows(self, text):
+        """
+        Pick evenly spread windows from the text, breaking at word boundaries.
+        
+        Args:
+            text (str): Cleaned text
+        
+        Returns:
+            list: Text samples
+        """
+        if len(text) <= self.window_chars * self.windows:
+            return [text]
+        
+        step = (len(text) - self.window_chars) / (self.windows - 1) if self.windows > 1 else 0
+        samples = []
+        for i in range(self.windows):
+            start = int(i * step)
+            if start:
+                space = text.find(' ', start)
+                start = space + 1 if space != -1 else start
+            end = text.rfind(' ', start, start + self.window_chars)
+            if end <= start:
+                end = start + self.window_chars
+            samples.append(text[start:end])
+        return samples
+    
     def _clean_text(self, text):
         """
         Clean text for better language detection.
@@ -54,11 +143,8 @@ class LanguageDetector:
         Returns:
             str: Cleaned text
         """
-        # Remove extra whitespace and normalize
-        cleaned = ' '.join(text.split())
-        
-        # Take a sample if text is very long (for performance)
-        if len(cleaned) > 1000:
-            cleaned = cleaned[:1000]
+        # Drop caption tags, then remove extra whitespace and normalize
+        cleaned = self.TAG_PATTERN.sub(' ', text)
+        cleaned = ' '.join(cleaned.split())
         
-        return cleaned
\ No newline at end of file
+        return cleaned or ' '.join(text.split())
@@ -4,15 +4,84 @@ LLM Processor Module
 Handles interaction with local LLM models via Ollama for summarization.
 """
 
-import ollama
-import requests
+import hashlib
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.text_chunker import TextChunker
+
+class ContextLengthError(Exception):
+    """Raised when a prompt and its response cannot fit the model's context window."""
 
 class LLMProcessor:
     """Processes text using local LLM models via Ollama."""
     
-    def __init__(self):
-        """Initialize LLM processor."""
+    # Ollama's context window when the model does not set num_ctx
+    DEFAULT_CONTEXT_LENGTH = 2048
+    # Largest num_ctx requested; the KV cache, and on CPU the time per token, grow with it
+    MAX_CONTEXT_LENGTH = 8192
+    # num_ctx is rounded up to a multiple of this, so similar requests share one loaded context
+    CONTEXT_STEP = 1024
+    # A loaded context is reused when it exceeds what a request needs by at most this many
+    # tokens; a request needing much less reloads the model with a smaller context
+    CONTEXT_SLACK = 1024
+    # Response tokens allowed (num_predict) per summary type, and for each section summary
+    RESPONSE_TOKENS = {'brief': 256, 'bullet': 512, 'detailed': 1024}
+    SECTION_RESPONSE_TOKENS = 512
+    # Characters of condensed section summaries kept in memory, so every language's summary
+    # of one transcript reuses a single map step
+    CONDENSED_CHARS = 1024 * 1024
+    # Tokens of instructions wrapped around the transcript in a prompt
+    PROMPT_TOKENS = 64
+    # Headroom on token estimates, which only approximate the model's tokenizer
+    ESTIMATE_MARGIN = 1.15
+    # How long Ollama keeps the model loaded after each request
+    DEFAULT_KEEP_ALIVE = '30m'
+    # Bump whenever the prompts, the section splitting or the response limits change,
+    # to invalidate cached summaries
+    PROMPT_VERSION = 3
+    
+    def __init__(self, max_parallel=2, keep_alive=DEFAULT_KEEP_ALIVE, cache=None,
+                 max_context=MAX_CONTEXT_LENGTH):
+        """
+        Initialize LLM processor.
+        
+        Args:
+            max_parallel (int): Section summaries requested concurrently for long texts
+            keep_alive (str): Ollama keep-alive sent with every request, e.g. '30m',
+                              or seconds (-1 keeps the model loaded indefinitely)
+            cache (SummaryCache): Store of earlier summaries, or None to always generate
+            max_context (int): Largest num_ctx to request, whatever the model supports
+        """
+        import ollama
+        
         self.client = ollama.Client()
+        self.max_parallel = max_parallel
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.max_context = max_context
+        self._model_info = {}
+        self._details = {}
+        self._loaded_context = {}
+        self._token_ratios = {}
+        self._digests = {}
+        self._preloads = {}
+        self._condensed = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    @property
+    def last_metrics(self):
+        """
+        Metrics of the last generate_summary call made from this thread.
+        
+        Returns:
+            dict: Timing and throughput figures, or None before the first call
+        """
+        return getattr(self._local, 'metrics', None)
     
     def get_available_models(self):
         """
@@ -22,13 +91,80 @@ class LLMProcessor:
             list: List of available model names
         """
         try:
-            models = self.client.list()
-            return [model['name'] for model in models['models']]
+            models = self.client.list()['models']
+            with self._lock:
+                self._digests.update((model['name'], model.get('digest', '')) for model in models)
+                self._details.update((model['name'], model.get('details') or {}) for model in models)
+            return [model['name'] for model in models]
         except Exception as e:
             print(f"Error getting models: {str(e)}")
             return []
     
-    def generate_summary(self, text, summary_type, model_name):
+    def preload(self, model_name, num_ctx=None):
+        """
+        Start loading a model into Ollama in the background.
+        
+        Returns immediately; the load overlaps with whatever the caller does
+        next, and generate_summary waits for it. Calling it again for the
+        same model does nothing.
+        
+        Args:
+            model_name (str): Name of the Ollama model to load
+            num_ctx (int): Context the first requests are expected to need, or None
+                           for Ollama's default; requests within CONTEXT_SLACK of it
+                           reuse the loaded model
+        """
+        with self._lock:
+            if model_name in self._preloads:
+                return
+            entry = {'done': threading.Event(), 'load_time': None, 'error': None}
+            self._preloads[model_name] = entry
+        
+        def load():
+            started = time.perf_counter()
+            try:
+                # Load with the context the first requests will use, so they do not reload
+                # the model, but no larger: every token of num_ctx costs KV cache memory
+                limit = self.get_context_length(model_name)
+                context = min(limit, self._round_context(num_ctx or self.DEFAULT_CONTEXT_LENGTH))
+                # An empty prompt makes Ollama load the model without generating anything
+                response = self.client.generate(model=model_name, prompt='',
+                                                options={'num_ctx': context},
+                                                keep_alive=self.keep_alive)
+                load_duration = response.get('load_duration')
+                entry['load_time'] = (load_duration / 1e9 if load_duration
+                                      else time.perf_counter() - started)
+                with self._lock:
+                    self._loaded_context[model_name] = context
+                self.get_model_digest(model_name)
+            except Exception as e:
+                entry['error'] = str(e)
+            finally:
+                entry['done'].set()
+        
+        threading.Thread(target=load, name=f"preload-{model_name}", daemon=True).start()
+    
+    def wait_for_model(self, model_name):
+        """
+        Wait until the model is loaded, preloading it first if needed.
+        
+        Args:
+            model_name (str): Name of the Ollama model
+        
+        Returns:
+            tuple: (load_time, waited) in seconds; load_time is what Ollama spent
+                   loading the model, waited is how long this call blocked
+        """
+        self.preload(model_name)
+        entry = self._preloads[model_name]
+        started = time.perf_counter()
+        entry['done'].wait()
+        if entry['error']:
+            print(f"Warning: Could not preload {model_name}: {entry['error']}")
+        return entry['load_time'], time.perf_counter() - started
+    
+    def generate_summary(self, text, summary_type, model_name, on_token=None, segments=None,
+                         language=None):
         """
         Generate summary using specified LLM model.
         
@@ -36,53 +172,513 @@ class LLMProcessor:
             text (str): Text to summarize
             summary_type (str): Type of summary ('brief', 'detailed', 'bullet')
             model_name (str): Name of the Ollama model to use
+            on_token (callable): Called with each piece of the final summary as it
+                                 is generated; enables streaming when given
+            segments (TranscriptSegments): Timed segments of the text; their pauses
+                                           help split long unpunctuated transcripts
+            language (str): Language name (e.g. 'German') to write the summary in,
+                            or None for the language of the text
             
         Returns:
             str: Generated summary or None if failed
         """
+        started = time.perf_counter()
+        self._local.metrics = {'model': model_name, 'summary_type': summary_type,
+                               'language': language, 'input_chars': len(text), 'sections': 0,
+                               'cached': False}
         try:
-            # Create prompt based on summary type
-            prompt = self._create_prompt(text, summary_type)
+            # A cached summary needs neither the model nor its load time; without a digest
+            # the cache is skipped, as a re-pulled model could be served stale summaries
+            cache_key = None
+            digest = self.get_model_digest(model_name) if self.cache else ''
+            if digest:
+                cache_key = self.cache.make_key(text, model_name, digest,
+                                                summary_type, self.PROMPT_VERSION, language)
+                summary = self.cache.get(cache_key)
+                if summary is not None:
+                    if on_token:
+                        on_token(summary)
+                    self._local.metrics.update(cached=True,
+                                               total_time=time.perf_counter() - started)
+                    return summary
             
-            # Generate summary using Ollama
-            response = self.client.chat(
-                model=model_name,
-                messages=[
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ]
-            )
+            # Model loading is reported separately and not counted as generation time
+            load_time, load_wait = self.wait_for_model(model_name)
+            self._local.metrics.update(model_load_time=load_time, load_wait=load_wait)
+            started = time.perf_counter()
             
-            summary = response['message']['content'].strip()
+            # An identical summary already being generated (e.g. the original summary and the
+            # direct summary in the same language) is waited for instead of generated twice
+            key = ('summary', model_name, summary_type, language, self._text_key(text))
+            summary, generated = self._share(self._in_flight, key, lambda: self._summarize(
+                text, summary_type, model_name, on_token, segments, language))
+            if not generated:
+                if on_token:
+                    on_token(summary)
+                self._local.metrics.update(cached=True, shared=True)
+            elif cache_key and summary:
+                self.cache.put(cache_key, summary, model_name, summary_type)
+            self._local.metrics['total_time'] = time.perf_counter() - started
             return summary
             
         except Exception as e:
             print(f"Error generating summary: {str(e)}")
             return None
     
-    def _create_prompt(self, text, summary_type):
+    def _summarize(self, text, summary_type, model_name, on_token=None, segments=None,
+                   language=None):
+        """
+        Summarize text in one request, or map-reduce it when it exceeds the context.
+        
+        Args:
+            text (str): Text to summarize
+            summary_type (str): Type of summary
+            model_name (str): Name of the Ollama model to use
+            on_token (callable): Streaming callback for the final summary, or None
+            segments (TranscriptSegments): Timed segments of the text, or None
+            language (str): Language name of the summary, or None for the text's own
+        
+        Returns:
+            str: Generated summary
+        """
+        # Small contexts keep at least half of their tokens for the prompt
+        half_context = self.get_context_length(model_name) // 2
+        num_predict = min(self.RESPONSE_TOKENS.get(summary_type, self.SECTION_RESPONSE_TOKENS),
+                          half_context)
+        section_predict = min(self.SECTION_RESPONSE_TOKENS, half_context)
+        final = TextChunker(self._input_budget(model_name, num_predict), unit='tokens')
+        
+        # The map step does not depend on the summary's language, so it runs once per text
+        # and every language only sends its own final request
+        key = ('condense', model_name, num_predict, self._text_key(text))
+        (condensed, sections), _ = self._share(
+            self._condensed, key,
+            lambda: self._condense(text, model_name, final, section_predict, segments),
+            size=lambda result: len(result[0] or ''))
+        self._local.metrics['sections'] = sections
+        # A text that fits is not kept in the shared results, only its key
+        if condensed is None:
+            condensed = text
+        
+        # Sections stay in the source language; only the final summary is written in the target
+        return self._chat(model_name, self._create_prompt(condensed, summary_type, language),
+                          num_predict, on_token=on_token, record=True)
+    
+    def _condense(self, text, model_name, final, section_predict, segments=None):
+        """
+        Map step: shrink a text until it fits the final summary request.
+        
+        Args:
+            text (str): Text to condense
+            model_name (str): Name of the Ollama model to use
+            final (TextChunker): Chunker sized to the final request's input budget
+            section_predict (int): Maximum tokens per section summary
+            segments (TranscriptSegments): Timed segments of the text, or None
+        
+        Returns:
+            tuple: (combined section summaries, or None if the text fits as it is,
+                    number of sections summarized)
+        """
+        # Texts that fit the context are summarized in a single request
+        if final.size(text) <= final.max_size:
+            return None, 0
+        
+        # Otherwise summarize context-sized sections in parallel and reduce
+        chunker = TextChunker(self._input_budget(model_name, section_predict), unit='tokens')
+        partials = self._summarize_sections(chunker.iter_chunks(text, segments), model_name,
+                                            section_predict)
+        sections = len(partials)
+        combined = '\n\n'.join(partials)
+        while final.size(combined) > final.max_size:
+            partials = self._summarize_sections(chunker.iter_chunks(combined), model_name,
+                                                section_predict)
+            sections += len(partials)
+            reduced = '\n\n'.join(partials)
+            if len(reduced) >= len(combined):
+                # The model is not condensing any further; use the best we have
+                print("   Warning: Section summaries do not condense further; "
+                      "summarizing the part that fits the context")
+                combined = next(final.iter_chunks(reduced), '')
+                break
+            combined = reduced
+        return combined, sections
+    
+    def _share(self, results, key, compute, size=None):
+        """
+        Compute a result once per key; callers arriving meanwhile wait for it.
+        
+        Args:
+            results (dict): Entries by key, guarded by the processor's lock
+            key (tuple): Identity of the result
+            compute (callable): Produces the result
+            size (callable): Size of the result in characters, to keep it for later callers
+                             (dropping the oldest beyond CONDENSED_CHARS); without it, or
+                             for a size of 0, the result is only shared while being computed
+        
+        Returns:
+            tuple: (result, True if this call computed it)
+        
+        Raises:
+            Exception: Whatever compute raised, in every caller that waited for it
+        """
+        with self._lock:
+            entry = results.get(key)
+            owner = entry is None
+            if owner:
+                entry = results[key] = {'done': threading.Event()}
+        
+        if owner:
+            try:
+                entry['result'] = compute()
+            except Exception as e:
+                entry['error'] = e
+            finally:
+                with self._lock:
+                    # Failures are retried by later callers
+                    kept = size(entry['result']) if size and 'result' in entry else 0
+                    if kept:
+                        entry['size'] = kept
+                        self._trim(results)
+                    else:
+                        results.pop(key, None)
+                entry['done'].set()
+        else:
+            entry['done'].wait()
+        
+        if 'error' in entry:
+            raise entry['error']
+        return entry['result'], owner
+    
+    def _trim(self, results):
+        """Drop the oldest kept results beyond CONDENSED_CHARS (caller holds the lock)."""
+        total = sum(entry.get('size', 0) for entry in results.values())
+        # Only finished entries have a size; entries still being computed are never dropped
+        for key in [key for key, entry in results.items() if 'size' in entry]:
+            if total <= self.CONDENSED_CHARS:
+                break
+            total -= results.pop(key)['size']
+    
+    @staticmethod
+    def _text_key(text):
+        """Short digest identifying a text in the shared results."""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def generate_text(self, prompt, model_name, num_predict=SECTION_RESPONSE_TOKENS):
+        """
+        Answer a free-form prompt, e.g. a translation request.
+        
+        Args:
+            prompt (str): Prompt text
+            model_name (str): Name of the Ollama model to use
+            num_predict (int): Maximum response tokens, capped at half the context
+        
+        Returns:
+            str: Model response
+        
+        Raises:
+            ContextLengthError: If the prompt and response cannot fit the context
+        """
+        self.wait_for_model(model_name)
+        num_predict = min(num_predict, self.get_context_length(model_name) // 2)
+        return self._chat(model_name, prompt, num_predict)
+    
+    def _chat(self, model_name, prompt, num_predict, on_token=None, record=False):
+        """
+        Send a single prompt to the model.
+        
+        Args:
+            model_name (str): Name of the Ollama model to use
+            prompt (str): Prompt text
+            num_predict (int): Maximum response tokens
+            on_token (callable): Streams the response through this callback when given
+            record (bool): Store timing figures in this thread's last_metrics
+        
+        Returns:
+            str: Model response
+        
+        Raises:
+            ContextLengthError: If the prompt and response cannot fit the context
+        """
+        options, prompt_tokens = self._request_options(model_name, prompt, num_predict)
+        messages = [
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+        started = time.perf_counter()
+        first_token = None
+        
+        if on_token:
+            parts = []
+            final = {}
+            for chunk in self.client.chat(model=model_name, messages=messages, stream=True,
+                                          options=options, keep_alive=self.keep_alive):
+                piece = chunk.get('message', {}).get('content', '')
+                if piece:
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    parts.append(piece)
+                    on_token(piece)
+                if chunk.get('done'):
+                    final = chunk
+            content = ''.join(parts)
+        else:
+            final = self.client.chat(model=model_name, messages=messages, options=options,
+                                     keep_alive=self.keep_alive)
+            content = final['message']['content']
+        
+        self._calibrate(model_name, prompt, final.get('prompt_eval_count'))
+        if final.get('done_reason') == 'length' or (final.get('eval_count') or 0) >= num_predict:
+            print(f"   Warning: Response reached the {num_predict}-token limit and may be cut short")
+        if record:
+            self._record_metrics(final, started, first_token, len(parts) if on_token else None)
+            self._local.metrics.update(num_ctx=options['num_ctx'], num_predict=num_predict,
+                                       estimated_prompt_tokens=prompt_tokens)
+        return content.strip()
+    
+    def _request_options(self, model_name, prompt, num_predict):
+        """
+        Size the context of a request to its prompt and response.
+        
+        Args:
+            model_name (str): Name of the Ollama model
+            prompt (str): Prompt text
+            num_predict (int): Maximum response tokens
+        
+        Returns:
+            tuple: (Ollama options with num_ctx and num_predict, estimated prompt tokens)
+        
+        Raises:
+            ContextLengthError: If the prompt and response cannot fit the context
+        """
+        prompt_tokens = self.estimate_tokens(prompt, model_name)
+        needed = prompt_tokens + num_predict
+        limit = self.get_context_length(model_name)
+        if needed > limit:
+            raise ContextLengthError(f"Prompt of ~{prompt_tokens} tokens plus {num_predict} "
+                                     f"response tokens exceeds the {limit}-token context "
+                                     f"of {model_name}")
+        
+        num_ctx = min(limit, self._round_context(needed))
+        with self._lock:
+            # A changed num_ctx makes Ollama reload the model, so a slightly larger context
+            # that is already loaded is reused; a much larger one is shrunk
+            loaded = self._loaded_context.get(model_name)
+            if loaded and num_ctx <= loaded <= min(limit, num_ctx + self.CONTEXT_SLACK):
+                num_ctx = loaded
+            else:
+                self._loaded_context[model_name] = num_ctx
+        return {'num_ctx': num_ctx, 'num_predict': num_predict}, prompt_tokens
+    
+    def _round_context(self, tokens):
+        """Round a token count up to a multiple of CONTEXT_STEP."""
+        return -(-tokens // self.CONTEXT_STEP) * self.CONTEXT_STEP
+    
+    def estimate_tokens(self, text, model_name=None):
+        """
+        Estimate the tokens a model needs for a text, with safety headroom.
+        
+        Args:
+            text (str): Text to measure
+            model_name (str): Model whose observed tokenizer ratio to apply, or None
+        
+        Returns:
+            int: Estimated token count
+        """
+        with self._lock:
+            ratio = self._token_ratios.get(model_name, 1.0)
+        return int(TextChunker.estimate_tokens(text) * ratio * self.ESTIMATE_MARGIN) + 1
+    
+    def _calibrate(self, model_name, prompt, prompt_eval_count):
+        """Raise a model's token ratio when Ollama counted more prompt tokens than estimated."""
+        estimate = TextChunker.estimate_tokens(prompt)
+        if not prompt_eval_count or not estimate:
+            return
+        # Only ever raised: a cached prompt prefix makes Ollama report fewer tokens
+        with self._lock:
+            ratio = self._token_ratios.get(model_name, 1.0)
+            self._token_ratios[model_name] = min(2.0, max(ratio, prompt_eval_count / estimate))
+    
+    def _record_metrics(self, final, started, first_token, chunks):
+        """
+        Store timing figures for the final generation request.
+        
+        Ollama reports token counts and durations (in nanoseconds) on the last
+        response; wall-clock values are used when they are missing.
+        
+        Args:
+            final (dict): Final Ollama response
+            started (float): perf_counter() value when the request was sent
+            first_token (float): perf_counter() value of the first streamed token, or None
+            chunks (int): Number of streamed chunks, or None when not streaming
+        """
+        generation_time = time.perf_counter() - started
+        tokens = final.get('eval_count') or chunks
+        eval_seconds = (final.get('eval_duration') or 0) / 1e9 or generation_time
+        
+        self._local.metrics.update({
+            'time_to_first_token': first_token - started if first_token else None,
+            'tokens': tokens,
+            'tokens_per_second': tokens / eval_seconds if tokens and eval_seconds else None,
+            'prompt_tokens': final.get('prompt_eval_count'),
+            'generation_time': generation_time
+        })
+    
+    def _summarize_sections(self, sections, model_name, num_predict):
+        """
+        Map step: summarize each context-sized section of the text.
+        
+        Args:
+            sections (iterable): Sections of the text, from TextChunker
+            model_name (str): Name of the Ollama model to use
+            num_predict (int): Maximum tokens per section summary
+        
+        Returns:
+            list: Section summaries in original order
+        """
+        sections = list(sections)
+        total = len(sections)
+        print(f"   Summarizing {total} sections...")
+        
+        def summarize(item):
+            index, section = item
+            return self._chat(model_name, self._create_section_prompt(section, index, total),
+                              num_predict)
+        
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            return list(pool.map(summarize, enumerate(sections, 1)))
+    
+    def get_model_digest(self, model_name):
+        """
+        Get the digest of a model's weights, which changes when it is re-pulled.
+        
+        Args:
+            model_name (str): Name of the Ollama model
+        
+        Returns:
+            str: Digest, or '' if the model is not listed
+        """
+        with self._lock:
+            if self._digests.get(model_name):
+                return self._digests[model_name]
+        
+        # Not remembered when empty: Ollama may just be unreachable right now
+        self.get_available_models()
+        with self._lock:
+            return self._digests.get(model_name, '')
+    
+    def get_model_info(self, model_name):
+        """
+        Get a model's metadata, fetched from Ollama once per processor.
+        
+        Args:
+            model_name (str): Name of the Ollama model
+        
+        Returns:
+            dict: context_length (tokens the model was trained for), num_ctx (set in
+                  its Modelfile, or None), parameter_size, quantization_level and family
+        """
+        with self._lock:
+            if model_name in self._model_info:
+                return self._model_info[model_name]
+            details = dict(self._details.get(model_name, {}))
+        
+        info = {'context_length': self.DEFAULT_CONTEXT_LENGTH, 'num_ctx': None,
+                'parameter_size': details.get('parameter_size'),
+                'quantization_level': details.get('quantization_level'),
+                'family': details.get('family')}
+        try:
+            response = self.client.show(model_name)
+            for key, value in (response.get('details') or {}).items():
+                if key in info and value:
+                    info[key] = value
+            match = re.search(r'^num_ctx\s+(\d+)', response.get('parameters') or '', re.MULTILINE)
+            if match:
+                info['num_ctx'] = int(match.group(1))
+            # Trained context, e.g. 'llama.context_length' (reported by newer Ollama versions)
+            trained = [value for key, value in (response.get('model_info') or {}).items()
+                       if key.endswith('.context_length')]
+            if trained:
+                info['context_length'] = int(trained[0])
+            elif info['num_ctx']:
+                info['context_length'] = info['num_ctx']
+        except Exception as e:
+            print(f"Warning: Could not read model info for {model_name}: {str(e)}")
+        
+        with self._lock:
+            return self._model_info.setdefault(model_name, info)
+    
+    def get_context_length(self, model_name):
+        """
+        Get the largest context requested for a model.
+        
+        Args:
+            model_name (str): Name of the Ollama model
+        
+        Returns:
+            int: Context length in tokens, capped at max_context
+        """
+        return min(self.get_model_info(model_name)['context_length'], self.max_context)
+    
+    def _input_budget(self, model_name, num_predict):
+        """
+        Get the transcript size that fits one request next to its instructions and response.
+        
+        Args:
+            model_name (str): Name of the Ollama model
+            num_predict (int): Response tokens reserved
+        
+        Returns:
+            int: Budget in TextChunker token estimates
+        """
+        with self._lock:
+            ratio = self._token_ratios.get(model_name, 1.0)
+        available = self.get_context_length(model_name) - num_predict - self.PROMPT_TOKENS
+        return max(64, int(available / (ratio * self.ESTIMATE_MARGIN)))
+    
+    def _create_section_prompt(self, text, index, total):
+        """
+        Create the prompt for summarizing one section of a long text.
+        
+        Args:
+            text (str): Section text
+            index (int): Section number, starting at 1
+            total (int): Number of sections
+        
+        Returns:
+            str: Formatted prompt
+        """
+        return (f"The following is part {index} of {total} of a longer transcript:\n\n{text}\n\n"
+                "Summarize this part, keeping every key point, name, number and conclusion. "
+                "Do not add an introduction or refer to other parts.")
+    
+    def _create_prompt(self, text, summary_type, language=None):
         """
         Create appropriate prompt based on summary type.
         
         Args:
             text (str): Text to summarize
             summary_type (str): Type of summary
-            
+            language (str): Language name to write the summary in, or None
+        
         Returns:
             str: Formatted prompt
         """
         base_prompt = f"Please summarize the following text:\n\n{text}\n\n"
         
         if summary_type == 'brief':
-            return base_prompt + "Provide a brief summary in 2-3 sentences that captures the main points."
+            prompt = base_prompt + "Provide a brief summary in 2-3 sentences that captures the main points."
         
         elif summary_type == 'detailed':
-            return base_prompt + "Provide a detailed summary with key points, important details, and main conclusions."
+            prompt = base_prompt + "Provide a detailed summary with key points, important details, and main conclusions."
         
         elif summary_type == 'bullet':
-            return base_prompt + "Provide a bullet-point summary with the main points listed clearly."
+            prompt = base_prompt + "Provide a bullet-point summary with the main points listed clearly."
         
         else:
-            return base_prompt + "Provide a concise summary of the main points."
\ No newline at end of file
+            prompt = base_prompt + "Provide a concise summary of the main points."
+        
+        if language:
+            prompt += f" Write the summary in {language}, whatever the language of the text."
+        return prompt
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Metrics Export Module
+
+Aggregates finished trace spans into Prometheus metrics and writes them
+in the text exposition format for node_exporter's textfile collector.
+Totals are kept in a small JSON state file next to the .prom file, so
+the counters and latency histograms accumulate across runs. Concurrent
+processes serialize their updates with a lock file (where fcntl exists).
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: updates are only serialized within one process
+    fcntl = None
+
+class PrometheusTextfile:
+    """Cumulative per-stage metrics written as a Prometheus textfile."""
+    
+    # Latency histogram buckets in seconds
+    BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+    # Numeric span attributes exported as per-stage counters
+    COUNTERS = ('chars', 'bytes', 'retries', 'cache_hits', 'throttled', 'removed_chars',
+                'language_fallbacks')
+    PREFIX = 'yt2txt'
+    
+    def __init__(self, filepath='output/metrics/yt2txt.prom'):
+        """
+        Initialize the exporter.
+        
+        Args:
+            filepath (str): .prom file read by the textfile collector
+        """
+        self.filepath = filepath
+        self.state_path = f"{filepath}.state.json"
+        self.lock_path = f"{filepath}.lock"
+        self._lock = threading.Lock()
+    
+    def record(self, tracer, success):
+        """
+        Add the spans of a finished job to the metrics and rewrite the textfile.
+        
+        Args:
+            tracer (Tracer): Trace of the job
+            success (bool): Whether the job completed
+        """
+        try:
+            with self._lock, self._file_lock():
+                state = self._load()
+                self._merge(state, tracer, success)
+                self._save(state)
+        except (OSError, ValueError) as e:
+            print(f"Error recording metrics: {str(e)}")
+    
+    def _merge(self, state, tracer, success):
+        """Add the spans and outcome of a job to the loaded totals."""
+        stages = state['stages']
+        for span in tracer.spans:
+            stage = stages.setdefault(span.name, {
+                'buckets': [0] * len(self.BUCKETS), 'sum': 0.0, 'count': 0,
+                'failures': 0, 'counters': {}
+            })
+            duration = span.duration or 0.0
+            stage['sum'] += duration
+            stage['count'] += 1
+            for i, bound in enumerate(self.BUCKETS):
+                if duration <= bound:
+                    stage['buckets'][i] += 1
+            if span.error:
+                stage['failures'] += 1
+            for key in self.COUNTERS:
+                value = span.attributes.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stage['counters'][key] = stage['counters'].get(key, 0) + value
+        
+        status = 'success' if success else 'failure'
+        state['runs'][status] = state['runs'].get(status, 0) + 1
+        state['last_run'] = time.time()
+    
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the lock file, shared by every process."""
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _load(self):
+        """
+        Load the accumulated totals.
+        
+        Returns:
+            dict: State, empty when no state file exists yet
+        
+        Raises:
+            ValueError: If the state file cannot be parsed; starting over would make
+                        the cumulative counters go backwards, so it is left for repair
+        """
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return {'stages': {}, 'runs': {}, 'last_run': None}
+        try:
+            return json.loads(content)
+        except ValueError as e:
+            raise ValueError(f"Unreadable metrics state {self.state_path} ({str(e)}); "
+                             f"repair or remove it to record metrics again") from e
+    
+    def _save(self, state):
+        """Write the state and the textfile, each atomically."""
+        for path, content in ((self.state_path, json.dumps(state)),
+                              (self.filepath, self._render(state))):
+            directory, name = os.path.split(path)
+            fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f".{name}.",
+                                            suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                # mkstemp creates the file readable by its owner only
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except OSError:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+    
+    def _render(self, state):
+        """Render the state in the Prometheus text exposition format."""
+        p = self.PREFIX
+        lines = [
+            f"# HELP {p}_stage_duration_seconds Duration of pipeline stages and sub-steps.",
+            f"# TYPE {p}_stage_duration_seconds histogram"
+        ]
+        for name, stage in sorted(state['stages'].items()):
+            for bound, count in zip(self.BUCKETS, stage['buckets']):
+                lines.append(f'{p}_stage_duration_seconds_bucket{{stage="{name}",le="{bound}"}} {count}')
+            lines.append(f'{p}_stage_duration_seconds_bucket{{stage="{name}",le="+Inf"}} {stage["count"]}')
+            lines.append(f'{p}_stage_duration_seconds_sum{{stage="{name}"}} {stage["sum"]:.6f}')
+            lines.append(f'{p}_stage_duration_seconds_count{{stage="{name}"}} {stage["count"]}')
+        
+        lines.append(f"# HELP {p}_stage_failures_total Stage executions that raised an error.")
+        lines.append(f"# TYPE {p}_stage_failures_total counter")
+        for name, stage in sorted(state['stages'].items()):
+            lines.append(f'{p}_stage_failures_total{{stage="{name}"}} {stage["failures"]}')
+        
+        for key in self.COUNTERS:
+            lines.append(f"# HELP {p}_stage_{key}_total Sum of the '{key}' span attribute per stage.")
+            lines.append(f"# TYPE {p}_stage_{key}_total counter")
+            for name, stage in sorted(state['stages'].items()):
+                if key in stage['counters']:
+                    lines.append(f'{p}_stage_{key}_total{{stage="{name}"}} {stage["counters"][key]}')
+        
+        lines.append(f"# HELP {p}_runs_total Processed jobs by outcome.")
+        lines.append(f"# TYPE {p}_runs_total counter")
+        for status, count in sorted(state['runs'].items()):
+            lines.append(f'{p}_runs_total{{status="{status}"}} {count}')
+        if state.get('last_run'):
+            lines.append(f"# HELP {p}_last_run_timestamp_seconds End time of the last job.")
+            lines.append(f"# TYPE {p}_last_run_timestamp_seconds gauge")
+            lines.append(f"{p}_last_run_timestamp_seconds {state['last_run']:.3f}")
+        return '\n'.join(lines) + '\n'
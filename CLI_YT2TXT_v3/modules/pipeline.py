@@ -0,0 +1,137 @@
+"""
+Pipeline Module
+
+Runs processing stages as a small dependency graph: every stage starts as
+soon as the stages it depends on have finished, so independent stages
+(e.g. network-bound translation and CPU-bound summarization) overlap.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+class StageError(Exception):
+    """Raised by a stage to stop the pipeline with a user-facing message."""
+
+class PipelineError(Exception):
+    """Raised when a stage of the pipeline fails."""
+    
+    def __init__(self, stage, error):
+        """
+        Initialize the pipeline error.
+        
+        Args:
+            stage (str): Name of the failed stage
+            error (Exception): Exception raised by the stage
+        """
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+class Pipeline:
+    """Dependency graph of stages executed on a thread pool."""
+    
+    def __init__(self, max_workers=4, tracer=None):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            max_workers (int): Maximum number of stages running at once
+            tracer (Tracer): Records a span per stage (current in the stage's thread), or None
+        """
+        self.max_workers = max_workers
+        self.tracer = tracer
+        self.stages = {}
+        self.results = {}
+        self.timings = {}
+        self._lock = threading.Lock()
+    
+    def add_stage(self, name, func, depends_on=()):
+        """
+        Add a stage to the graph.
+        
+        The stage function receives the pipeline results dict, which holds
+        the return value of every finished stage under its name.
+        
+        Args:
+            name (str): Unique stage name
+            func (callable): Function taking the results dict
+            depends_on (iterable): Names of stages that must finish first
+        """
+        for dependency in depends_on:
+            if dependency not in self.stages:
+                raise ValueError(f"Unknown dependency '{dependency}' for stage '{name}'")
+        self.stages[name] = (func, tuple(depends_on))
+    
+    def run(self, targets=None):
+        """
+        Run stages, starting each one as soon as its dependencies are done.
+        
+        Args:
+            targets (iterable): Names of the stages wanted, or None for all; only
+                                these and the stages they depend on are run
+        
+        Returns:
+            dict: Stage results keyed by stage name
+        
+        Raises:
+            PipelineError: If a stage raises; stages not yet started are skipped
+        """
+        pending = {name: self.stages[name] for name in self._required(targets)}
+        running = {}
+        failure = None
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if failure is None:
+                    for name in [n for n, (_, deps) in pending.items()
+                                 if all(d in self.results for d in deps)]:
+                        func, _ = pending.pop(name)
+                        running[pool.submit(self._run_stage, name, func)] = name
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        if failure is None:
+                            failure = PipelineError(name, e)
+                        continue
+                    with self._lock:
+                        self.results[name] = result
+        
+        if failure:
+            raise failure
+        return self.results
+    
+    def _required(self, targets):
+        """Return the names of the target stages and everything they depend on."""
+        if targets is None:
+            return list(self.stages)
+        
+        required = set()
+        queue = list(targets)
+        while queue:
+            name = queue.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown target stage '{name}'")
+            if name not in required:
+                required.add(name)
+                queue.extend(self.stages[name][1])
+        # Keep insertion order so stages that are ready together start in it
+        return [name for name in self.stages if name in required]
+    
+    def _run_stage(self, name, func):
+        """Run one stage and record its duration."""
+        started = time.perf_counter()
+        try:
+            if self.tracer:
+                with self.tracer.span(name):
+                    return func(self.results)
+            return func(self.results)
+        finally:
+            self.timings[name] = time.perf_counter() - started
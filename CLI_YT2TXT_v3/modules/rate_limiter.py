@@ -0,0 +1,66 @@
+"""
+Rate Limiter Module
+
+Thread-safe token bucket whose refill rate adapts to the remote service:
+it backs off multiplicatively when requests are throttled and speeds up
+additively while responses stay healthy.
+"""
+
+import threading
+import time
+
+class AdaptiveRateLimiter:
+    """Token bucket with additive-increase / multiplicative-decrease rate control."""
+    
+    def __init__(self, rate=2.0, burst=4, min_rate=0.2, max_rate=10.0,
+                 increase=0.1, decrease=0.5):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            rate (float): Initial requests per second
+            burst (int): Bucket capacity, i.e. requests allowed back to back
+            min_rate (float): Lowest rate the limiter backs off to
+            max_rate (float): Highest rate the limiter speeds up to
+            increase (float): Requests per second added after each success
+            decrease (float): Factor applied to the rate after throttling
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        """Add the tokens accumulated since the last update (caller holds the lock)."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def on_success(self):
+        """Speed up after a healthy response."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+    
+    def on_throttle(self):
+        """Back off after the service reported throttling."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Drain the bucket so queued workers pause instead of bursting again
+            self._tokens = min(self._tokens, 0.0)
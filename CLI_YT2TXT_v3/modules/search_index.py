@@ -0,0 +1,254 @@
+"""
+Search Index Module
+
+Local full-text index over every processed transcript, translation and
+summary, backed by SQLite FTS5. Documents are indexed incrementally as
+they are saved; timed transcript segments are indexed in short windows
+so search hits can point at the moment in the video they come from.
+
+FTS5's unicode61 tokenizer splits words at spaces and punctuation, which
+scripts such as Chinese and Japanese do not use between words. Their
+characters are therefore indexed one token each (separated by zero-width
+spaces), and a query word in those scripts matches as a phrase.
+"""
+
+import os
+import sqlite3
+import threading
+
+from modules.text_chunker import CJK_PATTERN
+
+# Token separator for unicode61 that does not show when the text is displayed
+ZERO_WIDTH_SPACE = '\u200b'
+
+class SearchIndex:
+    """SQLite FTS5 index with ranked search, snippets and timestamp hits."""
+    
+    # Consecutive segments are indexed together in windows of this length (seconds)
+    WINDOW_SECONDS = 30.0
+    # Stored as PRAGMA user_version; older indexes are converted when opened
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, db_path='output/search.db'):
+        """
+        Initialize the search index.
+        
+        Args:
+            db_path (str): SQLite database path
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+                name UNINDEXED, kind UNINDEXED, content,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS windows USING fts5(
+                name UNINDEXED, start UNINDEXED, content,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                name TEXT PRIMARY KEY,
+                video_id TEXT,
+                url TEXT,
+                source_lang TEXT,
+                target_lang TEXT
+            );
+            -- FTS5 can only find rows by rowid without a full scan, so the rowids
+            -- of each run's rows are kept here for re-indexing
+            CREATE TABLE IF NOT EXISTS document_rows (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                UNIQUE (name, kind)
+            );
+            CREATE TABLE IF NOT EXISTS window_rows (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS window_rows_name ON window_rows (name);
+        """)
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] < self.SCHEMA_VERSION:
+            self._upgrade()
+        self.conn.commit()
+    
+    def _upgrade(self):
+        """Re-index the rows of an older index with CJK segmentation and rowid mapping."""
+        documents = self.conn.execute('SELECT name, kind, content FROM documents').fetchall()
+        windows = self.conn.execute('SELECT name, start, content FROM windows').fetchall()
+        self.conn.executescript("""
+            DELETE FROM documents;
+            DELETE FROM windows;
+            DELETE FROM document_rows;
+            DELETE FROM window_rows;
+        """)
+        for name, kind, content in documents:
+            self._insert_document(name, kind, content)
+        for name, start, content in windows:
+            self._insert_window(name, start, content)
+        self.conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+    
+    @staticmethod
+    def _segment(text):
+        """Make every CJK character a token of its own."""
+        return CJK_PATTERN.sub(lambda m: f'{ZERO_WIDTH_SPACE}{m.group()}{ZERO_WIDTH_SPACE}', text)
+    
+    @staticmethod
+    def _unsegment(text):
+        """Remove the separators added by _segment, e.g. from snippets."""
+        return text.replace(ZERO_WIDTH_SPACE, '')
+    
+    def _insert_document(self, name, kind, content):
+        """Insert a document, reusing its rowid when it was indexed before."""
+        row = self.conn.execute('SELECT id FROM document_rows WHERE name = ? AND kind = ?',
+                                (name, kind)).fetchone()
+        if row:
+            rowid = row[0]
+            self.conn.execute('DELETE FROM documents WHERE rowid = ?', (rowid,))
+        else:
+            rowid = self.conn.execute('INSERT INTO document_rows (name, kind) VALUES (?, ?)',
+                                      (name, kind)).lastrowid
+        self.conn.execute('INSERT INTO documents (rowid, name, kind, content) VALUES (?, ?, ?, ?)',
+                          (rowid, name, kind, self._segment(content)))
+    
+    def _insert_window(self, name, start, content):
+        """Insert one segment window of a run."""
+        rowid = self.conn.execute('INSERT INTO window_rows (name) VALUES (?)', (name,)).lastrowid
+        self.conn.execute('INSERT INTO windows (rowid, name, start, content) VALUES (?, ?, ?, ?)',
+                          (rowid, name, start, self._segment(content)))
+    
+    def add_document(self, name, kind, content):
+        """
+        Index (or re-index) one document of a run.
+        
+        Args:
+            name (str): Base name of the run
+            kind (str): Document kind, e.g. 'translated_summary'
+            content (str): Document text
+        """
+        with self._lock:
+            self._insert_document(name, kind, content)
+            self.conn.commit()
+    
+    def add_segments(self, name, segments):
+        """
+        Index the timed segments of a run for timestamp hits.
+        
+        Args:
+            name (str): Base name of the run
+            segments (TranscriptSegments): Timed segments of the original transcript
+        """
+        rows = []
+        window_start, texts = None, []
+        for start, _, text in segments.iter_segments():
+            if window_start is not None and start - window_start >= self.WINDOW_SECONDS:
+                rows.append((name, window_start, ' '.join(texts)))
+                window_start, texts = None, []
+            if window_start is None:
+                window_start = start
+            texts.append(text)
+        if texts:
+            rows.append((name, window_start, ' '.join(texts)))
+        
+        with self._lock:
+            rowids = self.conn.execute('SELECT id FROM window_rows WHERE name = ?',
+                                       (name,)).fetchall()
+            self.conn.executemany('DELETE FROM windows WHERE rowid = ?', rowids)
+            self.conn.execute('DELETE FROM window_rows WHERE name = ?', (name,))
+            for row in rows:
+                self._insert_window(*row)
+            self.conn.commit()
+    
+    def add_run(self, name, metadata):
+        """
+        Record the video a run belongs to.
+        
+        Args:
+            name (str): Base name of the run
+            metadata (dict): Run metadata with video_id, url, source_lang and target_lang
+        """
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO runs (name, video_id, url, source_lang, target_lang) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (name, metadata.get('video_id'), metadata.get('url'),
+                 metadata.get('source_lang'), metadata.get('target_lang'))
+            )
+            self.conn.commit()
+    
+    def search(self, query, limit=10, kinds=None, timestamps=3):
+        """
+        Search the index, best matches first.
+        
+        Args:
+            query (str): Words to search for (all must match); FTS5 syntax is
+                         used as-is when the query contains double quotes
+            limit (int): Maximum number of results
+            kinds (list): Only search these document kinds, or None for all;
+                          'translated_summary' also matches per-language kinds
+                          such as 'translated_summary_de'
+            timestamps (int): Maximum timestamp hits per original transcript
+        
+        Returns:
+            list: Dicts with name, kind, video_id, url, snippet, score and
+                  timestamps (list of (start, snippet) tuples)
+        """
+        match = self._match_expression(query)
+        if not match:
+            return []
+        
+        sql = ("SELECT d.name, d.kind, r.video_id, r.url, "
+               "snippet(documents, 2, '[', ']', '...', 12), bm25(documents) "
+               "FROM documents d LEFT JOIN runs r ON r.name = d.name "
+               "WHERE documents MATCH ?")
+        params = [match]
+        if kinds:
+            sql += f" AND ({' OR '.join(['d.kind = ? OR d.kind GLOB ?'] * len(kinds))})"
+            for kind in kinds:
+                params.extend([kind, f"{kind}_*"])
+        sql += " ORDER BY bm25(documents) LIMIT ?"
+        params.append(limit)
+        
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        
+        results = []
+        for name, kind, video_id, url, snippet, score in rows:
+            hits = []
+            if kind == 'original_transcript' and timestamps:
+                hits = self._timestamp_hits(name, match, timestamps)
+            results.append({'name': name, 'kind': kind, 'video_id': video_id, 'url': url,
+                            'snippet': self._unsegment(snippet), 'score': -score,
+                            'timestamps': hits})
+        return results
+    
+    def _timestamp_hits(self, name, match, limit):
+        """Get the earliest matching segment windows of a run."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT start, snippet(windows, 2, '[', ']', '...', 8) FROM windows "
+                "WHERE windows MATCH ? AND name = ? ORDER BY CAST(start AS REAL) LIMIT ?",
+                (match, name, limit)
+            ).fetchall()
+        return [(float(start), self._unsegment(snippet)) for start, snippet in rows]
+    
+    @classmethod
+    def _match_expression(cls, query):
+        """
+        Turn a plain query into an FTS5 expression matching all of its words.
+        
+        CJK words become phrases of their characters, matching them anywhere
+        in the segmented text.
+        """
+        if '"' in query:
+            return cls._segment(query.strip())
+        return ' '.join(f'"{cls._segment(word)}"' for word in query.split())
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
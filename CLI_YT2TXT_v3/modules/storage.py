@@ -0,0 +1,334 @@
+"""
+Storage Module
+
+Pluggable output storage for processed videos. The 'text' format keeps
+the classic one-file-per-artifact layout; the 'zip' and 'jsonl' formats
+store every artifact of a video (transcript, translation, summaries,
+segment timings and run metadata) as one bundle. All formats register
+their output in a manifest index so lookups never need directory listings,
+and every saved text is added to the full-text search index.
+"""
+
+import io
+import json
+import os
+import sqlite3
+import threading
+import zipfile
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: appends to the bundle log are only serialized within one process
+    fcntl = None
+
+from modules.file_utils import FileUtils
+from modules.search_index import SearchIndex
+
+class Manifest:
+    """SQLite index of every stored run, searchable by video ID."""
+    
+    def __init__(self, db_path='output/manifest.db'):
+        """
+        Initialize the manifest.
+        
+        Args:
+            db_path (str): SQLite database path
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                video_id TEXT,
+                name TEXT NOT NULL,
+                format TEXT NOT NULL,
+                files TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                created TEXT NOT NULL,
+                record_offset INTEGER,
+                record_length INTEGER
+            )
+        """)
+        # Manifests created before records had a position get the columns added
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(runs)')}
+        for column in ('record_offset', 'record_length'):
+            if column not in columns:
+                self.conn.execute(f'ALTER TABLE runs ADD COLUMN {column} INTEGER')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_runs_video ON runs(video_id)')
+        self.conn.commit()
+    
+    def add(self, name, output_format, files, metadata, offset=None, length=None):
+        """
+        Register a stored run.
+        
+        Args:
+            name (str): Base name of the run's output
+            output_format (str): Storage format
+            files (dict): Artifact kind -> path (or bundle path)
+            metadata (dict): Run metadata; 'video_id' is indexed
+            offset (int): Byte offset of the run's record in a shared bundle file
+            length (int): Byte length of that record
+        """
+        with self._lock:
+            self.conn.execute(
+                'INSERT INTO runs (video_id, name, format, files, metadata, created, '
+                'record_offset, record_length) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (metadata.get('video_id'), name, output_format,
+                 json.dumps(files, ensure_ascii=False), json.dumps(metadata, ensure_ascii=False),
+                 datetime.now().isoformat(), offset, length)
+            )
+            self.conn.commit()
+    
+    def find(self, video_id):
+        """
+        Get every stored run of a video, newest first.
+        
+        Args:
+            video_id (str): YouTube video ID
+        
+        Returns:
+            list: Dicts with name, format, files, metadata, created, and the offset
+                  and length of the record in a jsonl bundle file (None otherwise)
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT name, format, files, metadata, created, record_offset, record_length '
+                'FROM runs WHERE video_id = ? ORDER BY id DESC', (video_id,)
+            ).fetchall()
+        return [{'name': name, 'format': output_format, 'files': json.loads(files),
+                 'metadata': json.loads(metadata), 'created': created,
+                 'offset': offset, 'length': length}
+                for name, output_format, files, metadata, created, offset, length in rows]
+
+class OutputStorage:
+    """Stores the artifacts of processed videos in the selected format."""
+    
+    FORMATS = ('text', 'zip', 'jsonl')
+    # Artifacts a run can produce; translated ones get a language suffix with several targets
+    ARTIFACTS = ('original_transcript', 'translated_transcript', 'original_summary',
+                 'translated_summary')
+    
+    def __init__(self, output_format='text', output_dir='output', manifest=None, index=None):
+        """
+        Initialize the storage.
+        
+        Args:
+            output_format (str): 'text', 'zip' or 'jsonl'
+            output_dir (str): Output directory
+            manifest (Manifest): Manifest index, defaults to <output_dir>/manifest.db
+            index (SearchIndex): Full-text index, defaults to <output_dir>/search.db
+        """
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        
+        self.output_format = output_format
+        self.output_dir = output_dir
+        self.file_utils = FileUtils()
+        self.manifest = manifest or Manifest(os.path.join(output_dir, 'manifest.db'))
+        self.index = index or SearchIndex(os.path.join(output_dir, 'search.db'))
+        self._pending = {}
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+    
+    @property
+    def bundled(self):
+        """Whether artifacts are collected into a single bundle per video."""
+        return self.output_format != 'text'
+    
+    def path_for(self, name, kind, extension='txt'):
+        """
+        Get the loose file path of an artifact in the text format.
+        
+        Args:
+            name (str): Base name of the run
+            kind (str): Artifact kind, e.g. 'original_transcript'
+            extension (str): File extension
+        
+        Returns:
+            str: File path
+        """
+        return os.path.join(self.output_dir, f"{name}_{kind}.{extension}")
+    
+    def save(self, name, kind, content):
+        """
+        Store one text artifact.
+        
+        Args:
+            name (str): Base name of the run
+            kind (str): Artifact kind, e.g. 'translated_summary'
+            content (str): Artifact text
+        
+        Returns:
+            str: Path of the written file, or None if the artifact is held for a bundle
+        """
+        self.index.add_document(name, kind, content)
+        if self.bundled:
+            with self._lock:
+                self._pending.setdefault(name, {})[kind] = content
+            return None
+        
+        filepath = self.path_for(name, kind)
+        self.file_utils.save_transcript(content, filepath)
+        with self._lock:
+            self._pending.setdefault(name, {})[kind] = filepath
+        return filepath
+    
+    def save_segments(self, name, segments, subtitles=None):
+        """
+        Store segment timings.
+        
+        Bundles always include the columnar timings; the text format only
+        writes a subtitle file when one is requested.
+        
+        Args:
+            name (str): Base name of the run
+            segments (TranscriptSegments): Timed segments
+            subtitles (str): 'srt' or 'vtt' to also export subtitles, or None
+        """
+        self.index.add_segments(name, segments)
+        if self.bundled:
+            timings = {'offsets': list(segments.offsets), 'starts': list(segments.starts),
+                       'durations': list(segments.durations)}
+            with self._lock:
+                self._pending.setdefault(name, {})['segments'] = timings
+        
+        if not subtitles:
+            return
+        
+        if self.bundled:
+            buffer = io.StringIO()
+            self._write_subtitles(segments, subtitles, buffer)
+            with self._lock:
+                self._pending[name][f'subtitles.{subtitles}'] = buffer.getvalue()
+            return
+        
+        filepath = self.path_for(name, 'original_transcript', subtitles)
+        with self.file_utils.open_writer(filepath, header=False) as f:
+            self._write_subtitles(segments, subtitles, f)
+        print(f"   Saved: {os.path.basename(filepath)}")
+        with self._lock:
+            self._pending.setdefault(name, {})['subtitles'] = filepath
+    
+    @staticmethod
+    def _write_subtitles(segments, subtitles, stream):
+        """Write segments to a stream as SRT or VTT."""
+        if subtitles == 'vtt':
+            segments.write_vtt(stream)
+        else:
+            segments.write_srt(stream)
+    
+    def add_file(self, name, kind, filepath):
+        """
+        Record an artifact that was written directly to disk (e.g. a streamed summary).
+        
+        Args:
+            name (str): Base name of the run
+            kind (str): Artifact kind
+            filepath (str): Path of the written file
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            self.index.add_document(name, kind, f.read())
+        with self._lock:
+            self._pending.setdefault(name, {})[kind] = filepath
+    
+    def finish(self, name, metadata):
+        """
+        Finalize a run: write the bundle (if any) and register it in the manifest.
+        
+        Args:
+            name (str): Base name of the run
+            metadata (dict): Run metadata (video_id, url, model, languages, ...)
+        
+        Returns:
+            dict: Artifact kind -> path of what was written
+        """
+        with self._lock:
+            artifacts = self._pending.pop(name, {})
+        
+        offset = length = None
+        if self.output_format == 'text':
+            files = artifacts
+        elif self.output_format == 'zip':
+            files = {'bundle': self._write_zip(name, artifacts, metadata)}
+        else:
+            filepath, offset, length = self._write_jsonl(name, artifacts, metadata)
+            files = {'bundle': filepath}
+        
+        self.manifest.add(name, self.output_format, files, metadata, offset, length)
+        self.index.add_run(name, metadata)
+        return files
+    
+    def _write_zip(self, name, artifacts, metadata):
+        """Write one compressed archive per video, atomically."""
+        filepath = os.path.join(self.output_dir, 'bundles', f"{name}.zip")
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+                bundle.writestr('metadata.json', json.dumps(metadata, ensure_ascii=False, indent=2))
+                for kind, content in artifacts.items():
+                    if kind == 'segments':
+                        bundle.writestr('segments.json', json.dumps(content))
+                    elif kind.startswith('subtitles.'):
+                        bundle.writestr(f"original_transcript.{kind.split('.', 1)[1]}", content)
+                    else:
+                        bundle.writestr(f"{kind}.txt", content)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            # Like AtomicWriter.discard: never leave a half-written archive behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        print(f"   Saved: {os.path.basename(filepath)}")
+        return filepath
+    
+    def _write_jsonl(self, name, artifacts, metadata):
+        """
+        Append one JSON record per video to the bundle log.
+        
+        Returns:
+            tuple: (bundle log path, byte offset of the record, byte length of the record)
+        """
+        filepath = os.path.join(self.output_dir, 'bundles.jsonl')
+        record = dict(artifacts, name=name, metadata=metadata)
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        
+        # The file lock keeps other processes from appending between locating the end
+        # of the log and writing the record there
+        with self._lock:
+            with open(filepath, 'ab') as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(line)
+                    f.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+        
+        print(f"   Saved: {name} -> {os.path.basename(filepath)}")
+        return filepath, offset, len(line)
+    
+    @staticmethod
+    def read_record(run):
+        """
+        Read the record of a run stored in the jsonl format.
+        
+        Args:
+            run (dict): Manifest entry from Manifest.find()
+        
+        Returns:
+            dict: Record with the run's artifacts, name and metadata
+        """
+        with open(run['files']['bundle'], 'rb') as f:
+            f.seek(run['offset'])
+            return json.loads(f.read(run['length']).decode('utf-8'))
@@ -0,0 +1,147 @@
+"""
+Summary Cache Module
+
+Persistent SQLite store of generated summaries. Entries are keyed by a
+hash of the transcript, the model name and digest, the summary type and
+the prompt version, so a re-pulled model or a changed prompt never
+serves a stale summary.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+class SummaryCache:
+    """Size-capped, persistent cache of LLM summaries."""
+    
+    def __init__(self, db_path='cache/summaries.db', max_bytes=50 * 1024 * 1024):
+        """
+        Initialize the summary cache.
+        
+        Args:
+            db_path (str): SQLite database path
+            max_bytes (int): Total summary size kept before the least recently used are evicted
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                summary_type TEXT,
+                summary TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_summaries_last_used '
+                          'ON summaries(last_used)')
+        self.conn.commit()
+        # Summed once here and kept up to date by put(), so writes never scan the table
+        self._bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM summaries').fetchone()[0]
+    
+    @staticmethod
+    def make_key(text, model_name, model_digest, summary_type, prompt_version, language=None):
+        """
+        Build the cache key of a summary.
+        
+        Args:
+            text (str): Summarized text
+            model_name (str): Ollama model name
+            model_digest (str): Digest of the model weights ('' if unknown)
+            summary_type (str): Summary type
+            prompt_version (int): Version of the summary prompts
+            language (str): Language the summary was written in, None for the text's own
+        
+        Returns:
+            str: Hex digest identifying the summary
+        """
+        text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        payload = f"{model_name}\x00{model_digest}\x00{summary_type}\x00{prompt_version}\x00{text_hash}"
+        if language:
+            payload += f"\x00{language}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        """
+        Look up a summary.
+        
+        Args:
+            key (str): Key built by make_key()
+        
+        Returns:
+            str: Summary or None on a miss
+        """
+        with self._lock:
+            row = self.conn.execute('SELECT summary FROM summaries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self.conn.execute('UPDATE summaries SET last_used = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+            return row[0]
+    
+    def put(self, key, summary, model_name=None, summary_type=None):
+        """
+        Store a summary.
+        
+        Args:
+            key (str): Key built by make_key()
+            summary (str): Generated summary
+            model_name (str): Model name, kept for inspection
+            summary_type (str): Summary type, kept for inspection
+        """
+        size = len(summary.encode('utf-8'))
+        with self._lock:
+            row = self.conn.execute('SELECT size FROM summaries WHERE key = ?', (key,)).fetchone()
+            self.conn.execute(
+                'INSERT OR REPLACE INTO summaries (key, model, summary_type, summary, size, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model_name, summary_type, summary, size, time.time())
+            )
+            self._bytes += size - (row[0] if row else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+    
+    def _evict(self):
+        """Delete least recently used entries beyond max_bytes (caller holds the lock)."""
+        stale = []
+        for key, size in self.conn.execute('SELECT key, size FROM summaries ORDER BY last_used ASC'):
+            if self._bytes <= self.max_bytes:
+                break
+            stale.append((key,))
+            self._bytes -= size
+        self.conn.executemany('DELETE FROM summaries WHERE key = ?', stale)
+    
+    def stats(self):
+        """
+        Get cache usage statistics.
+        
+        Returns:
+            dict: Hit and miss counters, stored entry count and total size in bytes
+        """
+        with self._lock:
+            entries, size = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM summaries'
+            ).fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries, 'bytes': size}
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
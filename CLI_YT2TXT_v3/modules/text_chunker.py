@@ -0,0 +1,162 @@
+"""
+Text Chunker Module
+
+Splits long texts into size-bounded chunks for the translator and the
+LLM in a single linear pass. Sentence boundaries are script aware: Latin
+sentence ends followed by whitespace, CJK full stops, question and
+exclamation marks, and - for auto-captions without punctuation - pauses
+between timed transcript segments. Chunks are sized in characters or in
+estimated tokens and are produced lazily.
+"""
+
+import heapq
+import re
+
+# Characters of scripts written without spaces, roughly one token each
+CJK_PATTERN = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af'
+                         r'\uf900-\ufaff\uff01-\uff60]')
+# Latin/Cyrillic sentence ends need trailing whitespace; CJK ones do not
+SENTENCE_END_PATTERN = re.compile(r'[.!?;\u2026](?=\s)|[\u3002\uff01\uff1f\uff1b\uff61]')
+
+class TextChunker:
+    """Splits text into chunks of at most max_size characters or estimated tokens."""
+    
+    # Characters per token for text outside CJK_PATTERN
+    CHARS_PER_TOKEN = 4
+    # Silence between two segments, in seconds, that counts as a sentence boundary
+    PAUSE_SECONDS = 1.5
+    
+    def __init__(self, max_size=4500, unit='chars'):
+        """
+        Initialize the chunker.
+        
+        Args:
+            max_size (int): Maximum chunk size
+            unit (str): 'chars' to size chunks by characters, 'tokens' by estimated tokens
+        """
+        if unit not in ('chars', 'tokens'):
+            raise ValueError(f"Unknown chunk unit: {unit}")
+        self.max_size = max(1, int(max_size))
+        self.unit = unit
+    
+    @classmethod
+    def estimate_tokens(cls, text):
+        """
+        Estimate the number of LLM tokens in a text.
+        
+        CJK characters count as one token each, everything else as
+        CHARS_PER_TOKEN characters per token.
+        
+        Args:
+            text (str): Text to measure
+        
+        Returns:
+            int: Estimated token count
+        """
+        cjk = len(text) - len(CJK_PATTERN.sub('', text))
+        return cjk + (len(text) - cjk + cls.CHARS_PER_TOKEN - 1) // cls.CHARS_PER_TOKEN
+    
+    def size(self, text):
+        """Return the size of a text in this chunker's unit."""
+        return len(text) if self.unit == 'chars' else self.estimate_tokens(text)
+    
+    def split(self, text, segments=None):
+        """
+        Split text into a list of chunks (see iter_chunks).
+        
+        Returns:
+            list: Text chunks
+        """
+        return list(self.iter_chunks(text, segments))
+    
+    def iter_chunks(self, text, segments=None):
+        """
+        Yield the chunks of a text in order.
+        
+        Each chunk ends at the last sentence boundary that keeps it within
+        max_size. A sentence longer than max_size is cut at whitespace, or
+        anywhere for text without spaces.
+        
+        Args:
+            text (str): Text to split
+            segments (TranscriptSegments): Timed segments the text was built from;
+                                           pauses between them become boundaries
+        
+        Yields:
+            str: Stripped, non-empty chunks
+        """
+        if not text:
+            return
+        if self.size(text) <= self.max_size:
+            if text.strip():
+                yield text.strip()
+            return
+        
+        chunk_start = 0
+        chunk_size = 0
+        previous = 0
+        for boundary in self._boundaries(text, segments):
+            if boundary <= previous:
+                continue
+            sentence_size = self.size(text[previous:boundary])
+            if chunk_size + sentence_size > self.max_size and chunk_size:
+                yield from self._emit(text, chunk_start, previous)
+                chunk_start, chunk_size = previous, 0
+            if sentence_size > self.max_size:
+                # Oversized sentence: flush it in pieces and start after it
+                yield from self._hard_split(text, previous, boundary)
+                chunk_start, chunk_size = boundary, 0
+            else:
+                chunk_size += sentence_size
+            previous = boundary
+        yield from self._emit(text, chunk_start, len(text))
+    
+    def _boundaries(self, text, segments):
+        """Yield sentence boundary offsets in ascending order, ending with len(text)."""
+        ends = (match.end() for match in SENTENCE_END_PATTERN.finditer(text))
+        pauses = self._pause_offsets(text, segments)
+        yield from heapq.merge(ends, pauses)
+        yield len(text)
+    
+    def _pause_offsets(self, text, segments):
+        """Yield offsets in text where a segment starts after a long pause."""
+        if segments is None or len(segments) < 2:
+            return
+        # The text may be the segment text with surrounding whitespace stripped
+        source = segments.text
+        if source == text:
+            shift = 0
+        elif source.strip() == text:
+            shift = len(source) - len(source.lstrip())
+        else:
+            return
+        
+        starts, durations, offsets = segments.starts, segments.durations, segments.offsets
+        for i in range(1, len(starts)):
+            if starts[i] - (starts[i - 1] + durations[i - 1]) >= self.PAUSE_SECONDS:
+                offset = offsets[i] - shift
+                if 0 < offset < len(text):
+                    yield offset
+    
+    def _emit(self, text, start, end):
+        """Yield text[start:end] stripped, unless it is blank."""
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+    
+    def _hard_split(self, text, start, end):
+        """Yield pieces of an oversized sentence, preferring cuts at whitespace."""
+        piece = text[start:end]
+        # Characters per piece; in token mode scaled by the sentence's own density
+        limit = self.max_size
+        if self.unit == 'tokens':
+            limit = max(1, self.max_size * len(piece) // max(1, self.estimate_tokens(piece)))
+        
+        position = 0
+        while len(piece) - position > limit:
+            cut = piece.rfind(' ', position + 1, position + limit + 1)
+            if cut <= position:
+                cut = position + limit
+            yield from self._emit(piece, position, cut)
+            position = cut
+        yield from self._emit(piece, position, len(piece))
@@ -0,0 +1,218 @@
+"""
+Tracing Module
+
+Structured spans for the processing stages. Every span records its
+duration, its parent and free-form attributes (character and byte
+counts, retries, cache hits, ...). A finished trace is written as a
+Chrome trace-event JSON file, which chrome://tracing and Perfetto can
+open, and can be fed to a PrometheusTextfile for fleet-wide metrics.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+
+class Span:
+    """One timed operation within a trace."""
+    
+    def __init__(self, tracer, name, span_id, parent_id, attributes):
+        """
+        Initialize the span (use Tracer.span() or Span.child() instead).
+        
+        Args:
+            tracer (Tracer): Trace the span belongs to
+            name (str): Span name, e.g. 'translate_batch'
+            span_id (int): Span ID, unique within the trace
+            parent_id (int): ID of the parent span, or None for a root span
+            attributes (dict): Initial attributes
+        """
+        self.tracer = tracer
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.thread = threading.current_thread().name
+        self.start = time.time()
+        self.duration = None
+        self.error = None
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def set(self, **attributes):
+        """Set attributes of the span."""
+        with self._lock:
+            self.attributes.update(attributes)
+    
+    def add(self, key, amount=1):
+        """
+        Increment a counter attribute (e.g. 'retries' or 'cache_hits').
+        
+        Args:
+            key (str): Attribute name
+            amount (int): Increment
+        """
+        with self._lock:
+            self.attributes[key] = self.attributes.get(key, 0) + amount
+    
+    def count_text(self, text, prefix=''):
+        """
+        Record the character and UTF-8 byte counts of a text.
+        
+        Args:
+            text (str): Text handled by the span
+            prefix (str): Attribute name prefix, e.g. 'output_'
+        """
+        text = text or ''
+        self.set(**{f'{prefix}chars': len(text), f'{prefix}bytes': len(text.encode('utf-8'))})
+    
+    def child(self, name, **attributes):
+        """
+        Open a span nested under this one, from any thread.
+        
+        Args:
+            name (str): Span name
+            **attributes: Initial attributes
+        
+        Returns:
+            context manager: Yields the child Span
+        """
+        return self.tracer.span(name, parent=self, **attributes)
+    
+    def end(self, error=None):
+        """Finish the span, recording the error that ended it, if any."""
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+    
+    def to_dict(self):
+        """Return the span as a plain dict."""
+        with self._lock:
+            attributes = dict(self.attributes)
+        return {'name': self.name, 'span_id': self.span_id, 'parent_id': self.parent_id,
+                'thread': self.thread, 'start': self.start, 'duration': self.duration,
+                'error': self.error, 'attributes': attributes}
+
+class NullSpan:
+    """Span stand-in used when tracing is off; every method is a no-op."""
+    
+    def set(self, **attributes):
+        pass
+    
+    def add(self, key, amount=1):
+        pass
+    
+    def count_text(self, text, prefix=''):
+        pass
+    
+    def child(self, name, **attributes):
+        return contextlib.nullcontext(self)
+
+NULL_SPAN = NullSpan()
+
+class Tracer:
+    """Collects the spans of one job."""
+    
+    def __init__(self, trace_id, **attributes):
+        """
+        Initialize the tracer.
+        
+        Args:
+            trace_id (str): Identifier of the traced job
+            **attributes: Job-level attributes stored with the trace (url, model, ...)
+        """
+        self.trace_id = trace_id
+        self.attributes = attributes
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def current(self):
+        """
+        Get the innermost open span of the calling thread.
+        
+        Returns:
+            Span: Current span, or NULL_SPAN outside of any span
+        """
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else NULL_SPAN
+    
+    @contextlib.contextmanager
+    def span(self, name, parent=None, **attributes):
+        """
+        Time a block of code as a span.
+        
+        Args:
+            name (str): Span name
+            parent (Span): Parent span; defaults to the current span of this thread
+            **attributes: Initial attributes
+        
+        Yields:
+            Span: The open span
+        """
+        if parent is None:
+            current = self.current()
+            parent = current if isinstance(current, Span) else None
+        with self._lock:
+            span_id = next(self._ids)
+        span = Span(self, name, span_id, parent.span_id if parent else None, attributes)
+        
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(e)
+            raise
+        else:
+            span.end()
+        finally:
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+    
+    def write_trace(self, filepath):
+        """
+        Write the finished spans as a Chrome trace-event JSON file.
+        
+        Args:
+            filepath (str): Output path
+        
+        Returns:
+            str: Path of the written trace or None if failed
+        """
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+        origin = min((span['start'] for span in spans), default=0.0)
+        threads = {}
+        events = []
+        
+        for span in sorted(spans, key=lambda s: s['start']):
+            tid = threads.setdefault(span['thread'], len(threads) + 1)
+            args = dict(span['attributes'], span_id=span['span_id'], parent_id=span['parent_id'])
+            if span['error']:
+                args['error'] = span['error']
+            events.append({'name': span['name'], 'cat': 'stage', 'ph': 'X', 'pid': 1,
+                           'tid': tid, 'ts': round((span['start'] - origin) * 1e6),
+                           'dur': round((span['duration'] or 0.0) * 1e6), 'args': args})
+        for thread, tid in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                           'args': {'name': thread}})
+        
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms',
+                 'otherData': dict(self.attributes, trace_id=self.trace_id)}
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, ensure_ascii=False)
+            os.replace(tmp_path, filepath)
+            return filepath
+        except OSError as e:
+            print(f"Error writing trace: {str(e)}")
+            return None
@@ -0,0 +1,188 @@
+"""
+Transcript Cache Module
+
+Persistent on-disk cache for raw YouTube transcript segments, keyed by
+video ID and track language, and for the list of caption tracks of each
+video. Entries are stored as gzip-compressed JSON, expire after a TTL and
+are evicted least-recently-used first once the cache grows past its size
+limit.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+class TranscriptCache:
+    """Content-addressed, size-bounded cache of transcript segment lists."""
+    
+    # Pseudo track language under which a video's caption track list is stored
+    TRACKS_KEY = '__tracks__'
+    
+    def __init__(self, cache_dir='cache/transcripts', ttl=7 * 24 * 3600,
+                 max_bytes=200 * 1024 * 1024, tracks_ttl=24 * 3600):
+        """
+        Initialize the transcript cache.
+        
+        Args:
+            cache_dir (str): Directory holding cache entries
+            ttl (float): Seconds before an entry expires (None disables expiry)
+            max_bytes (int): Total size limit before LRU eviction kicks in
+            tracks_ttl (float): Seconds before a track list expires; shorter, since
+                                creators add subtitles after upload
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.tracks_ttl = tracks_ttl
+        self.max_bytes = max_bytes
+        # Size of all entries, measured on the first write and then kept up to date, so
+        # writes only walk the cache directory when eviction is due
+        self._total = None
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _path(self, video_id, language):
+        """Return the entry path for a video and track language."""
+        key = hashlib.sha256(f"{video_id}:{language}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json.gz")
+    
+    def get(self, video_id, language='default', ignore_ttl=False):
+        """
+        Look up cached segments.
+        
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Track language code
+            ignore_ttl (bool): Return expired entries too (used in offline mode)
+        
+        Returns:
+            list: Transcript segments or None on a miss
+        """
+        return self._read(video_id, language, None if ignore_ttl else self.ttl)
+    
+    def get_tracks(self, video_id, ignore_ttl=False):
+        """
+        Look up the cached caption track list of a video.
+        
+        Args:
+            video_id (str): YouTube video ID
+            ignore_ttl (bool): Return expired entries too (used in offline mode)
+        
+        Returns:
+            list: Track dicts as stored by put_tracks(), or None on a miss
+        """
+        return self._read(video_id, self.TRACKS_KEY, None if ignore_ttl else self.tracks_ttl)
+    
+    def put_tracks(self, video_id, tracks):
+        """
+        Store the caption track list of a video.
+        
+        Args:
+            video_id (str): YouTube video ID
+            tracks (list): Track dicts (see TranscriptDownloader.list_tracks)
+        """
+        self.put(video_id, tracks, self.TRACKS_KEY)
+    
+    def _read(self, video_id, language, ttl):
+        """Read an entry's segments, or None if it is missing or older than ttl seconds."""
+        path = self._path(video_id, language)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if ttl is not None and time.time() - entry['stored'] > ttl:
+            return None
+        
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry['segments']
+    
+    def put(self, video_id, segments, language='default'):
+        """
+        Store segments for a video and track language.
+        
+        Args:
+            video_id (str): YouTube video ID
+            segments (list): Raw segment dicts as returned by the API
+            language (str): Track language code
+        """
+        path = self._path(video_id, language)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        entry = {'video_id': video_id, 'language': language,
+                 'stored': time.time(), 'segments': segments}
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing transcript cache: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan()[1]
+            else:
+                self._total += size - replaced
+            over_limit = self._total > self.max_bytes
+        if over_limit:
+            self._evict()
+    
+    def _scan(self):
+        """
+        List every entry (caller holds the lock).
+        
+        Returns:
+            tuple: (list of (mtime, size, path), total size in bytes)
+        """
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json.gz'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+    
+    def _evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            # Measured again, which also picks up entries written by other processes
+            entries, total = self._scan()
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self._total = total
+    
+    def clear(self):
+        """Remove every cache entry."""
+        with self._lock:
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith('.json.gz'):
+                        os.remove(os.path.join(root, name))
+            self._total = 0
@@ -1,18 +1,29 @@
 """
 Transcript Downloader Module
 
-Handles downloading transcripts from YouTube videos using youtube-transcript-api.
+Handles downloading transcripts from YouTube videos using youtube-transcript-api,
+including YouTube's own caption tracks in a target language (manually created
+or auto-translated by YouTube), which spare the machine translation.
 """
 
-from youtube_transcript_api import YouTubeTranscriptApi
 import re
 
+from modules.transcript_segments import TranscriptSegments
+from modules.tracing import NULL_SPAN
+
 class TranscriptDownloader:
     """Downloads transcripts from YouTube videos."""
     
-    def __init__(self):
-        """Initialize the transcript downloader."""
-        pass
+    def __init__(self, cache=None, offline=False):
+        """
+        Initialize the transcript downloader.
+        
+        Args:
+            cache (TranscriptCache): Transcript cache, or None to disable caching
+            offline (bool): Serve transcripts from the cache only, never hit the network
+        """
+        self.cache = cache
+        self.offline = offline
     
     def extract_video_id(self, url):
         """
@@ -36,16 +47,35 @@ class TranscriptDownloader:
         
         return None
     
-    def download_transcript(self, url):
+    def download_transcript(self, url, language=None):
         """
         Download transcript from YouTube video.
         
         Args:
             url (str): YouTube video URL
+            language (str): Transcript track language, or None for the default track
             
         Returns:
             str: Full transcript text or None if failed
         """
+        segments = self.download_segments(url, language)
+        if segments is None:
+            return None
+        
+        return segments.text.strip()
+    
+    def download_segments(self, url, language=None, span=NULL_SPAN):
+        """
+        Download the timed transcript segments of a YouTube video.
+        
+        Args:
+            url (str): YouTube video URL
+            language (str): Transcript track language, or None for the default track
+            span (Span): Trace span receiving cache hits and sizes
+        
+        Returns:
+            TranscriptSegments: Segments with timings or None if failed
+        """
         try:
             # Extract video ID
             video_id = self.extract_video_id(url)
@@ -53,13 +83,179 @@ class TranscriptDownloader:
                 raise ValueError("Invalid YouTube URL")
             
             # Get transcript
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+            transcript_list = self._get_segments(video_id, language, span)
             
-            # Combine all transcript segments
-            full_transcript = ' '.join([entry['text'] for entry in transcript_list])
+            # Keep text and timings in compact columnar form
+            segments = TranscriptSegments.from_segments(transcript_list)
+            span.set(segments=len(segments))
+            span.count_text(segments.text)
+            return segments
+        
+        except Exception as e:
+            print(f"Error downloading transcript: {str(e)}")
+            return None
+    
+    def list_tracks(self, url, span=NULL_SPAN):
+        """
+        List the caption tracks of a YouTube video, from the cache when possible.
+        
+        Args:
+            url (str): YouTube video URL
+            span (Span): Trace span receiving cache hits
+        
+        Returns:
+            list: Track dicts with language_code, language, is_generated, is_translatable
+                  and translation_languages (codes); empty if they cannot be listed
+        """
+        try:
+            video_id = self.extract_video_id(url)
+            if not video_id:
+                raise ValueError("Invalid YouTube URL")
             
-            return full_transcript.strip()
+            if self.cache:
+                tracks = self.cache.get_tracks(video_id, ignore_ttl=self.offline)
+                if tracks is not None:
+                    span.add('cache_hits')
+                    return tracks
+            if self.offline:
+                return []
             
+            from youtube_transcript_api import YouTubeTranscriptApi
+            
+            tracks = [{'language_code': track.language_code,
+                       'language': track.language,
+                       'is_generated': track.is_generated,
+                       'is_translatable': track.is_translatable,
+                       'translation_languages': [entry['language_code'] for entry
+                                                 in track.translation_languages]}
+                      for track in YouTubeTranscriptApi.list_transcripts(video_id)]
+            if self.cache:
+                self.cache.put_tracks(video_id, tracks)
+            span.set(tracks=len(tracks))
+            return tracks
+        
         except Exception as e:
-            print(f"Error downloading transcript: {str(e)}")
-            return None
\ No newline at end of file
+            print(f"Warning: Could not list caption tracks: {str(e)}")
+            return []
+    
+    def download_track(self, url, language, tracks=None, span=NULL_SPAN):
+        """
+        Download YouTube's own captions of a video in a language.
+        
+        A manually created track in the language is preferred, then a track
+        YouTube auto-translates into it (from a manual source track if there
+        is one, otherwise from the automatic captions).
+        
+        Args:
+            url (str): YouTube video URL
+            language (str): Language code, e.g. 'de'
+            tracks (list): Tracks from list_tracks(), or None to list them now
+            span (Span): Trace span receiving the track kind, cache hits and sizes
+        
+        Returns:
+            tuple: (TranscriptSegments, 'manual' or 'translated'), or (None, None) if
+                   the video has no usable track in the language
+        """
+        if tracks is None:
+            tracks = self.list_tracks(url, span)
+        choice = self._choose_track(tracks, language)
+        if choice is None:
+            return None, None
+        
+        kind, track, target_code = choice
+        source_code = track['language_code']
+        try:
+            video_id = self.extract_video_id(url)
+            cache_key = (f"manual:{source_code}" if kind == 'manual'
+                         else f"translated:{source_code}>{target_code}")
+            if self.cache:
+                raw = self.cache.get(video_id, cache_key, ignore_ttl=self.offline)
+                if raw is not None:
+                    span.add('cache_hits')
+                    return self._track_segments(raw, kind, span), kind
+            if self.offline:
+                return None, None
+            
+            from youtube_transcript_api import YouTubeTranscriptApi
+            
+            # Listing again is cheaper than keeping every video's live track objects around
+            source = next(live for live in YouTubeTranscriptApi.list_transcripts(video_id)
+                          if live.language_code == source_code
+                          and live.is_generated == track['is_generated'])
+            raw = (source.translate(target_code) if kind == 'translated' else source).fetch()
+            if self.cache:
+                self.cache.put(video_id, raw, cache_key)
+            return self._track_segments(raw, kind, span), kind
+        
+        except Exception as e:
+            print(f"Warning: Could not download the {language} caption track: {str(e)}")
+            return None, None
+    
+    def _choose_track(self, tracks, language):
+        """
+        Pick the best caption track in a language.
+        
+        Args:
+            tracks (list): Tracks from list_tracks()
+            language (str): Language code
+        
+        Returns:
+            tuple: (kind, source track dict, target code), or None if there is no track
+        """
+        def matches(code):
+            # YouTube uses regional codes such as 'pt-BR' or 'zh-Hans'
+            return code.split('-')[0].lower() == language
+        
+        for track in tracks:
+            if not track['is_generated'] and matches(track['language_code']):
+                return 'manual', track, track['language_code']
+        
+        # Manual source tracks first: they translate better than speech recognition output
+        for track in sorted(tracks, key=lambda track: track['is_generated']):
+            if not track['is_translatable']:
+                continue
+            for code in track['translation_languages']:
+                if matches(code):
+                    return 'translated', track, code
+        return None
+    
+    def _track_segments(self, raw, kind, span):
+        """Convert fetched track segments and record them on span."""
+        segments = TranscriptSegments.from_segments(raw)
+        span.set(caption_track=kind, segments=len(segments))
+        span.count_text(segments.text)
+        return segments
+    
+    def _get_segments(self, video_id, language, span=NULL_SPAN):
+        """
+        Get raw transcript segments, from the cache when possible.
+        
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript track language or None
+            span (Span): Trace span receiving cache hits
+        
+        Returns:
+            list: Transcript segment dicts
+        """
+        cache_key = language or 'default'
+        if self.cache:
+            segments = self.cache.get(video_id, cache_key, ignore_ttl=self.offline)
+            if segments is not None:
+                span.add('cache_hits')
+                return segments
+        
+        if self.offline:
+            raise LookupError(f"Transcript for {video_id} is not cached (offline mode)")
+        
+        # Imported here so cache hits and offline runs never load the API client
+        from youtube_transcript_api import YouTubeTranscriptApi
+        
+        if language:
+            segments = YouTubeTranscriptApi.get_transcript(video_id, languages=[language])
+        else:
+            segments = YouTubeTranscriptApi.get_transcript(video_id)
+        
+        if self.cache:
+            self.cache.put(video_id, segments, cache_key)
+        return segments
@@ -0,0 +1,193 @@
+"""
+Transcript Normalizer Module
+
+Cleans auto-generated captions before they reach the translator and the
+LLM: removes non-speech tags such as [Music], drops the words a rolling
+caption repeats from its previous line, collapses stuttered words and
+phrases, strips the filler words of the transcript's language and
+restores sentence ends at pauses. Segment timings are kept.
+"""
+
+import re
+from array import array
+
+from modules.text_chunker import SENTENCE_END_PATTERN, TextChunker
+from modules.tracing import NULL_SPAN
+from modules.transcript_segments import TranscriptSegments
+
+# Hesitation sounds per language; none of them is an ordinary word
+DEFAULT_FILLERS = {
+    'en': ['uh', 'uhh', 'um', 'umm', 'uhm', 'erm', 'hmm', 'mm', 'mhm'],
+    'de': ['äh', 'ähm', 'öh', 'öhm', 'hm'],
+    'fr': ['euh', 'heu', 'hum'],
+    'es': ['eh', 'ehm', 'mmm'],
+    'it': ['ehm', 'mmh'],
+    'pt': ['hã', 'hum', 'éh'],
+    'pl': ['yyy', 'eee', 'yhm'],
+    'ru': ['эм', 'ээ', 'хм'],
+    'ja': ['えー', 'えーと', 'えっと', 'あのー'],
+    'ko': ['음', '어어'],
+    'zh': ['呃', '嗯']
+}
+
+# A few words of letters only, as in [Music], [Música], (laughs) or [background noise]
+CUE_TEXT = r"[^\W\d_]+(?:[ '-][^\W\d_]+){0,4}"
+# Bracketed cues, music notes and '>>' speaker-change marks. Brackets holding digits or
+# symbols ('[1, 2, 3]') or attached to a word ('f(x)') are speech and are kept.
+NON_SPEECH_PATTERN = re.compile(rf'(?<!\w)(?:\[{CUE_TEXT}\]|\({CUE_TEXT}\))|[♪♫]+|&gt;&gt;|>>')
+# A word said three or more times in a row, or a phrase of 2-4 words said twice or more
+REPEATED_WORD_PATTERN = re.compile(r'\b(\w+)(?:\s+\1\b){2,}', re.IGNORECASE)
+REPEATED_PHRASE_PATTERN = re.compile(r'\b(\w+(?:\s+\w+){1,3})(?:\s+\1\b)+', re.IGNORECASE)
+WORD_PATTERN = re.compile(r'\w+')
+# Punctuation that may already end a segment
+TRAILING_PUNCTUATION = '.!?;:,…。！？；：、'
+
+class TranscriptNormalizer:
+    """Removes caption noise from transcript segments."""
+    
+    # Below this many sentence ends per segment a transcript counts as unpunctuated
+    PUNCTUATED_RATIO = 0.05
+    
+    def __init__(self, fillers=None, remove_tags=True, collapse_repeats=True,
+                 strip_fillers=True, repunctuate=True):
+        """
+        Initialize the normalizer.
+        
+        Args:
+            fillers (dict): Extra filler words per language code, added to DEFAULT_FILLERS
+            remove_tags (bool): Remove non-speech tags such as [Music]
+            collapse_repeats (bool): Drop rolling caption overlaps and stuttered repeats
+            strip_fillers (bool): Remove filler words
+            repunctuate (bool): End sentences at pauses in unpunctuated transcripts
+        """
+        self.remove_tags = remove_tags
+        self.collapse_repeats = collapse_repeats
+        self.repunctuate = repunctuate
+        
+        # Filler words per language; a word that is a filler in one language may be
+        # an ordinary word in another ('hum' in English), so only one list applies
+        self.fillers = {}
+        if strip_fillers:
+            for language_fillers in (DEFAULT_FILLERS, fillers or {}):
+                for language, values in language_fillers.items():
+                    self.fillers.setdefault(language, set()).update(word.lower() for word in values)
+        self._filler_patterns = {}
+    
+    def _filler_pattern(self, language):
+        """
+        Get the filler pattern of a language, compiled on first use.
+        
+        Args:
+            language (str): Language code, e.g. 'en' or 'zh-cn', or None
+        
+        Returns:
+            tuple: (compiled pattern, set of the fillers' first words), or (None, None)
+                   if the language has no fillers
+        """
+        language = (language or '').split('-')[0].lower()
+        if language not in self._filler_patterns:
+            words = self.fillers.get(language)
+            entry = (None, None)
+            if words:
+                alternatives = '|'.join(re.escape(word)
+                                        for word in sorted(words, key=len, reverse=True))
+                # First word of every filler; segments without any of them skip the regex
+                heads = {WORD_PATTERN.findall(word)[0] for word in words if WORD_PATTERN.search(word)}
+                entry = (re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)[,.]?', re.IGNORECASE), heads)
+            self._filler_patterns[language] = entry
+        return self._filler_patterns[language]
+    
+    def normalize(self, segments, language=None, span=NULL_SPAN):
+        """
+        Normalize transcript segments.
+        
+        Segments left empty are dropped; the timings of the others are kept.
+        
+        Args:
+            segments (TranscriptSegments): Downloaded segments
+            language (str): Language code of the transcript, selecting the filler words
+                            to strip; None strips none
+            span (Span): Trace span receiving the input, output and removed character counts
+        
+        Returns:
+            TranscriptSegments: Normalized segments
+        """
+        filler_pattern, filler_heads = self._filler_pattern(language)
+        texts = [self._clean(segments.text_at(i), filler_pattern, filler_heads)
+                 for i in range(len(segments))]
+        if self.collapse_repeats:
+            texts = self._drop_overlaps(texts)
+        
+        # Filter the timing columns directly instead of building a dict per segment
+        kept = [i for i, text in enumerate(texts) if text]
+        texts = [texts[i] for i in kept]
+        starts = array('d', (segments.starts[i] for i in kept))
+        durations = array('d', (segments.durations[i] for i in kept))
+        if self.repunctuate and self._is_unpunctuated(texts):
+            self._add_sentence_ends(texts, starts, durations)
+        
+        normalized = TranscriptSegments.from_columns(texts, starts, durations)
+        span.count_text(segments.text)
+        span.count_text(normalized.text, prefix='output_')
+        span.set(removed_chars=len(segments.text) - len(normalized.text),
+                 removed_segments=len(segments) - len(normalized))
+        return normalized
+    
+    def _clean(self, text, filler_pattern=None, filler_heads=None):
+        """Clean one segment's text."""
+        if self.remove_tags:
+            text = NON_SPEECH_PATTERN.sub(' ', text)
+        # Fillers and repeats are rare; cheap word checks skip the costly patterns
+        words = WORD_PATTERN.findall(text.lower())
+        if filler_pattern and not filler_heads.isdisjoint(words):
+            text = filler_pattern.sub(' ', text)
+        if self.collapse_repeats and len(set(words)) < len(words):
+            text = REPEATED_PHRASE_PATTERN.sub(r'\1', text)
+            text = REPEATED_WORD_PATTERN.sub(r'\1', text)
+        return ' '.join(text.split())
+    
+    def _drop_overlaps(self, texts):
+        """Remove the words each rolling caption line repeats from the line before."""
+        result = []
+        previous = []
+        for text in texts:
+            words = text.split()
+            lowered = text.lower().split()
+            if lowered and lowered == previous:
+                result.append('')
+                continue
+            
+            # Longest prefix of this line that ends the previous one (at least two words)
+            overlap = 0
+            if len(lowered) > 1 and lowered[0] in previous:
+                for size in range(min(len(lowered), len(previous)), 1, -1):
+                    if lowered[:size] == previous[-size:]:
+                        overlap = size
+                        break
+            result.append(' '.join(words[overlap:]))
+            if lowered:
+                previous = lowered
+        return result
+    
+    def _is_unpunctuated(self, texts):
+        """Check whether a transcript lacks sentence punctuation (typical of auto-captions)."""
+        if not texts:
+            return False
+        ends = sum(len(SENTENCE_END_PATTERN.findall(text + ' ')) for text in texts)
+        return ends < len(texts) * self.PUNCTUATED_RATIO
+    
+    def _add_sentence_ends(self, texts, starts, durations):
+        """End a sentence at every long pause and at the end of the transcript (in place)."""
+        for i, text in enumerate(texts):
+            is_last = i + 1 == len(texts)
+            if not is_last:
+                pause = starts[i + 1] - (starts[i] + durations[i])
+                if pause < TextChunker.PAUSE_SECONDS:
+                    continue
+            
+            if text[-1] not in TRAILING_PUNCTUATION:
+                # Japanese and Chinese take an ideographic full stop
+                texts[i] = text + ('。' if '\u3040' <= text[-1] <= '\u9fff' else '.')
+            if not is_last:
+                following = texts[i + 1]
+                texts[i + 1] = following[0].upper() + following[1:]
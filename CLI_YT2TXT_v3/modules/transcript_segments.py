@@ -0,0 +1,187 @@
+"""
+Transcript Segments Module
+
+Compact, array-backed storage for timed transcript segments. All segment
+texts live in a single string buffer; per-segment data is kept in typed
+arrays (character offsets, start times and durations) instead of a list
+of dicts, which keeps multi-hour transcripts small in memory.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+class TranscriptSegments:
+    """Columnar store of transcript segments with time-based access."""
+    
+    def __init__(self, text='', offsets=None, starts=None, durations=None):
+        """
+        Initialize the segment store.
+        
+        Args:
+            text (str): All segment texts joined by single spaces
+            offsets (array): Start offset of each segment in text, plus the end offset
+            starts (array): Start time of each segment in seconds
+            durations (array): Duration of each segment in seconds
+        """
+        self.text = text
+        self.offsets = offsets if offsets is not None else array('I', [0])
+        self.starts = starts if starts is not None else array('d')
+        self.durations = durations if durations is not None else array('d')
+    
+    @classmethod
+    def from_segments(cls, segments):
+        """
+        Build the store from API segment dicts.
+        
+        Args:
+            segments (iterable): Dicts with 'text', 'start' and 'duration'
+        
+        Returns:
+            TranscriptSegments: Columnar segments
+        """
+        texts = []
+        offsets = array('I')
+        starts = array('d')
+        durations = array('d')
+        position = 0
+        
+        for segment in segments:
+            text = segment['text']
+            offsets.append(position)
+            starts.append(float(segment.get('start', 0.0)))
+            durations.append(float(segment.get('duration', 0.0)))
+            texts.append(text)
+            position += len(text) + 1
+        
+        offsets.append(max(position - 1, 0))
+        return cls(' '.join(texts), offsets, starts, durations)
+    
+    @classmethod
+    def from_columns(cls, texts, starts, durations):
+        """
+        Build the store from parallel per-segment columns.
+        
+        Args:
+            texts (list): Segment texts
+            starts (array): Start time of each segment in seconds
+            durations (array): Duration of each segment in seconds
+        
+        Returns:
+            TranscriptSegments: Columnar segments
+        """
+        offsets = array('I')
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + 1
+        offsets.append(max(position - 1, 0))
+        return cls(' '.join(texts), offsets, starts, durations)
+    
+    def __len__(self):
+        """Return the number of segments."""
+        return len(self.starts)
+    
+    def text_at(self, index):
+        """
+        Get the text of one segment.
+        
+        Args:
+            index (int): Segment index
+        
+        Returns:
+            str: Segment text
+        """
+        end = self.offsets[index + 1]
+        # Every segment but the last is followed by a separating space
+        if index + 1 < len(self.starts):
+            end -= 1
+        return self.text[self.offsets[index]:end]
+    
+    def segment(self, index):
+        """
+        Get one segment.
+        
+        Args:
+            index (int): Segment index
+        
+        Returns:
+            tuple: (start, duration, text)
+        """
+        return self.starts[index], self.durations[index], self.text_at(index)
+    
+    def seek(self, seconds):
+        """
+        Find the segment playing at a timestamp.
+        
+        Args:
+            seconds (float): Time in seconds
+        
+        Returns:
+            int: Index of the last segment starting at or before seconds (0 if none)
+        """
+        return max(bisect_right(self.starts, seconds) - 1, 0)
+    
+    def slice_time(self, start, end):
+        """
+        Get the segments that start inside a time range.
+        
+        Args:
+            start (float): Range start in seconds (inclusive)
+            end (float): Range end in seconds (exclusive)
+        
+        Returns:
+            TranscriptSegments: Segments of the range, sharing no data with this store
+        """
+        first = bisect_left(self.starts, start)
+        last = bisect_left(self.starts, end)
+        if first >= last:
+            return TranscriptSegments()
+        
+        base = self.offsets[first]
+        text_end = self.offsets[last] - 1 if last < len(self.starts) else self.offsets[last]
+        offsets = array('I', (offset - base for offset in self.offsets[first:last]))
+        offsets.append(text_end - base)
+        return TranscriptSegments(self.text[base:text_end], offsets,
+                                  self.starts[first:last], self.durations[first:last])
+    
+    def iter_segments(self):
+        """
+        Iterate over segments without materializing them all.
+        
+        Yields:
+            tuple: (start, duration, text)
+        """
+        for index in range(len(self.starts)):
+            yield self.segment(index)
+    
+    def write_srt(self, stream):
+        """
+        Write the segments as SubRip subtitles.
+        
+        Args:
+            stream (file): Text stream to write to
+        """
+        for index, (start, duration, text) in enumerate(self.iter_segments(), 1):
+            stream.write(f"{index}\n{self._timestamp(start, ',')} --> "
+                         f"{self._timestamp(start + duration, ',')}\n{text}\n\n")
+    
+    def write_vtt(self, stream):
+        """
+        Write the segments as WebVTT subtitles.
+        
+        Args:
+            stream (file): Text stream to write to
+        """
+        stream.write("WEBVTT\n\n")
+        for start, duration, text in self.iter_segments():
+            stream.write(f"{self._timestamp(start, '.')} --> "
+                         f"{self._timestamp(start + duration, '.')}\n{text}\n\n")
+    
+    @staticmethod
+    def _timestamp(seconds, separator):
+        """Format seconds as HH:MM:SS<separator>mmm."""
+        milliseconds = int(round(seconds * 1000))
+        hours, milliseconds = divmod(milliseconds, 3600000)
+        minutes, milliseconds = divmod(milliseconds, 60000)
+        secs, milliseconds = divmod(milliseconds, 1000)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
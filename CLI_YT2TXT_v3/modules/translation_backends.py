@@ -0,0 +1,218 @@
+"""
+Translation Backends Module
+
+Services the Translator can send chunks to. Every backend translates a
+batch of chunks per call and declares how large a batch and a chunk may
+be, so the Translator can pack requests accordingly:
+
+- GoogleBackend: Google Translate through deep-translator, one chunk per request
+- LibreTranslateBackend: LibreTranslate-compatible HTTP API (self-hostable),
+  several chunks per request over pooled keep-alive connections
+- OllamaBackend: the local Ollama model, for hosts without internet access
+- LocalBackend: deterministic stand-in that tags text instead of translating
+"""
+
+import threading
+
+from modules.text_chunker import TextChunker
+
+class ThrottledError(Exception):
+    """Raised by a backend when the service rejects a request for exceeding its rate limit."""
+
+class TranslationBackend:
+    """Interface of a translation service."""
+    
+    # Name used on the command line and in traces
+    name = None
+    # Most chunks sent in one request
+    max_batch = 1
+    # Most characters per chunk
+    chunk_chars = 4500
+    # Most characters per request; room for several chunks when max_batch > 1
+    max_chars = 4500
+    # Whether requests go through the Translator's rate limiter
+    rate_limited = True
+    
+    @property
+    def memo_key(self):
+        """Identifier mixed into memo keys, so each backend's translations are stored apart."""
+        return self.name
+    
+    def translate_batch(self, texts, source_language, target_language):
+        """
+        Translate several chunks.
+        
+        Args:
+            texts (list): Chunks to translate
+            source_language (str): Source language code, or 'auto'
+            target_language (str): Target language code
+        
+        Returns:
+            list: Translations in the order of texts
+        
+        Raises:
+            ThrottledError: If the service is rate limiting us
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """Release connections held by the backend."""
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate via deep-translator."""
+    
+    name = 'google'
+    
+    def __init__(self):
+        """Initialize the backend."""
+        self._local = threading.local()
+    
+    @property
+    def memo_key(self):
+        """Google translations keep the memo keys they had before backends existed."""
+        return None
+    
+    def translate_batch(self, texts, source_language, target_language):
+        """Translate chunks one request at a time (the public endpoint has no batch API)."""
+        from deep_translator.exceptions import TooManyRequests
+        
+        client = self._get_client(source_language, target_language)
+        translations = []
+        for text in texts:
+            try:
+                translations.append(client.translate(text))
+            except Exception as e:
+                if isinstance(e, TooManyRequests) or '429' in str(e):
+                    raise ThrottledError(str(e)) from e
+                raise
+        return translations
+    
+    def _get_client(self, source_language, target_language):
+        """
+        Get this thread's GoogleTranslator for a language pair.
+        
+        GoogleTranslator keeps per-request state on the instance, so every
+        worker thread gets its own client.
+        
+        Args:
+            source_language (str): Source language code
+            target_language (str): Target language code
+        
+        Returns:
+            GoogleTranslator: Translator client
+        """
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = self._local.clients = {}
+        key = (source_language, target_language)
+        if key not in clients:
+            from deep_translator import GoogleTranslator
+            clients[key] = GoogleTranslator(source=source_language, target=target_language)
+        return clients[key]
+
+class LibreTranslateBackend(TranslationBackend):
+    """LibreTranslate-compatible /translate API with batched requests."""
+    
+    name = 'libretranslate'
+    
+    def __init__(self, url='http://localhost:5000', api_key=None, max_batch=8,
+                 chunk_chars=1000, max_chars=8000, pool_size=4, timeout=60):
+        """
+        Initialize the backend.
+        
+        Args:
+            url (str): Base URL of the server
+            api_key (str): API key, if the server requires one
+            max_batch (int): Most chunks sent in one request
+            chunk_chars (int): Most characters per chunk
+            max_chars (int): Most characters per request
+            pool_size (int): Keep-alive connections kept open
+            timeout (float): Seconds to wait for a response
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        self.url = url.rstrip('/') + '/translate'
+        self.api_key = api_key
+        self.max_batch = max_batch
+        self.chunk_chars = min(chunk_chars, max_chars)
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def translate_batch(self, texts, source_language, target_language):
+        """Translate all chunks in one request."""
+        payload = {'q': list(texts), 'source': source_language, 'target': target_language,
+                   'format': 'text'}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        if response.status_code == 429:
+            raise ThrottledError(response.text[:200])
+        response.raise_for_status()
+        translations = response.json().get('translatedText')
+        if isinstance(translations, str):
+            translations = [translations]
+        return translations or []
+    
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+class OllamaBackend(TranslationBackend):
+    """Translates with the local Ollama model."""
+    
+    name = 'ollama'
+    # Chunks are kept short so the translation fits the response budget
+    chunk_chars = 1500
+    max_chars = 1500
+    rate_limited = False
+    
+    def __init__(self, llm_processor, model_name):
+        """
+        Initialize the backend.
+        
+        Args:
+            llm_processor (LLMProcessor): Processor sharing the loaded model and its context
+            model_name (str): Name of the Ollama model
+        """
+        self.llm_processor = llm_processor
+        self.model_name = model_name
+    
+    @property
+    def memo_key(self):
+        """Translations of different models are stored apart."""
+        return f"{self.name}:{self.model_name}"
+    
+    def translate_batch(self, texts, source_language, target_language):
+        """Translate chunks one prompt at a time."""
+        return [self.llm_processor.generate_text(
+                    self._create_prompt(text, source_language, target_language), self.model_name,
+                    # Translations may take more tokens than the source, e.g. into CJK
+                    num_predict=2 * TextChunker.estimate_tokens(text) + 64)
+                for text in texts]
+    
+    def _create_prompt(self, text, source_language, target_language):
+        """Create the translation prompt for one chunk."""
+        source = '' if source_language == 'auto' else f" from '{source_language}'"
+        return (f"Translate the following text{source} into the language with ISO 639-1 code "
+                f"'{target_language}'. Reply with the translation only, without notes.\n\n{text}")
+
+class LocalBackend(TranslationBackend):
+    """Deterministic stand-in: prefixes each chunk with the target language."""
+    
+    name = 'local'
+    max_batch = 64
+    max_chars = 64 * TranslationBackend.chunk_chars
+    rate_limited = False
+    
+    def translate_batch(self, texts, source_language, target_language):
+        """Return each chunk tagged with the target language."""
+        return [f"[{target_language}] {text}" for text in texts]
+
+# Backends selectable with --translator
+BACKENDS = ('google', 'libretranslate', 'ollama', 'local')
@@ -0,0 +1,153 @@
+"""
+Translation Memo Module
+
+Persistent SQLite store of previously translated text chunks, keyed by a
+hash of the chunk together with its source and target language, so
+recurring text (channel intros, outros, sponsor reads) is translated once.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+class TranslationMemo:
+    """Size-capped, persistent memo of chunk translations."""
+    
+    def __init__(self, db_path='cache/translations.db', max_entries=100000):
+        """
+        Initialize the translation memo store.
+        
+        Args:
+            db_path (str): SQLite database path
+            max_entries (int): Number of entries kept before the least recently used are evicted
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS memo (
+                key TEXT PRIMARY KEY,
+                source_lang TEXT,
+                target_lang TEXT,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_memo_last_used ON memo(last_used)')
+        self.conn.commit()
+        # Counted once here and kept up to date by put(), so writes never scan the table
+        self._count = self.conn.execute('SELECT COUNT(*) FROM memo').fetchone()[0]
+    
+    @staticmethod
+    def make_key(text, source_lang, target_lang, backend=None):
+        """
+        Build the memo key for a chunk.
+        
+        Args:
+            text (str): Source chunk
+            source_lang (str): Source language code ('auto' if unknown)
+            target_lang (str): Target language code
+            backend (str): Memo key of the translation backend, None for Google
+        
+        Returns:
+            str: Hex digest identifying the chunk, language pair and backend
+        """
+        payload = f"{source_lang}\x00{target_lang}\x00{text}"
+        if backend:
+            payload = f"{backend}\x00{payload}"
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, text, source_lang, target_lang, backend=None):
+        """
+        Look up a translated chunk.
+        
+        Args:
+            text (str): Source chunk
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            backend (str): Memo key of the translation backend, None for Google
+        
+        Returns:
+            str: Translation or None on a miss
+        """
+        key = self.make_key(text, source_lang, target_lang, backend)
+        with self._lock:
+            row = self.conn.execute('SELECT translation FROM memo WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self.conn.execute('UPDATE memo SET last_used = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+            return row[0]
+    
+    def put(self, text, source_lang, target_lang, translation, backend=None):
+        """
+        Store a translated chunk.
+        
+        Args:
+            text (str): Source chunk
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            translation (str): Translated chunk
+            backend (str): Memo key of the translation backend, None for Google
+        """
+        key = self.make_key(text, source_lang, target_lang, backend)
+        with self._lock:
+            updated = self.conn.execute(
+                'UPDATE memo SET translation = ?, last_used = ? WHERE key = ?',
+                (translation, time.time(), key)
+            ).rowcount
+            if not updated:
+                self.conn.execute(
+                    'INSERT INTO memo (key, source_lang, target_lang, translation, last_used) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (key, source_lang, target_lang, translation, time.time())
+                )
+                self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+            self.conn.commit()
+    
+    def _evict(self):
+        """Delete least recently used entries beyond max_entries (caller holds the lock)."""
+        deleted = self.conn.execute(
+            'DELETE FROM memo WHERE key IN '
+            '(SELECT key FROM memo ORDER BY last_used ASC LIMIT ?)',
+            (self._count - self.max_entries,)
+        ).rowcount
+        self._count -= deleted
+    
+    def stats(self):
+        """
+        Get memo usage statistics.
+        
+        Returns:
+            dict: Hit and miss counters, hit rate and stored entry count
+        """
+        with self._lock:
+            entries = self.conn.execute('SELECT COUNT(*) FROM memo').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries
+        }
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self.conn.close()
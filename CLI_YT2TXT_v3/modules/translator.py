@@ -1,92 +1,207 @@
 """
 Translator Module
 
-Handles text translation using deep-translator library.
+Handles text translation through a pluggable backend (Google Translate via
+deep-translator by default, see translation_backends).
 """
 
-from deep_translator import GoogleTranslator
+from concurrent.futures import ThreadPoolExecutor
+import random
 import time
 
+from modules.rate_limiter import AdaptiveRateLimiter
+from modules.text_chunker import TextChunker
+from modules.translation_backends import GoogleBackend, ThrottledError
+from modules.tracing import NULL_SPAN
+
+class TranslationError(Exception):
+    """Raised when a chunk cannot be translated after all retries."""
+
 class Translator:
     """Translates text between languages."""
     
-    def __init__(self):
-        """Initialize translator."""
-        pass
+    def __init__(self, memo=None, max_workers=4, max_retries=4, rate_limiter=None, backend=None):
+        """
+        Initialize translator.
+    
+        Args:
+            memo (TranslationMemo): Store of previously translated chunks, or None
+            max_workers (int): Requests sent concurrently per call
+            max_retries (int): Attempts per request before giving up
+            rate_limiter (AdaptiveRateLimiter): Limiter shared by all requests of this translator
+            backend (TranslationBackend): Translation service, GoogleBackend by default
+        """
+        self.memo = memo
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.backend = backend or GoogleBackend()
     
-    def translate_text(self, text, target_language, chunk_size=4500):
+    def translate_text(self, text, target_language, chunk_size=None, source_language='auto',
+                       checkpoint=None, span=NULL_SPAN, chunks=None):
         """
         Translate text to target language.
         
+        Chunks already in the checkpoint or memo are reused; the rest are
+        packed into batches as large as the backend accepts, translated
+        concurrently on a bounded worker pool and reassembled in their
+        original order.
+        
         Args:
             text (str): Text to translate
             target_language (str): Target language code
-            chunk_size (int): Size of text chunks for translation
-            
+            chunk_size (int): Size of text chunks, or None for the backend's chunk_chars
+            source_language (str): Source language code, 'auto' to let the service detect it
+            checkpoint (JobState): Job checkpoint recording each translated chunk, or None
+            span (Span): Trace span; every request gets a child span with its size,
+                         retries and cache hits
+            chunks (list): Chunks of text from split_text(), so a text translated
+                           into several languages is only split once
+        
         Returns:
-            str: Translated text or original text if translation fails
+            str: Translated text
+        
+        Raises:
+            TranslationError: If a batch still fails after all retries
         """
-        try:
-            if not text or not text.strip():
-                return text
-            
-            # Split text into chunks to handle length limits
-            chunks = self._split_text(text, chunk_size)
-            translated_chunks = []
+        if not text or not text.strip():
+            return text
             
-            translator = GoogleTranslator(target=target_language)
-            
-            for i, chunk in enumerate(chunks):
-                try:
-                    # Add small delay between requests to avoid rate limiting
-                    if i > 0:
-                        time.sleep(0.5)
-                    
-                    translated_chunk = translator.translate(chunk)
-                    translated_chunks.append(translated_chunk)
-                    
-                except Exception as e:
-                    print(f"Warning: Failed to translate chunk {i+1}: {str(e)}")
-                    translated_chunks.append(chunk)  # Use original if translation fails
-            
-            return ' '.join(translated_chunks)
-            
-        except Exception as e:
-            print(f"Translation error: {str(e)}")
-            return text  # Return original text if translation fails
+        # Split text into chunks to handle length limits
+        if chunks is None:
+            chunks = self.split_text(text, chunk_size)
+        span.set(chunks=len(chunks), backend=self.backend.name)
+        span.count_text(text)
+        
+        translations = [self._lookup(chunk, source_language, target_language, checkpoint, span)
+                        for chunk in chunks]
+        batches = self._make_batches([i for i, t in enumerate(translations) if t is None], chunks)
+        span.set(requests=len(batches))
+        
+        def translate(batch):
+            translated = self._translate_batch([chunks[i] for i in batch], source_language,
+                                               target_language, checkpoint, span)
+            for i, translated_chunk in zip(batch, translated):
+                translations[i] = translated_chunk
+        
+        if len(batches) == 1:
+            translate(batches[0])
+        elif batches:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(translate, batches))
+        translated = ' '.join(translations)
+        
+        span.count_text(translated, prefix='output_')
+        return translated
+    
+    def _lookup(self, chunk, source_language, target_language, checkpoint, span):
+        """Reuse an earlier translation of a chunk from the checkpoint or the memo."""
+        for store in (checkpoint, self.memo):
+            if store:
+                memoized = store.get(chunk, source_language, target_language,
+                                     backend=self.backend.memo_key)
+                if memoized is not None:
+                    span.add('cache_hits')
+                    if store is self.memo and checkpoint:
+                        checkpoint.put(chunk, source_language, target_language, memoized,
+                                       backend=self.backend.memo_key)
+                    return memoized
+        return None
     
-    def _split_text(self, text, chunk_size):
+    def _make_batches(self, indexes, chunks):
         """
-        Split text into chunks for translation.
+        Group chunks into requests within the backend's batch and size limits.
         
         Args:
-            text (str): Text to split
-            chunk_size (int): Maximum size per chunk
-            
+            indexes (list): Indexes of the chunks to translate
+            chunks (list): All chunks
+        
         Returns:
-            list: List of text chunks
+            list: Lists of chunk indexes, one per request
+        """
+        batches = []
+        batch, size = [], 0
+        for i in indexes:
+            if batch and (len(batch) == self.backend.max_batch
+                          or size + len(chunks[i]) > self.backend.max_chars):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(i)
+            size += len(chunks[i])
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _translate_batch(self, texts, source_language, target_language, checkpoint=None,
+                         span=NULL_SPAN):
         """
-        if len(text) <= chunk_size:
-            return [text]
+        Translate the chunks of one request, retrying with exponential backoff.
         
-        chunks = []
-        sentences = text.split('. ')
-        current_chunk = ""
+        Args:
+            texts (list): Text chunks
+            source_language (str): Source language code
+            target_language (str): Target language code
+            checkpoint (JobState): Job checkpoint recording each translated chunk, or None
+            span (Span): Parent trace span of the request span
+        
+        Returns:
+            list: Translated chunks
+        """
+        with span.child('translate_batch', chunks=len(texts)) as batch_span:
+            batch_span.count_text(''.join(texts))
+            translations = self._request(texts, source_language, target_language, batch_span)
+            # Roll retries and throttling up into the parent span
+            for key in ('retries', 'throttled'):
+                if key in getattr(batch_span, 'attributes', {}):
+                    span.add(key, batch_span.attributes[key])
         
-        for sentence in sentences:
-            # If adding this sentence would exceed chunk size
-            if len(current_chunk) + len(sentence) + 2 > chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = sentence + '. '
-                else:
-                    # Single sentence is too long, split it
-                    chunks.append(sentence[:chunk_size])
-                    current_chunk = sentence[chunk_size:] + '. '
-            else:
-                current_chunk += sentence + '. '
+        for store in (checkpoint, self.memo):
+            if store:
+                for text, translation in zip(texts, translations):
+                    store.put(text, source_language, target_language, translation,
+                              backend=self.backend.memo_key)
+        return translations
+    
+    def _request(self, texts, source_language, target_language, span):
+        """Send one request to the backend, recording retries and throttling on span."""
+        delay = 1.0
+        for attempt in range(1, self.max_retries + 1):
+            if self.backend.rate_limited:
+                self.rate_limiter.acquire()
+            try:
+                translations = self.backend.translate_batch(texts, source_language,
+                                                            target_language)
+                if len(translations) != len(texts) or not all(translations):
+                    raise TranslationError(f"Incomplete translation of {texts[0][:50]!r}")
+            except Exception as e:
+                if isinstance(e, ThrottledError):
+                    span.add('throttled')
+                    self.rate_limiter.on_throttle()
+                if attempt == self.max_retries:
+                    raise TranslationError(
+                        f"Failed to translate chunk after {attempt} attempts: {str(e)}"
+                    ) from e
+                span.add('retries')
+                print(f"Warning: Translation attempt {attempt} failed, retrying in {delay:.0f}s: {str(e)}")
+                time.sleep(delay + random.uniform(0, delay / 2))
+                delay *= 2
+                continue
+            
+            if self.backend.rate_limited:
+                self.rate_limiter.on_success()
+            return translations
+    
+    def split_text(self, text, chunk_size=None, segments=None):
+        """
+        Split text into chunks for translation.
         
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        Args:
+            text (str): Text to split
+            chunk_size (int): Maximum size per chunk, or None for the backend's chunk_chars
+            segments (TranscriptSegments): Timed segments of the text, whose pauses
+                                           mark sentence ends in unpunctuated captions
         
-        return chunks
\ No newline at end of file
+        Returns:
+            list: List of text chunks
+        """
+        return TextChunker(chunk_size or self.backend.chunk_chars).split(text, segments)
\ No newline at end of file
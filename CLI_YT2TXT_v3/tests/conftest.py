@@ -0,0 +1,35 @@
+"""Shared pytest setup: make the application modules importable from the tests."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from benchmark.stand_ins import FakeOllamaServer, FakeTranscriptApi, FakeTranslator
+
+@pytest.fixture
+def stand_ins(tmp_path, monkeypatch):
+    """
+    Route YouTube, Google Translate and Ollama to the benchmark stand-ins and
+    run the test inside an empty working directory.
+    
+    Yields:
+        FakeOllamaServer: Running Ollama stand-in
+    """
+    import deep_translator
+    import youtube_transcript_api
+    
+    monkeypatch.setattr(youtube_transcript_api, 'YouTubeTranscriptApi', FakeTranscriptApi)
+    monkeypatch.setattr(deep_translator, 'GoogleTranslator', FakeTranslator)
+    monkeypatch.chdir(tmp_path)
+    FakeTranslator.configure(0.0, None)
+    server = FakeOllamaServer(load_time=0.05)
+    monkeypatch.setenv('OLLAMA_HOST', server.start())
+    yield server
+    server.stop()
+
+def video_url(segments):
+    """URL of a synthetic stand-in video with the given number of segments."""
+    return f"https://youtu.be/{FakeTranscriptApi.video_id(segments)}"
@@ -0,0 +1,51 @@
+"""Tests for BatchProcessor job completion and failure reporting."""
+
+import threading
+
+from modules.batch_processor import BatchProcessor
+from tests.conftest import video_url
+
+def run_with_timeout(processor, urls, timeout=20):
+    """Run a batch in a thread so a hang fails the test instead of blocking it."""
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(processor.run(urls)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "batch run did not finish"
+    return results
+
+def test_failed_finish_is_reported_as_failure(stand_ins):
+    processor = BatchProcessor('de', 'brief', stand_ins.models[0], use_cache=False,
+                               outputs=['original_transcript'])
+    
+    def finish(name, metadata):
+        raise OSError("disk full")
+    
+    processor.storage.finish = finish
+    results = run_with_timeout(processor, [video_url(20)])
+    
+    assert len(results) == 1
+    assert not results[0]['success']
+    assert results[0]['stage'] == 'finish'
+    assert 'disk full' in results[0]['error']
+    assert processor.failures == [{'url': video_url(20), 'stage': 'finish', 'error': 'disk full'}]
+
+def test_successful_job_is_published_once(stand_ins):
+    processor = BatchProcessor(['de', 'fr'], 'brief', stand_ins.models[0], use_cache=False,
+                               outputs=['original_transcript', 'translated_transcript'],
+                               caption_tracks=False)
+    results = run_with_timeout(processor, [video_url(20), video_url(30)])
+    
+    assert [result['success'] for result in results] == [True, True]
+    assert all(sorted(result['files']) == ['original_transcript', 'translated_transcript_de',
+                                           'translated_transcript_fr'] for result in results)
+
+def test_transcript_only_batch_does_not_use_ollama(stand_ins):
+    processor = BatchProcessor('de', None, None, use_cache=False,
+                               outputs=['original_transcript', 'translated_transcript'],
+                               caption_tracks=False)
+    results = run_with_timeout(processor, [video_url(20)])
+    
+    assert processor.llm_processor is None
+    assert results[0]['success']
+    assert stand_ins.requests == 0
@@ -0,0 +1,40 @@
+"""Tests for job checkpoints and resuming."""
+
+import os
+
+from modules.job_state import JobState
+
+def test_completed_stages_are_restored_after_a_restart(tmp_path):
+    job_dir = str(tmp_path)
+    job = JobState('video:de:brief:model', job_dir)
+    assert not job.resumed
+    assert job.run_stage('download', ('video',), lambda: 'transcript') == ('transcript', False)
+    job.put('chunk', 'en', 'de', 'Stück', backend='libretranslate:local')
+    
+    # A new process picks up where the interrupted one stopped
+    resumed = JobState('video:de:brief:model', job_dir)
+    assert resumed.resumed
+    assert resumed.run_stage('download', ('video',), lambda: 'again') == ('transcript', True)
+    assert resumed.get('chunk', 'en', 'de', backend='libretranslate:local') == 'Stück'
+    assert resumed.get('chunk', 'en', 'de') is None
+
+def test_changed_inputs_rerun_the_stage(tmp_path):
+    job = JobState('video:de:brief:model', str(tmp_path))
+    job.run_stage('summarize', ('text', 'brief'), lambda: 'short')
+    
+    assert job.run_stage('summarize', ('text', 'detailed'), lambda: 'long') == ('long', False)
+    assert job.run_stage('summarize', ('text', 'detailed'), lambda: 'other') == ('long', True)
+
+def test_failed_stages_are_not_checkpointed(tmp_path):
+    job = JobState('video:de:brief:model', str(tmp_path))
+    assert job.run_stage('summarize', ('text',), lambda: None) == (None, False)
+    assert job.run_stage('summarize', ('text',), lambda: 'done') == ('done', False)
+
+def test_other_jobs_and_finished_jobs_start_fresh(tmp_path):
+    job = JobState('video:de:brief:model', str(tmp_path))
+    job.run_stage('download', ('video',), lambda: 'transcript')
+    
+    assert not JobState('video:fr:brief:model', str(tmp_path)).resumed
+    job.finish()
+    assert not os.path.exists(job.path)
+    assert not JobState('video:de:brief:model', str(tmp_path)).resumed
@@ -0,0 +1,68 @@
+"""Tests for LanguageDetector's window voting and shared profiles."""
+
+import threading
+from collections import namedtuple
+
+from langdetect.detector_factory import DetectorFactory
+
+from modules import language_detector
+from modules.language_detector import LanguageDetector
+
+Language = namedtuple('Language', 'lang prob')
+
+ENGLISH = ("The committee met on Tuesday to review the budget for the coming year and agreed "
+           "to fund the new library. ")
+FRENCH = "Bonjour à tous et bienvenue dans cette nouvelle vidéo, merci de votre fidélité. "
+
+def test_a_foreign_intro_does_not_decide_the_language():
+    detector = LanguageDetector(windows=5, window_chars=300)
+    text = FRENCH * 4 + ENGLISH * 30
+    
+    assert detector.detect_language(text) == 'en'
+    assert detector.detect_language(FRENCH * 4) == 'fr'
+
+def test_votes_are_weighted_by_probability_and_window_length(monkeypatch):
+    detector = LanguageDetector()
+    windows = ['long window ' * 20, 'short', 'tiny']
+    answers = {windows[0]: [Language('en', 0.6), Language('de', 0.4)],
+               'short': [Language('fr', 0.99)], 'tiny': [Language('fr', 0.99)]}
+    monkeypatch.setattr(detector, '_sample_windows', lambda text: windows)
+    monkeypatch.setattr(detector, '_classify', answers.get)
+    
+    # Two confident short windows are outweighed by one long, less certain one
+    assert detector.detect_language('any text at all') == 'en'
+    
+    answers[windows[0]] = [Language('en', 0.01)]
+    assert detector.detect_language('any text at all') == 'fr'
+
+def test_windows_are_spread_across_the_text():
+    detector = LanguageDetector(windows=4, window_chars=50)
+    text = ' '.join(f"word{i:03d}" for i in range(200))
+    
+    samples = detector._sample_windows(text)
+    
+    assert len(samples) == 4
+    assert all(len(sample) <= 50 for sample in samples)
+    positions = [text.index(sample) for sample in samples]
+    assert positions[0] == 0 and positions[-1] >= len(text) - 50
+    assert positions == sorted(set(positions))
+    assert detector._sample_windows('short text') == ['short text']
+
+def test_profiles_are_loaded_once_and_shared(monkeypatch):
+    monkeypatch.setattr(language_detector, '_factory', None)
+    loads = []
+    load_profile = DetectorFactory.load_profile
+    monkeypatch.setattr(DetectorFactory, 'load_profile',
+                        lambda self, directory: loads.append(directory) or load_profile(
+                            self, directory))
+    
+    threads = [threading.Thread(target=LanguageDetector().warm_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(loads) == 1
+    assert LanguageDetector().detect_language(ENGLISH) == 'en'
+    assert len(loads) == 1
+    assert language_detector._get_factory().seed == 0
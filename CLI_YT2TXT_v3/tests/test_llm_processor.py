@@ -0,0 +1,232 @@
+"""Tests for LLMProcessor context sizing against the local Ollama stand-in."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+import pytest
+
+from benchmark.stand_ins import FakeOllamaServer
+from modules.llm_processor import LLMProcessor
+
+@pytest.fixture
+def server():
+    server = FakeOllamaServer(load_time=0.2, context_length=32768)
+    server.start()
+    yield server
+    server.stop()
+
+def make_processor(server, **kwargs):
+    """Create an LLMProcessor talking to the stand-in server."""
+    processor = LLMProcessor(**kwargs)
+    processor.client = ollama.Client(host=server.host)
+    return processor
+
+def test_short_prompt_after_preload_uses_a_small_context(server):
+    model = server.models[0]
+    processor = make_processor(server)
+    processor.preload(model)
+    processor.wait_for_model(model)
+    
+    text = 'Short text about water markets. ' * 20
+    assert processor.generate_summary(text, 'brief', model)
+    
+    metrics = processor.last_metrics
+    needed = metrics['estimated_prompt_tokens'] + metrics['num_predict']
+    assert server.loads == 1
+    assert metrics['num_ctx'] == server._loaded[model] == LLMProcessor.DEFAULT_CONTEXT_LENGTH
+    slack = LLMProcessor.CONTEXT_SLACK
+    assert needed <= metrics['num_ctx'] <= processor._round_context(needed) + slack
+    assert metrics['num_ctx'] < processor.get_context_length(model)
+
+def test_preload_uses_the_expected_context(server):
+    model = server.models[0]
+    processor = make_processor(server)
+    processor.preload(model, num_ctx=3000)
+    processor.wait_for_model(model)
+    assert server._loaded[model] == 3072
+    
+    capped = make_processor(server, max_context=1024)
+    capped.preload(model)
+    capped.wait_for_model(model)
+    assert server._loaded[model] == 1024
+
+def test_request_shrinks_a_much_larger_loaded_context(server):
+    model = server.models[0]
+    processor = make_processor(server)
+    processor.wait_for_model(model)
+    prompt = 'Short text about water markets. ' * 20
+    
+    # Sections of a long transcript leave the model loaded with its full context
+    processor._loaded_context[model] = processor.get_context_length(model)
+    options, _ = processor._request_options(model, prompt, 256)
+    assert options['num_ctx'] == 1024
+    
+    # A loaded context only one step larger is reused instead of reloading the model
+    options, _ = processor._request_options(model, prompt * 8, 256)
+    assert options['num_ctx'] == 2048
+    options, _ = processor._request_options(model, prompt, 256)
+    assert options['num_ctx'] == 2048
+
+def test_languages_share_one_map_step(server):
+    model = server.models[0]
+    processor = make_processor(server, max_context=4096)
+    processor.wait_for_model(model)
+    text = 'A much longer text about energy. ' * 2000
+    
+    requests = server.requests
+    assert processor.generate_summary(text, 'brief', model)
+    sections = processor.last_metrics['sections']
+    assert sections > 1
+    assert server.requests - requests == sections + 1
+    
+    # Another language only sends its own final request
+    requests = server.requests
+    assert processor.generate_summary(text, 'brief', model, language='German')
+    assert server.requests - requests == 1
+    assert processor.last_metrics['sections'] == sections
+
+def test_concurrent_identical_summaries_are_generated_once(server):
+    model = server.models[0]
+    processor = make_processor(server, max_context=4096)
+    processor.wait_for_model(model)
+    text = 'A much longer text about energy. ' * 2000
+    requests = server.requests
+    
+    def summarize(_):
+        summary = processor.generate_summary(text, 'brief', model)
+        return summary, processor.last_metrics
+    
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        (first, first_metrics), (second, second_metrics) = pool.map(summarize, range(2))
+    
+    assert first and first == second
+    assert [first_metrics.get('shared'), second_metrics.get('shared')].count(True) == 1
+    sections = max(first_metrics['sections'], second_metrics['sections'])
+    assert server.requests - requests == sections + 1
+
+def test_missing_digest_is_not_cached_and_skips_the_summary_cache(server, tmp_path):
+    from modules.summary_cache import SummaryCache
+    
+    model = server.models[0]
+    cache = SummaryCache(str(tmp_path / 'summaries.db'))
+    processor = make_processor(server, cache=cache)
+    processor.client = ollama.Client(host='http://127.0.0.1:9')
+    
+    assert processor.get_model_digest(model) == ''
+    assert processor.generate_summary('Some text. ' * 20, 'brief', model) is None
+    assert cache.stats()['hits'] == cache.stats()['misses'] == 0
+    
+    processor.client = ollama.Client(host=server.host)
+    assert processor.get_model_digest(model)
+    assert processor.generate_summary('Some text. ' * 20, 'brief', model)
+    assert cache.stats()['misses'] == 1 and cache.stats()['entries'] == 1
+
+def record_chats(processor):
+    """Record the prompt and options of every chat request the processor sends."""
+    calls = []
+    chat = processor.client.chat
+    
+    def recording(model, messages, options, **kwargs):
+        calls.append((messages[-1]['content'], dict(options)))
+        return chat(model=model, messages=messages, options=options, **kwargs)
+    
+    processor.client.chat = recording
+    return calls
+
+def test_oversized_transcript_is_condensed_in_sections(server):
+    model = server.models[0]
+    server.prompt_tokens_per_second = 1000000.0
+    processor = make_processor(server, max_context=4096)
+    processor.wait_for_model(model)
+    calls = record_chats(processor)
+    text = ' '.join(f"Point {i} of the talk is about energy prices." for i in range(1500))
+    
+    assert processor.generate_summary(text, 'brief', model)
+    
+    sections = processor.last_metrics['sections']
+    *section_calls, (final_prompt, _) = calls
+    assert sections > 1 and len(section_calls) == sections
+    assert all(prompt.startswith(f"The following is part {i} of {sections} ")
+               for i, (prompt, _) in enumerate(section_calls, 1))
+    assert final_prompt.startswith("Please summarize") and len(final_prompt) < len(text) / 4
+    for prompt, options in calls:
+        needed = processor.estimate_tokens(prompt) + options['num_predict']
+        assert needed <= options['num_ctx'] <= 4096
+    # The sections cover the transcript in order, each point exactly once
+    covered = ''.join(prompt.split('\n\n')[1] for prompt, _ in section_calls)
+    assert covered.replace(' ', '') == text.replace(' ', '')
+
+def test_section_summaries_are_reduced_until_they_fit(server):
+    model = server.models[0]
+    server.response_tokens, server.tokens_per_second = 400, 100000.0
+    server.prompt_tokens_per_second = 1000000.0
+    processor = make_processor(server, max_context=2048)
+    processor.wait_for_model(model)
+    calls = record_chats(processor)
+    text = 'A much longer text about energy. ' * 1500
+    
+    assert processor.generate_summary(text, 'brief', model)
+    
+    totals = [int(prompt.split()[6]) for prompt, _ in calls[:-1]]
+    # A first round over the transcript, then rounds over the shorter section summaries
+    assert len(set(totals)) > 1 and totals == sorted(totals, reverse=True)
+    assert processor.last_metrics['sections'] == len(calls) - 1
+    final_prompt, options = calls[-1]
+    assert processor.estimate_tokens(final_prompt) + options['num_predict'] <= options['num_ctx']
+
+def test_streamed_summary_reports_first_token_and_throughput(server):
+    model = server.models[0]
+    server.tokens_per_second = 200.0
+    processor = make_processor(server)
+    processor.wait_for_model(model)
+    received = []
+    
+    summary = processor.generate_summary('Short text about water markets. ' * 20, 'brief', model,
+                                         on_token=lambda piece: received.append(
+                                             (time.perf_counter(), piece)))
+    
+    metrics = processor.last_metrics
+    assert ''.join(piece for _, piece in received).strip() == summary
+    assert metrics['tokens'] == len(received) == server.response_tokens
+    assert 0 < metrics['time_to_first_token'] < metrics['generation_time']
+    # Pieces arrive one by one rather than in a single block at the end
+    assert received[-1][0] - received[0][0] > 0.5 * (len(received) - 1) / 200.0
+    assert 100.0 < metrics['tokens_per_second'] <= 200.0
+
+def test_shared_results_are_bounded_by_size_and_never_drop_running_ones(server):
+    processor = make_processor(server)
+    processor.CONDENSED_CHARS = 10
+    results = {}
+    started, release = threading.Event(), threading.Event()
+    
+    def slow():
+        started.set()
+        release.wait()
+        return 'a' * 5
+    
+    running = threading.Thread(target=processor._share, args=(results, 'a', slow, len))
+    running.start()
+    started.wait()
+    # A finished result over the limit is dropped at once; the running one stays
+    assert processor._share(results, 'b', lambda: 'b' * 20, len) == ('b' * 20, True)
+    assert list(results) == ['a']
+    
+    release.set()
+    running.join()
+    processor._share(results, 'c', lambda: 'c' * 4, len)
+    assert list(results) == ['a', 'c']
+    processor._share(results, 'd', lambda: 'd' * 4, len)
+    assert list(results) == ['c', 'd']
+    # Results without a size are only shared while being computed
+    processor._share(results, 'e', lambda: 'e')
+    assert list(results) == ['c', 'd']
+
+def test_texts_that_fit_are_not_kept_after_summarizing(server):
+    model = server.models[0]
+    processor = make_processor(server)
+    processor.wait_for_model(model)
+    
+    assert processor.generate_summary('Short text about water markets. ' * 20, 'brief', model)
+    assert processor._condensed == {} and processor._in_flight == {}
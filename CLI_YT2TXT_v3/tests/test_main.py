@@ -0,0 +1,197 @@
+"""Tests for the command line entry point."""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+import main
+from modules.translation_backends import LocalBackend
+from tests.conftest import video_url
+
+def test_transcript_only_run_does_not_use_ollama(stand_ins, monkeypatch):
+    # Importing ollama now fails, so creating an LLMProcessor would fail the run
+    monkeypatch.setitem(sys.modules, 'ollama', None)
+    monkeypatch.setattr(sys, 'argv', ['main.py', '--headless', '--url', video_url(20),
+                                      '--lang', 'de', '--no-cache', '--no-caption-tracks',
+                                      '--outputs', 'original_transcript',
+                                      'translated_transcript'])
+    
+    main.main()
+    
+    assert stand_ins.requests == 0
+    names = sorted(os.listdir('output'))
+    assert any(name.endswith('_original_transcript.txt') for name in names)
+    assert any(name.endswith('_translated_transcript.txt') for name in names)
+
+def test_headless_summary_run_requires_a_model():
+    with pytest.raises(SystemExit):
+        main.parse_args(['--headless', '--url', video_url(20), '--lang', 'de',
+                         '--summary', 'brief'])
+    
+    args = main.parse_args(['--headless', '--url', video_url(20), '--lang', 'de',
+                            '--outputs', 'original_transcript'])
+    assert args.model is None and args.summary is None
+
+class FailingLLM:
+    """LLM processor stand-in that streams part of a summary and then fails."""
+    
+    last_metrics = {}
+    
+    def generate_summary(self, text, summary_type, model_name, on_token=None, **kwargs):
+        if on_token:
+            on_token('The first half of a')
+        return None
+
+def test_failed_streamed_summary_leaves_no_file(stand_ins):
+    success, files = main.process_transcript(video_url(20), 'de', 'brief', 'bench:latest',
+                                             use_cache=False, stream=True,
+                                             llm_processor=FailingLLM(),
+                                             outputs=['original_summary'])
+    
+    assert not success
+    assert not [name for name in os.listdir('output') if name.endswith('_summary.txt')]
+    assert main.OutputStorage('text', 'output').manifest.find(
+        main.extract_video_id_from_url(video_url(20))) == []
+
+class FailAfterTranslation(FailingLLM):
+    """Fails the summary once the transcript translation has been checkpointed."""
+    
+    def generate_summary(self, text, summary_type, model_name, on_token=None, **kwargs):
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            for name in os.listdir(os.path.join('cache', 'jobs')):
+                with open(os.path.join('cache', 'jobs', name), encoding='utf-8') as f:
+                    if 'translate_transcript' in json.load(f)['stages']:
+                        return None
+            time.sleep(0.05)
+        return None
+
+def test_resumed_job_translates_again_with_another_backend(stand_ins):
+    run = dict(use_cache=False, caption_tracks=False, llm_processor=FailAfterTranslation(),
+               outputs=['translated_transcript', 'original_summary'])
+    success, _ = main.process_transcript(video_url(20), 'de', 'brief', 'bench:latest', **run)
+    assert not success
+    
+    success, files = main.process_transcript(video_url(20), 'de', 'brief', 'bench:latest',
+                                             translation_backend=LocalBackend(),
+                                             **dict(run, outputs=['translated_transcript']))
+    
+    assert success
+    with open(files['translated_transcript'], encoding='utf-8') as f:
+        assert '[de]' in f.read()
+
+def test_caption_tracks_are_listed_only_when_translating(stand_ins, monkeypatch):
+    listed = []
+    monkeypatch.setattr(main.TranscriptDownloader, 'list_tracks',
+                        lambda self, url, span=None: listed.append(url) or [])
+    run = dict(use_cache=False, outputs=['translated_transcript'])
+    
+    success, _ = main.process_transcript(video_url(20), 'en', 'brief', 'bench:latest', **run)
+    assert success and listed == []
+    
+    success, _ = main.process_transcript(video_url(20), ['en', 'de'], 'brief', 'bench:latest',
+                                         **run)
+    assert success and listed == [video_url(20)]
+
+class GrowthRecordingLLM:
+    """Wraps an LLM processor and records the summary file size at every streamed token."""
+    
+    def __init__(self, processor):
+        self.processor = processor
+        self.sizes = []
+    
+    @property
+    def last_metrics(self):
+        return self.processor.last_metrics
+    
+    def generate_summary(self, text, summary_type, model_name, on_token=None, **kwargs):
+        def recording(piece):
+            on_token(piece)
+            names = [name for name in os.listdir('output')
+                     if name.endswith('_original_summary.txt')]
+            self.sizes.append(os.path.getsize(os.path.join('output', names[0])))
+        
+        summary = self.processor.generate_summary(text, summary_type, model_name,
+                                                  on_token=recording, **kwargs)
+        # Metrics are per thread; keep the pipeline thread's for the test
+        self.metrics = self.processor.last_metrics
+        return summary
+
+def test_streamed_summary_file_grows_during_generation(stand_ins):
+    llm = GrowthRecordingLLM(main.LLMProcessor())
+    
+    success, files = main.process_transcript(video_url(20), 'en', 'brief', 'bench:latest',
+                                             use_cache=False, stream=True, llm_processor=llm,
+                                             outputs=['original_summary'])
+    
+    assert success
+    assert len(llm.sizes) == stand_ins.response_tokens
+    assert llm.sizes == sorted(llm.sizes) and llm.sizes[0] < llm.sizes[-1]
+    assert os.path.getsize(files['original_summary']) >= llm.sizes[-1]
+    assert llm.metrics['time_to_first_token'] > 0
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Record the name and checkpoint inputs of every stage run through the job state."""
+    calls = []
+    run_stage = main.JobState.run_stage
+    
+    def recording(self, name, inputs, func):
+        output, restored = run_stage(self, name, inputs, func)
+        calls.append((name, inputs, output))
+        return output, restored
+    
+    monkeypatch.setattr(main.JobState, 'run_stage', recording)
+    return calls
+
+def test_several_targets_share_download_and_summary(stand_ins, stages, monkeypatch):
+    downloads = []
+    get_transcript = main.TranscriptDownloader._get_segments
+    monkeypatch.setattr(main.TranscriptDownloader, '_get_segments',
+                        lambda self, *args, **kwargs: downloads.append(args) or get_transcript(
+                            self, *args, **kwargs))
+    
+    success, files = main.process_transcript(video_url(20), ['de', 'fr', 'en'], 'brief',
+                                             'bench:latest', use_cache=False,
+                                             caption_tracks=False,
+                                             translation_backend=LocalBackend(),
+                                             outputs=['original_transcript',
+                                                      'translated_transcript',
+                                                      'translated_summary'])
+    
+    assert success and len(downloads) == 1
+    assert [name for name, _, _ in stages].count('summarize') == 1
+    assert sorted(name for name, _, _ in stages if name.startswith('translate_')) == [
+        'translate_summary:de', 'translate_summary:fr',
+        'translate_transcript:de', 'translate_transcript:fr']
+    content = {}
+    for kind, path in files.items():
+        with open(path, encoding='utf-8') as f:
+            content[kind] = f.read().split('=' * 50)[-1].strip()
+    assert content['translated_transcript_en'] == content['original_transcript']
+    for lang in ('de', 'fr'):
+        assert content[f"translated_transcript_{lang}"].startswith(f"[{lang}] ")
+        assert content[f"translated_summary_{lang}"] == (
+            f"[{lang}] " + content['translated_summary_en'])
+
+def test_direct_summary_in_the_wrong_language_is_translated(stand_ins, stages):
+    # The Ollama stand-in always answers in English
+    success, files = main.process_transcript(video_url(20), ['de', 'en'], 'brief',
+                                             'bench:latest', use_cache=False,
+                                             caption_tracks=False, direct_summary=True,
+                                             translation_backend=LocalBackend(),
+                                             outputs=['translated_summary'])
+    
+    assert success
+    outputs = {name: (inputs, output) for name, inputs, output in stages}
+    assert sorted(outputs) == ['direct_summary:de', 'direct_summary:en', 'translate_summary:de']
+    untranslated = outputs['direct_summary:de'][1]
+    # Keyed on the untranslated summary, the target language and the backend
+    assert outputs['translate_summary:de'][0] == (untranslated, 'de', ('local', 'local'))
+    with open(files['translated_summary_de'], encoding='utf-8') as f:
+        assert f.read().split('=' * 50)[-1].strip() == f"[de] {untranslated}"
+    with open(files['translated_summary_en'], encoding='utf-8') as f:
+        assert f.read().split('=' * 50)[-1].strip() == outputs['direct_summary:en'][1]
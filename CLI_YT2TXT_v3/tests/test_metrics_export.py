@@ -0,0 +1,54 @@
+"""Tests for the Prometheus textfile exporter's shared state."""
+
+import json
+import multiprocessing
+
+import pytest
+
+from modules import metrics_export
+from modules.metrics_export import PrometheusTextfile
+from modules.tracing import Tracer
+
+def record_runs(filepath, runs):
+    """Record single-span jobs, as one CLI or batch process would."""
+    exporter = PrometheusTextfile(filepath)
+    for i in range(runs):
+        tracer = Tracer(f"job-{i}")
+        with tracer.span('download') as span:
+            span.set(chars=10)
+        exporter.record(tracer, success=True)
+
+@pytest.mark.skipif(metrics_export.fcntl is None, reason="needs fcntl")
+def test_processes_do_not_lose_updates(tmp_path):
+    filepath = str(tmp_path / 'metrics' / 'yt2txt.prom')
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=record_runs, args=(filepath, 25)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    
+    with open(f"{filepath}.state.json", encoding='utf-8') as f:
+        state = json.load(f)
+    assert state['runs'] == {'success': 100}
+    assert state['stages']['download']['count'] == 100
+    assert state['stages']['download']['counters']['chars'] == 1000
+    assert not [path for path in (tmp_path / 'metrics').iterdir() if path.suffix == '.tmp']
+    with open(filepath, encoding='utf-8') as f:
+        assert 'yt2txt_runs_total{status="success"} 100' in f.read()
+
+def test_unreadable_state_is_not_reset(tmp_path, capsys):
+    filepath = str(tmp_path / 'yt2txt.prom')
+    record_runs(filepath, 2)
+    with open(f"{filepath}.state.json", 'a', encoding='utf-8') as f:
+        f.write('{truncated')
+    with open(f"{filepath}.state.json", encoding='utf-8') as f:
+        damaged = f.read()
+    
+    record_runs(filepath, 1)
+    
+    assert 'Unreadable metrics state' in capsys.readouterr().out
+    with open(f"{filepath}.state.json", encoding='utf-8') as f:
+        assert f.read() == damaged
+    with open(filepath, encoding='utf-8') as f:
+        assert 'yt2txt_runs_total{status="success"} 2' in f.read()
@@ -0,0 +1,66 @@
+"""Tests for the stage dependency graph."""
+
+import threading
+import time
+
+import pytest
+
+from modules.pipeline import Pipeline, PipelineError, StageError
+
+def test_stages_wait_for_dependencies_and_independent_ones_overlap():
+    pipeline = Pipeline(max_workers=4)
+    both_running = threading.Barrier(2, timeout=5)
+    
+    def slow(name):
+        def stage(results):
+            both_running.wait()
+            return name
+        return stage
+    
+    pipeline.add_stage('download', lambda results: 'text')
+    pipeline.add_stage('translate', slow('translated'), depends_on=['download'])
+    pipeline.add_stage('summarize', slow('summary'), depends_on=['download'])
+    pipeline.add_stage('report', lambda results: (results['translate'], results['summarize']),
+                       depends_on=['translate', 'summarize'])
+    
+    results = pipeline.run()
+    
+    assert results['report'] == ('translated', 'summary')
+    assert set(pipeline.timings) == {'download', 'translate', 'summarize', 'report'}
+
+def test_only_targets_and_their_dependencies_run():
+    pipeline = Pipeline()
+    ran = []
+    for name, deps in (('download', []), ('detect', ['download']),
+                       ('translate', ['detect']), ('summarize', ['download'])):
+        pipeline.add_stage(name, lambda results, name=name: ran.append(name) or name,
+                           depends_on=deps)
+    
+    results = pipeline.run(['summarize'])
+    
+    assert sorted(ran) == ['download', 'summarize']
+    assert 'translate' not in results
+    with pytest.raises(ValueError):
+        pipeline.run(['missing'])
+
+def test_failure_stops_dependent_stages():
+    pipeline = Pipeline()
+    ran = []
+    
+    def fail(results):
+        raise StageError("no transcript")
+    
+    pipeline.add_stage('download', fail)
+    pipeline.add_stage('translate', lambda results: ran.append('translate'),
+                       depends_on=['download'])
+    
+    with pytest.raises(PipelineError) as error:
+        pipeline.run()
+    assert error.value.stage == 'download'
+    assert isinstance(error.value.error, StageError)
+    assert ran == []
+
+def test_unknown_dependency_is_rejected():
+    pipeline = Pipeline()
+    with pytest.raises(ValueError):
+        pipeline.add_stage('translate', lambda results: None, depends_on=['download'])
@@ -0,0 +1,35 @@
+"""Tests for the adaptive token bucket."""
+
+import time
+
+from modules.rate_limiter import AdaptiveRateLimiter
+
+def test_burst_then_paced():
+    limiter = AdaptiveRateLimiter(rate=20.0, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.05
+    
+    for _ in range(4):
+        limiter.acquire()
+    # Four more tokens at 20 per second take about 0.2 s
+    assert time.monotonic() - started >= 0.15
+
+def test_throttle_backs_off_and_success_recovers():
+    limiter = AdaptiveRateLimiter(rate=4.0, burst=4, min_rate=1.0, max_rate=5.0,
+                                  increase=0.5, decrease=0.5)
+    limiter.on_throttle()
+    assert limiter.rate == 2.0
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == 1.0
+    
+    # The bucket was drained, so the next request waits for a fresh token
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.5
+    
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.rate == 5.0
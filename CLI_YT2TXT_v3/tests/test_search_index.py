@@ -0,0 +1,80 @@
+"""Tests for the SQLite full-text search index."""
+
+import sqlite3
+
+from modules.search_index import SearchIndex
+from modules.transcript_segments import TranscriptSegments
+
+def segments(*texts):
+    """Segments ten seconds apart, each 40 seconds after the previous window."""
+    return TranscriptSegments.from_segments([
+        {'text': text, 'start': i * 40.0, 'duration': 10.0} for i, text in enumerate(texts)
+    ])
+
+def test_finds_cjk_words_inside_sentences(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    index.add_document('zh', 'original_transcript', '我们今天讨论气候变化和能源政策。')
+    index.add_document('ja', 'original_transcript', '東京の再生可能エネルギーについて話します。')
+    index.add_document('en', 'original_transcript', 'Climate policy and renewable energy.')
+    
+    results = index.search('气候变化')
+    assert [result['name'] for result in results] == ['zh']
+    assert '[气候变化]' in results[0]['snippet']
+    assert '​' not in results[0]['snippet']
+    assert [result['name'] for result in index.search('エネルギー')] == ['ja']
+    assert [result['name'] for result in index.search('climate')] == ['en']
+    assert index.search('变化能源') == []
+
+def test_reindexing_replaces_rows(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    index.add_document('run', 'original_transcript', 'water markets')
+    index.add_segments('run', segments('water markets', 'dry rivers'))
+    index.add_document('run', 'original_transcript', 'water markets again')
+    index.add_segments('run', segments('water markets again', 'still dry rivers'))
+    index.add_document('other', 'original_transcript', 'dry rivers')
+    
+    results = index.search('water')
+    assert len(results) == 1
+    assert [start for start, _ in results[0]['timestamps']] == [0.0]
+    assert index.search('again')[0]['name'] == 'run'
+    assert index.conn.execute('SELECT COUNT(*) FROM windows').fetchone()[0] == 2
+    assert index.conn.execute('SELECT COUNT(*) FROM window_rows').fetchone()[0] == 2
+
+def test_reindexing_deletes_by_rowid(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.db'))
+    index.add_document('run', 'original_transcript', 'water markets')
+    index.add_segments('run', segments('water markets', 'dry rivers'))
+    statements = []
+    index.conn.set_trace_callback(statements.append)
+    
+    index.add_document('run', 'original_transcript', 'water markets again')
+    index.add_segments('run', segments('water markets again'))
+    
+    # Constraints on UNINDEXED columns make FTS5 scan the whole table
+    deletes = [sql for sql in statements if sql.startswith(('DELETE FROM documents',
+                                                            'DELETE FROM windows'))]
+    assert deletes and all('WHERE rowid = ' in sql for sql in deletes)
+
+def test_upgrades_an_older_index(tmp_path):
+    db_path = str(tmp_path / 'search.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE VIRTUAL TABLE documents USING fts5(
+            name UNINDEXED, kind UNINDEXED, content,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+        CREATE VIRTUAL TABLE windows USING fts5(
+            name UNINDEXED, start UNINDEXED, content,
+            tokenize = 'unicode61 remove_diacritics 2'
+        );
+        INSERT INTO documents VALUES ('zh', 'original_transcript', '讨论气候变化');
+        INSERT INTO windows VALUES ('zh', 0.0, '讨论气候变化');
+    """)
+    conn.close()
+    
+    index = SearchIndex(db_path)
+    results = index.search('气候')
+    assert [result['name'] for result in results] == ['zh']
+    assert results[0]['timestamps'][0][0] == 0.0
+    index.add_document('zh', 'original_transcript', '能源政策')
+    assert index.search('气候') == []
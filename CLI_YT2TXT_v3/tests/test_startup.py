@@ -0,0 +1,12 @@
+"""Startup regression test: the CLI must stay quick to start."""
+
+from benchmark.__main__ import measure_startup
+
+# Seconds 'main.py --help' may take, interpreter start included
+STARTUP_BUDGET = 0.5
+
+def test_help_is_fast_and_imports_no_service_libraries():
+    startup = measure_startup(STARTUP_BUDGET, runs=3)
+    
+    assert startup['heavy_imports'] == [], "importing main pulled in service libraries"
+    assert startup['help_seconds'] <= STARTUP_BUDGET
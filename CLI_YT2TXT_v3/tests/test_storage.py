@@ -0,0 +1,92 @@
+"""Tests for output storage formats and the manifest."""
+
+import json
+import os
+import sqlite3
+import zipfile
+
+import pytest
+
+from modules.storage import Manifest, OutputStorage
+from modules.transcript_segments import TranscriptSegments
+
+METADATA = {'video_id': 'abc', 'url': 'https://youtu.be/abc'}
+
+def store_run(storage, name='run'):
+    """Store a transcript with timings and a summary, then finish the run."""
+    storage.save(name, 'original_transcript', 'water markets and dry rivers')
+    storage.save_segments(name, TranscriptSegments.from_segments([
+        {'text': 'water markets', 'start': 0.0, 'duration': 2.0},
+        {'text': 'and dry rivers', 'start': 2.0, 'duration': 2.0}
+    ]))
+    storage.save(name, 'original_summary', 'Rivers are dry.')
+    return storage.finish(name, dict(METADATA))
+
+def test_text_format_writes_files_and_registers_them(tmp_path):
+    storage = OutputStorage('text', str(tmp_path))
+    files = store_run(storage)
+    
+    assert sorted(files) == ['original_summary', 'original_transcript']
+    assert all(os.path.exists(path) for path in files.values())
+    runs = storage.manifest.find('abc')
+    assert [run['files'] for run in runs] == [files]
+    assert storage.index.search('rivers', kinds=['original_summary'])[0]['name'] == 'run'
+
+def test_zip_format_bundles_every_artifact(tmp_path):
+    storage = OutputStorage('zip', str(tmp_path))
+    files = store_run(storage)
+    
+    with zipfile.ZipFile(files['bundle']) as bundle:
+        assert sorted(bundle.namelist()) == ['metadata.json', 'original_summary.txt',
+                                             'original_transcript.txt', 'segments.json']
+        assert json.loads(bundle.read('segments.json'))['starts'] == [0.0, 2.0]
+    assert storage.manifest.find('abc')[0]['format'] == 'zip'
+
+def test_failed_zip_write_leaves_no_temporary_archive(tmp_path, monkeypatch):
+    storage = OutputStorage('zip', str(tmp_path))
+    writestr = zipfile.ZipFile.writestr
+    
+    def failing(bundle, name, data, *args, **kwargs):
+        if name == 'segments.json':
+            raise OSError("No space left on device")
+        return writestr(bundle, name, data, *args, **kwargs)
+    
+    monkeypatch.setattr(zipfile.ZipFile, 'writestr', failing)
+    with pytest.raises(OSError):
+        store_run(storage)
+    
+    assert os.listdir(os.path.join(str(tmp_path), 'bundles')) == []
+
+def test_jsonl_format_appends_one_record_per_run(tmp_path):
+    storage = OutputStorage('jsonl', str(tmp_path))
+    store_run(storage, 'first')
+    files = store_run(storage, 'second')
+    
+    with open(files['bundle'], encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['name'] for record in records] == ['first', 'second']
+    assert records[1]['original_summary'] == 'Rivers are dry.'
+    
+    # The manifest locates each run's record without scanning the shared log
+    runs = storage.manifest.find('abc')
+    assert [run['name'] for run in runs] == ['second', 'first']
+    assert [OutputStorage.read_record(run) for run in runs] == records[::-1]
+    assert runs[1]['offset'] == 0 and runs[0]['offset'] == runs[1]['length']
+
+def test_older_manifest_gains_record_columns(tmp_path):
+    db_path = str(tmp_path / 'manifest.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, video_id TEXT, "
+                 "name TEXT NOT NULL, format TEXT NOT NULL, files TEXT NOT NULL, "
+                 "metadata TEXT NOT NULL, created TEXT NOT NULL)")
+    conn.execute("INSERT INTO runs (video_id, name, format, files, metadata, created) "
+                 "VALUES ('abc', 'old', 'text', '{}', '{}', '2024-01-01')")
+    conn.commit()
+    conn.close()
+    
+    manifest = Manifest(db_path)
+    manifest.add('new', 'jsonl', {'bundle': 'bundles.jsonl'}, dict(METADATA), 10, 20)
+    
+    runs = manifest.find('abc')
+    assert [(run['name'], run['offset'], run['length']) for run in runs] == [
+        ('new', 10, 20), ('old', None, None)]
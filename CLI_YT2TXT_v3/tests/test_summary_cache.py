@@ -0,0 +1,48 @@
+"""Tests for the summary result cache."""
+
+import time
+
+from modules.summary_cache import SummaryCache
+
+def test_summary_cache_keys_and_eviction(tmp_path):
+    make_key = SummaryCache.make_key
+    key = make_key('text', 'model', 'digest', 'brief', 1)
+    assert key == make_key('text', 'model', 'digest', 'brief', 1)
+    assert len({key, make_key('text', 'model', 'other', 'brief', 1),
+                make_key('text', 'model', 'digest', 'bullet', 1),
+                make_key('text', 'model', 'digest', 'brief', 2),
+                make_key('text', 'model', 'digest', 'brief', 1, 'German')}) == 5
+    
+    cache = SummaryCache(str(tmp_path / 'summaries.db'), max_bytes=25)
+    cache.put('a', 'x' * 10)
+    time.sleep(0.01)
+    cache.put('b', 'y' * 10)
+    time.sleep(0.01)
+    assert cache.get('a') == 'x' * 10
+    time.sleep(0.01)
+    cache.put('c', 'z' * 10)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == 'x' * 10
+    assert cache.stats()['bytes'] == 20
+
+def test_summary_cache_keeps_a_running_byte_total(tmp_path):
+    path = str(tmp_path / 'summaries.db')
+    cache = SummaryCache(path, max_bytes=30)
+    cache.put('a', 'x' * 10)
+    cache.put('a', 'x' * 5)
+    cache.close()
+    
+    cache = SummaryCache(path, max_bytes=30)
+    statements = []
+    cache.conn.set_trace_callback(statements.append)
+    for key in ('b', 'c'):
+        time.sleep(0.01)
+        cache.put(key, key * 10)
+    assert not [sql for sql in statements if 'SUM' in sql]
+    assert cache.stats()['bytes'] == 25
+    
+    time.sleep(0.01)
+    cache.put('d', 'd' * 10)
+    assert cache.get('a') is None and cache.get('b') == 'b' * 10
+    assert cache.stats()['bytes'] == 30
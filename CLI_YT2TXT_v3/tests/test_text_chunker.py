@@ -0,0 +1,74 @@
+"""Tests for TextChunker's script-aware, size-bounded splitting."""
+
+from modules.text_chunker import TextChunker
+from modules.transcript_segments import TranscriptSegments
+
+def test_cjk_text_without_spaces_splits_at_full_stops():
+    text = '今天天气很好。我们去公园散步吧！你想一起来吗？' * 10
+    chunks = TextChunker(max_size=30).split(text)
+    
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert all(chunk[-1] in '。！？' for chunk in chunks)
+    assert ''.join(chunks) == text
+
+def test_cjk_text_without_any_boundary_is_cut_anywhere():
+    text = '我们今天讨论机器学习的基本概念' * 20
+    chunks = TextChunker(max_size=50).split(text)
+    
+    assert [len(chunk) for chunk in chunks] == [50] * 6
+    assert ''.join(chunks) == text
+
+def test_unpunctuated_captions_split_on_pauses():
+    groups = ['so today we look at', 'the first example here', 'and then the second one']
+    entries = []
+    for g, group in enumerate(groups):
+        for w, word in enumerate(group.split()):
+            entries.append({'text': word, 'start': g * 20.0 + w * 0.5, 'duration': 0.5})
+    segments = TranscriptSegments.from_segments(entries)
+    
+    chunks = TextChunker(max_size=30).split(segments.text, segments)
+    
+    assert chunks == groups
+    # Without the timing the same text can only be cut at whitespace
+    assert TextChunker(max_size=30).split(segments.text) != groups
+
+def test_token_mode_limits_estimated_tokens():
+    latin = 'This sentence has a handful of words in it. ' * 40
+    cjk = '这是一个用于测试的句子。' * 40
+    chunker = TextChunker(max_size=60, unit='tokens')
+    
+    latin_chunks = chunker.split(latin)
+    cjk_chunks = chunker.split(cjk)
+    
+    assert all(TextChunker.estimate_tokens(chunk) <= 60 for chunk in latin_chunks + cjk_chunks)
+    # About four Latin characters per token, one per CJK character
+    assert max(len(chunk) for chunk in latin_chunks) > 60
+    assert max(len(chunk) for chunk in cjk_chunks) <= 60
+
+def test_run_longer_than_the_limit_is_hard_split():
+    run = 'x' * 250
+    chunks = TextChunker(max_size=100).split(f"Short one. {run}. Tail.")
+    
+    assert chunks[0] == 'Short one.' and chunks[-1] == 'Tail.'
+    assert len(chunks) == 5
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert ''.join(chunks[1:-1]) == run + '.'
+
+def test_long_sentence_is_cut_at_whitespace():
+    words = ' '.join(f'word{i}' for i in range(100))
+    chunks = TextChunker(max_size=40).split(words)
+    
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert ' '.join(chunks).split() == words.split()
+
+def test_chunks_concatenate_back_to_the_text():
+    text = ('First sentence here. Second one follows! Is this the third? ' * 15
+            + 'Ein deutscher Satz; noch einer. ' * 10
+            + '日本語の文です。中文的句子。' * 10)
+    
+    for unit, size in (('chars', 80), ('tokens', 25)):
+        chunks = TextChunker(max_size=size, unit=unit).split(text)
+        
+        assert len(chunks) > 1
+        assert ''.join(chunks).replace(' ', '') == text.replace(' ', '')
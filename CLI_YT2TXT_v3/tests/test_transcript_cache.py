@@ -0,0 +1,64 @@
+"""Tests for the on-disk transcript cache."""
+
+import os
+import time
+
+from modules import transcript_cache
+from modules.transcript_cache import TranscriptCache
+
+SEGMENTS = [{'text': 'hello world', 'start': 0.0, 'duration': 1.5}]
+
+def test_transcript_cache_round_trip_and_ttl(tmp_path):
+    cache = TranscriptCache(str(tmp_path), ttl=60)
+    cache.put('video', SEGMENTS, 'en')
+    cache.put_tracks('video', [{'language_code': 'en', 'generated': False}])
+    
+    assert cache.get('video', 'en') == SEGMENTS
+    assert cache.get('video', 'de') is None
+    assert cache.get_tracks('video') == [{'language_code': 'en', 'generated': False}]
+    
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get('video', 'en') is None
+    assert cache.get('video', 'en', ignore_ttl=True) == SEGMENTS
+
+def test_transcript_cache_evicts_least_recently_used(tmp_path):
+    cache = TranscriptCache(str(tmp_path))
+    segments = [{'text': f'segment {i} ' + os.urandom(64).hex(), 'start': float(i),
+                 'duration': 1.0} for i in range(20)]
+    cache.put('old', segments)
+    cache.put('used', segments)
+    entry_size = os.path.getsize(cache._path('old', 'default'))
+    os.utime(cache._path('old', 'default'), (1, 1))
+    os.utime(cache._path('used', 'default'), (2, 2))
+    assert cache.get('used') == segments
+    
+    cache.max_bytes = entry_size * 2.5
+    cache.put('new', segments)
+    
+    assert cache.get('old') is None
+    assert cache.get('used') == segments
+    assert cache.get('new') == segments
+
+def test_transcript_cache_walks_the_directory_only_when_evicting(tmp_path, monkeypatch):
+    cache = TranscriptCache(str(tmp_path))
+    cache.put('first', SEGMENTS)
+    walks = []
+    walk = os.walk
+    monkeypatch.setattr(transcript_cache.os, 'walk',
+                        lambda *args: walks.append(args) or walk(*args))
+    
+    for i in range(20):
+        cache.put(f'video-{i}', SEGMENTS)
+    cache.put('video-0', SEGMENTS)
+    assert walks == []
+    
+    with cache._lock:
+        total = cache._scan()[1]
+    assert cache._total == total
+    cache.max_bytes = total
+    walks.clear()
+    cache.put('one-more', SEGMENTS)
+    assert len(walks) == 1
+    assert cache._total <= cache.max_bytes
+    assert cache.get('one-more') == SEGMENTS
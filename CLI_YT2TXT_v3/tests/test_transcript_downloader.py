@@ -0,0 +1,65 @@
+"""Tests for choosing and downloading YouTube's own caption tracks."""
+
+from benchmark.stand_ins import FakeTranscriptApi
+from modules.transcript_cache import TranscriptCache
+from modules.transcript_downloader import TranscriptDownloader
+from tests.conftest import video_url
+
+def track(code, generated, translations=()):
+    """Track dict as returned by list_tracks()."""
+    return {'language_code': code, 'language': code, 'is_generated': generated,
+            'is_translatable': bool(translations), 'translation_languages': list(translations)}
+
+def test_manual_track_is_chosen_first():
+    tracks = [track('en', True, ['de', 'fr']), track('de-DE', False)]
+    
+    kind, chosen, code = TranscriptDownloader()._choose_track(tracks, 'de')
+    
+    assert (kind, chosen['language_code'], code) == ('manual', 'de-DE', 'de-DE')
+
+def test_translated_track_prefers_a_manual_source():
+    tracks = [track('en', True, ['de']), track('fr', False, ['de', 'es'])]
+    
+    kind, chosen, code = TranscriptDownloader()._choose_track(tracks, 'de')
+    
+    assert (kind, chosen['language_code'], code) == ('translated', 'fr', 'de')
+
+def test_no_track_in_the_language():
+    tracks = [track('en', True, ['fr']), track('es', False)]
+    
+    assert TranscriptDownloader()._choose_track(tracks, 'de') is None
+    assert TranscriptDownloader()._choose_track([], 'de') is None
+
+def test_download_track_uses_the_manual_track(stand_ins, monkeypatch):
+    monkeypatch.setattr(FakeTranscriptApi, 'manual_languages', ('de',))
+    
+    segments, kind = TranscriptDownloader().download_track(video_url(5), 'de')
+    
+    assert kind == 'manual'
+    assert len(segments) == 5
+    assert segments.text_at(0).startswith('de: ')
+
+def test_download_track_falls_back_to_a_translated_track(stand_ins):
+    segments, kind = TranscriptDownloader().download_track(video_url(5), 'ja')
+    
+    assert kind == 'translated'
+    assert segments.text_at(0).startswith('ja: ')
+    assert TranscriptDownloader().download_track(video_url(5), 'nl') == (None, None)
+
+def test_downloaded_tracks_are_cached(stand_ins, tmp_path, monkeypatch):
+    listed = []
+    list_transcripts = FakeTranscriptApi.list_transcripts
+    
+    def counting(video_id):
+        listed.append(video_id)
+        return list_transcripts(video_id)
+    
+    monkeypatch.setattr(FakeTranscriptApi, 'list_transcripts', counting)
+    downloader = TranscriptDownloader(TranscriptCache(str(tmp_path / 'cache')))
+    first, _ = downloader.download_track(video_url(5), 'de')
+    calls = len(listed)
+    second, kind = downloader.download_track(video_url(5), 'de')
+    
+    assert kind == 'translated'
+    assert second.text == first.text
+    assert len(listed) == calls
@@ -0,0 +1,56 @@
+"""Tests for TranscriptNormalizer's tag and filler removal."""
+
+from modules.transcript_normalizer import TranscriptNormalizer
+from modules.transcript_segments import TranscriptSegments
+
+def normalize(texts, language='en', **kwargs):
+    """Normalize one segment per text and return the resulting transcript text."""
+    segments = TranscriptSegments.from_segments(
+        [{'text': text, 'start': i * 2.0, 'duration': 1.0} for i, text in enumerate(texts)])
+    options = dict(collapse_repeats=False, repunctuate=False)
+    options.update(kwargs)
+    return TranscriptNormalizer(**options).normalize(segments, language).text
+
+def test_fillers_are_chosen_by_language():
+    text = "Um, I heard a low hum from the engine"
+    
+    assert normalize([text], 'en') == "I heard a low hum from the engine"
+    assert normalize(["Euh, je pense que oui"], 'fr') == "je pense que oui"
+    # 'euh' is only a French filler; English text keeps it
+    assert normalize(["Euh is what he wrote"], 'en') == "Euh is what he wrote"
+
+def test_regional_language_codes_use_the_base_language():
+    assert normalize(["呃 我们开始吧"], 'zh-cn') == "我们开始吧"
+
+def test_without_a_language_no_fillers_are_removed():
+    assert normalize(["Um, okay"], None) == "Um, okay"
+
+def test_extra_fillers_apply_to_their_language_only():
+    fillers = {'en': ['you know']}
+    
+    assert normalize(["It was, you know, fine"], 'en', fillers=fillers) == "It was, fine"
+    assert normalize(["you know"], 'de', fillers=fillers) == "you know"
+
+def test_non_speech_cues_are_removed():
+    assert normalize(["[Music] Welcome back (applause) >> everyone ♪"]) == "Welcome back everyone"
+    assert normalize(["[Música] Hola a todos"], 'es') == "Hola a todos"
+    assert normalize(["[background noise] okay"]) == "okay"
+
+def test_brackets_holding_speech_are_kept():
+    assert normalize(["so f(x) equals two"]) == "so f(x) equals two"
+    assert normalize(["the list [1, 2, 3] is sorted"]) == "the list [1, 2, 3] is sorted"
+    assert normalize(["see (x + y) squared"]) == "see (x + y) squared"
+
+def test_dropped_segments_keep_the_timings_of_the_rest():
+    segments = TranscriptSegments.from_segments([
+        {'text': 'so we start here', 'start': 0.0, 'duration': 1.0},
+        {'text': '[Music]', 'start': 1.0, 'duration': 3.0},
+        {'text': 'and go on there', 'start': 5.0, 'duration': 1.0},
+        {'text': 'until the end', 'start': 6.0, 'duration': 1.0}])
+    
+    normalized = TranscriptNormalizer().normalize(segments, 'en')
+    
+    assert list(normalized.iter_segments()) == [(0.0, 1.0, 'so we start here.'),
+                                                (5.0, 1.0, 'And go on there'),
+                                                (6.0, 1.0, 'until the end.')]
+    assert normalized.text == 'so we start here. And go on there until the end.'
@@ -0,0 +1,70 @@
+"""Tests for the columnar TranscriptSegments store."""
+
+import io
+
+from modules.transcript_segments import TranscriptSegments
+
+def make_segments():
+    """Four segments with a gap between the second and third."""
+    return TranscriptSegments.from_segments([
+        {'text': 'Hello there', 'start': 0.0, 'duration': 1.5},
+        {'text': 'general', 'start': 1.5, 'duration': 1.0},
+        {'text': 'after the gap', 'start': 5.0, 'duration': 2.25},
+        {'text': 'the end', 'start': 3725.5, 'duration': 1.0}])
+
+def test_columns_and_segment_access():
+    segments = make_segments()
+    
+    assert len(segments) == 4
+    assert segments.text == 'Hello there general after the gap the end'
+    assert [segments.text_at(i) for i in range(4)] == [
+        'Hello there', 'general', 'after the gap', 'the end']
+    assert segments.segment(2) == (5.0, 2.25, 'after the gap')
+    assert list(segments.iter_segments())[-1] == (3725.5, 1.0, 'the end')
+    assert len(TranscriptSegments.from_segments([])) == 0
+
+def test_seek_finds_the_segment_playing_at_a_time():
+    segments = make_segments()
+    
+    assert segments.seek(0.0) == 0
+    assert segments.seek(1.49) == 0
+    assert segments.seek(1.5) == 1
+    # In a gap the previous segment is still the current one
+    assert segments.seek(4.0) == 1
+    assert segments.seek(10000.0) == 3
+    assert segments.seek(-1.0) == 0
+
+def test_slice_time_copies_the_segments_of_a_range():
+    segments = make_segments()
+    
+    middle = segments.slice_time(1.0, 10.0)
+    assert list(middle.iter_segments()) == [(1.5, 1.0, 'general'), (5.0, 2.25, 'after the gap')]
+    assert middle.text == 'general after the gap'
+    
+    tail = segments.slice_time(5.0, 1e9)
+    assert [tail.text_at(i) for i in range(len(tail))] == ['after the gap', 'the end']
+    assert tail.text == 'after the gap the end'
+    
+    assert len(segments.slice_time(2.0, 4.0)) == 0
+    assert segments.slice_time(2.0, 4.0).text == ''
+    # Slices own their data
+    middle.starts[0] = 99.0
+    assert segments.starts[1] == 1.5
+
+def test_srt_export():
+    stream = io.StringIO()
+    make_segments().write_srt(stream)
+    
+    assert stream.getvalue().split('\n\n')[:2] == [
+        '1\n00:00:00,000 --> 00:00:01,500\nHello there',
+        '2\n00:00:01,500 --> 00:00:02,500\ngeneral']
+    assert stream.getvalue().endswith('4\n01:02:05,500 --> 01:02:06,500\nthe end\n\n')
+
+def test_vtt_export():
+    stream = io.StringIO()
+    make_segments().write_vtt(stream)
+    
+    assert stream.getvalue().startswith(
+        'WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHello there\n\n')
+    assert '00:00:05.000 --> 00:00:07.250\nafter the gap\n\n' in stream.getvalue()
+    assert stream.getvalue().endswith('01:02:05.500 --> 01:02:06.500\nthe end\n\n')
@@ -0,0 +1,48 @@
+"""Tests for the chunk-level translation memo."""
+
+import time
+
+from modules.translation_memo import TranslationMemo
+
+def test_translation_memo_keys_include_the_backend(tmp_path):
+    memo = TranslationMemo(str(tmp_path / 'memo.db'))
+    memo.put('Hallo', 'de', 'en', 'Hello')
+    memo.put('Hallo', 'de', 'en', 'Hi', backend='ollama:bench')
+    
+    assert memo.get('Hallo', 'de', 'en') == 'Hello'
+    assert memo.get('Hallo', 'de', 'en', backend='ollama:bench') == 'Hi'
+    assert memo.get('Hallo', 'de', 'fr') is None
+    assert memo.stats()['hits'] == 2 and memo.stats()['misses'] == 1
+
+def test_translation_memo_evicts_beyond_max_entries(tmp_path):
+    memo = TranslationMemo(str(tmp_path / 'memo.db'), max_entries=2)
+    for word in ('one', 'two'):
+        memo.put(word, 'en', 'de', word.upper())
+        time.sleep(0.01)
+    assert memo.get('one', 'en', 'de') == 'ONE'
+    time.sleep(0.01)
+    memo.put('three', 'en', 'de', 'THREE')
+    
+    assert memo.get('two', 'en', 'de') is None
+    assert memo.get('one', 'en', 'de') == 'ONE'
+    assert memo.stats()['entries'] == 2
+
+def test_translation_memo_counts_rows_once(tmp_path):
+    path = str(tmp_path / 'memo.db')
+    memo = TranslationMemo(path, max_entries=3)
+    memo.put('one', 'en', 'de', 'EINS')
+    memo.put('one', 'en', 'de', 'eins')
+    memo.close()
+    
+    memo = TranslationMemo(path, max_entries=3)
+    statements = []
+    memo.conn.set_trace_callback(statements.append)
+    for word in ('two', 'three', 'four'):
+        time.sleep(0.01)
+        memo.put(word, 'en', 'de', word.upper())
+    
+    assert not [sql for sql in statements if 'COUNT' in sql]
+    assert sum('DELETE' in sql for sql in statements) == 1
+    assert memo.get('one', 'en', 'de') is None
+    assert memo.get('four', 'en', 'de') == 'FOUR'
+    assert memo.stats()['entries'] == 3
@@ -0,0 +1,147 @@
+"""Tests for the Translator's batching over translation backends."""
+
+import threading
+
+import pytest
+
+from modules import translator as translator_module
+from modules.translation_backends import LibreTranslateBackend, LocalBackend, TranslationBackend
+from modules.translator import TranslationError, Translator
+
+def make_text(sentences):
+    """Build a text of numbered sentences."""
+    return ' '.join(f"Sentence number {i} is right here." for i in range(sentences))
+
+class FakeResponse:
+    """requests.Response stand-in for a LibreTranslate reply."""
+    
+    status_code = 200
+    
+    def __init__(self, payload):
+        self.payload = payload
+        self.text = ''
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.payload
+
+def test_libretranslate_batches_several_chunks_per_request():
+    backend = LibreTranslateBackend()
+    requests = []
+    
+    def post(url, json, timeout):
+        requests.append(json['q'])
+        return FakeResponse({'translatedText': [f"<de>{q}" for q in json['q']]})
+    
+    backend.session.post = post
+    text = make_text(900)
+    translator = Translator(backend=backend)
+    chunks = translator.split_text(text)
+    
+    translated = translator.translate_text(text, 'de')
+    
+    assert len(chunks) > backend.max_batch
+    assert len(requests) == -(-len(chunks) // backend.max_batch)
+    assert all(len(batch) <= backend.max_batch for batch in requests)
+    assert all(sum(map(len, batch)) <= backend.max_chars for batch in requests)
+    assert translated == ' '.join(f"<de>{chunk}" for chunk in chunks)
+
+def test_requests_stay_under_the_character_limit():
+    backend = LocalBackend()
+    backend.max_chars = 2500
+    sent = []
+    original = backend.translate_batch
+    backend.translate_batch = lambda texts, source, target: sent.append(texts) or original(
+        texts, source, target)
+    
+    Translator(backend=backend).translate_text(make_text(300), 'fr', chunk_size=1000)
+    
+    assert len(sent) > 1
+    assert all(sum(map(len, batch)) <= 2500 for batch in sent)
+    assert all(len(batch) == 2 for batch in sent[:-1])
+
+def test_single_chunk_backends_send_one_request_per_chunk():
+    backend = LocalBackend()
+    backend.max_batch = 1
+    sent = []
+    original = backend.translate_batch
+    backend.translate_batch = lambda texts, source, target: sent.append(texts) or original(
+        texts, source, target)
+    translator = Translator(backend=backend)
+    text = make_text(400)
+    
+    translator.translate_text(text, 'fr', chunk_size=1000)
+    
+    assert len(sent) == len(translator.split_text(text, 1000))
+
+class ScheduledBackend(TranslationBackend):
+    """Backend that fails chunks on a schedule and answers later chunks faster."""
+    
+    name = 'scheduled'
+    rate_limited = False
+    
+    def __init__(self, failures=None):
+        # Chunk text -> number of attempts that fail before one succeeds
+        self.failures = dict(failures or {})
+        self.attempts = []
+        self.completed = []
+        self.lock = threading.Lock()
+    
+    def translate_batch(self, texts, source_language, target_language):
+        with self.lock:
+            self.attempts.append(texts[0])
+            failing = self.failures.get(texts[0], 0)
+            if failing:
+                self.failures[texts[0]] = failing - 1
+        if failing:
+            raise ConnectionError(f"scheduled failure of {texts[0][:20]!r}")
+        # Earlier chunks take longer, so they finish out of order
+        threading.Event().wait(0.002 * (20 - int(texts[0].split()[2]) % 20))
+        with self.lock:
+            self.completed.append(texts[0])
+        return [f"<{target_language}>{text}" for text in texts]
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the translator's backoff sleeps instead of waiting."""
+    delays = []
+    monkeypatch.setattr(translator_module.time, 'sleep', delays.append)
+    return delays
+
+def test_concurrent_chunks_keep_their_order():
+    backend = ScheduledBackend()
+    translator = Translator(backend=backend, max_workers=8)
+    text = make_text(40)
+    chunks = translator.split_text(text, 80)
+    
+    translated = translator.translate_text(text, 'de', chunks=chunks)
+    
+    assert len(chunks) > 8
+    assert backend.completed != chunks
+    assert translated == ' '.join(f"<de>{chunk}" for chunk in chunks)
+
+def test_failed_chunk_is_retried_with_backoff(sleeps):
+    translator = Translator(backend=ScheduledBackend(), max_workers=4)
+    text = make_text(10)
+    chunks = translator.split_text(text, 80)
+    translator.backend.failures = {chunks[2]: 2}
+    
+    translated = translator.translate_text(text, 'de', chunks=chunks)
+    
+    assert translated == ' '.join(f"<de>{chunk}" for chunk in chunks)
+    assert translator.backend.attempts.count(chunks[2]) == 3
+    assert len(sleeps) == 2
+    assert 1.0 <= sleeps[0] <= 1.5 and 2.0 <= sleeps[1] <= 3.0
+
+def test_exhausted_retries_raise_instead_of_falling_back(sleeps):
+    translator = Translator(backend=ScheduledBackend(), max_workers=4, max_retries=3)
+    text = make_text(10)
+    chunks = translator.split_text(text, 80)
+    translator.backend.failures = {chunks[4]: 3}
+    
+    with pytest.raises(TranslationError, match='after 3 attempts'):
+        translator.translate_text(text, 'de', chunks=chunks)
+    assert translator.backend.attempts.count(chunks[4]) == 3
+    assert len(sleeps) == 2